@@ -1,6 +1,8 @@
 # Filename: backend/app/config.py
 # Configuration for the Scholarship Finder application
 
+from typing import Dict, List
+
 from pydantic_settings import BaseSettings
 from pydantic import ConfigDict
 from dotenv import load_dotenv
@@ -12,6 +14,23 @@ class Settings(BaseSettings):
     # OpenAI-compatible provider (for example, OpenRouter)
     api_key: str = ""
     openrouter_model: str = ""
+    openrouter_base_url: str = "https://openrouter.ai/api/v1"
+    openrouter_timeout_seconds: float = 45.0
+
+    # Provider strategy: "sequential" (OpenRouter then Gemini), "hedged" (start the
+    # secondary after provider_hedge_delay_seconds) or "parallel" (start both at once)
+    provider_strategy: str = "sequential"
+    provider_hedge_delay_seconds: float = 8.0
+    gemini_timeout_seconds: float = 45.0
+
+    # Local scholarship catalog
+    scholarship_catalog_reload_check_seconds: float = 5.0
+
+    # Shared outbound HTTP client
+    http2_enabled: bool = True
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry_seconds: float = 30.0
 
     # Google Generative AI API
     google_api_key: str = ""
@@ -21,18 +40,114 @@ class Settings(BaseSettings):
     google_service_account_email: str = ""
     google_private_key: str = ""
     google_apps_script_url: str = ""
+    google_oauth_token_uri: str = "https://oauth2.googleapis.com/token"
+    google_sheets_api_endpoint: str = ""
+    sheets_batch_enabled: bool = True
+    sheets_batch_max_rows: int = 50
+    sheets_batch_max_wait_seconds: float = 0.0
     
     # Email Configuration
     smtp_user: str
     smtp_password: str
     smtp_host: str
     smtp_port: int
+    smtp_starttls: bool = True
+    smtp_timeout_seconds: float = 30.0
+    smtp_pool_size: int = 4
+    smtp_pool_idle_timeout_seconds: float = 60.0
+    smtp_pool_health_check_seconds: float = 10.0
+
+    # Queue report emails in a local SQLite outbox instead of sending them inline.
+    # Needs a long-running server; leave disabled on serverless deployments.
+    email_outbox_enabled: bool = False
+    email_outbox_workers: int = 2
+    email_outbox_max_attempts: int = 5
+    email_outbox_backoff_seconds: float = 30.0
+    email_outbox_poll_interval_seconds: float = 2.0
+    # A job claimed for sending is only taken over by another worker once its lease
+    # has expired, so keep this above the longest expected render-and-send time.
+    email_outbox_lease_seconds: float = 300.0
+
+    # Render report PDFs/HTML in this many worker processes (0 renders in the calling
+    # thread). At most report_render_max_pending renders are queued at once; further
+    # callers block (they are not rejected) until a slot frees up. A render running
+    # longer than report_render_timeout_seconds fails and its pool is replaced.
+    report_render_workers: int = 0
+    report_render_max_pending: int = 16
+    report_render_timeout_seconds: float = 30.0
     
     # Server Configuration
     port: int = 5000
     node_env: str = "development"
     frontend_url: str = "https://www.fundmystudyabroad.com"
     allow_local_backup: bool = False
+    lead_journal_fsync_interval_seconds: float = 1.0
+    lead_journal_fsync_every: int = 20
+
+    # Scholarship result cache
+    result_cache_max_entries: int = 1024
+    result_cache_ttl_seconds: int = 6 * 60 * 60
+    result_cache_gpa_bucket: float = 5.0
+
+    # Precomputed results for popular profile archetypes (degree, major family,
+    # countries, GPA band). Off by default: answers are approximate for the profile.
+    archetype_cache_enabled: bool = False
+    archetype_refresh_after_seconds: int = 24 * 60 * 60
+    archetype_gpa_band: float = 10.0
+    archetype_min_country_overlap: float = 0.5
+    archetype_cache_top: int = 50
+    archetype_refresh_interval_seconds: int = 15 * 60
+
+    # Prometheus-style /metrics endpoint (per worker process). It is unauthenticated and
+    # exposes cache, limiter and latency internals: only enable it where /metrics is
+    # firewalled off from the public internet (or scraped over a private network).
+    metrics_enabled: bool = False
+
+    # Request tracing: "" (request IDs only), "console" or "file" (OTLP/JSON lines,
+    # app/data/traces.jsonl unless tracing_file_path is set)
+    tracing_exporter: str = ""
+    tracing_file_path: str = ""
+
+    # Sampling profiler: every request when profiling_enabled, otherwise only requests
+    # with "X-Profile-Request: 1" from profiling_allowed_ips. The allowlist is checked
+    # against the connecting peer; behind a reverse proxy, list the proxy addresses (or
+    # CIDRs) in profiling_trusted_proxies and the right-most X-Forwarded-For hop that is
+    # not one of them is checked instead. Collapsed stacks of the
+    # slowest profiling_keep_slowest requests per window go to app/data/profiles unless
+    # profiling_output_dir is set.
+    profiling_enabled: bool = False
+    profiling_allowed_ips: List[str] = []
+    profiling_trusted_proxies: List[str] = []
+    profiling_sample_interval_seconds: float = 0.005
+    profiling_keep_slowest: int = 5
+    profiling_window_seconds: int = 5 * 60
+    profiling_output_dir: str = ""
+
+    # Rendered report (HTML + PDF) cache, bounded by total size
+    report_cache_max_bytes: int = 32 * 1024 * 1024
+
+    # Rate limiting. Backends: "memory" (per process), "sqlite" (shared by the workers
+    # on one host) or "redis" (shared across hosts). Algorithms: "gcra" or
+    # "token_bucket" (one float per key), "sliding_log" (exact, O(limit) per key) or
+    # "sliding_window" (approximate, O(1) per key). The default stays "sliding_log".
+    # gcra/token_bucket allow the same burst of `limit` but then refill one request
+    # every window/limit seconds instead of when the oldest request leaves the window.
+    rate_limit_backend: str = "memory"
+    rate_limit_algorithm: str = "sliding_log"
+    rate_limit_redis_url: str = "redis://localhost:6379/0"
+    rate_limit_sqlite_path: str = ""
+    rate_limit_gc_interval_seconds: float = 60.0
+    rate_limit_max_keys: int = 100_000
+    rate_limit_shards: int = 16
+    # Per-route policies as "limit/window_seconds"
+    rate_limit_policies: Dict[str, str] = {
+        "calculate": "20/60",
+        "submit-lead-ip": "5/900",
+        "submit-lead-email": "3/1800",
+        "email-status-ip": "30/60",
+        "send-email-ip": "3/900",
+        "send-email-recipient": "2/1800",
+    }
     
     model_config = ConfigDict(env_file=".env", case_sensitive=False, extra="ignore")
 
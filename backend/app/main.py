@@ -2,22 +2,37 @@
 # No changes.
 
 import asyncio
+import json
 import logging
+import math
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 
 from app.models import UserProfile, LeadCapture, ScholarshipResult, EmailRequest
-from app.services.gemini_service import GeminiService
-from app.services.sheets_service import SheetsService
+from app.services.gemini_service import GeminiService, scholarship_catalog
+from app.services.sheets_service import SheetsService, lead_journal, sheets_lead_writer
+from app.services.email_outbox import email_outbox
 from app.services.email_service import EmailService
-from app.services.rate_limiter import rate_limiter
+from app.services.http_client import close_http_client, start_http_client
+from app.services.metrics import RATE_LIMIT_DECISIONS, RequestMetricsMiddleware, metrics
+from app.services.tracing import TracingMiddleware, install_log_record_factory
+from app.services.report_cache import report_cache
+from app.services.report_renderer import report_renderer
+from app.services.single_flight import scholarship_flights
+from app.services.archetype_cache import archetype_cache
+from app.services.smtp_pool import smtp_pool
+from app.services.rate_limiter import RateLimitResult, rate_limit_policies, rate_limiter
+from app.services.request_profiler import RequestProfilerMiddleware
+from app.services.result_cache import result_cache
 from app.config import settings
 
+install_log_record_factory()
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    format="%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s",
 )
 logger = logging.getLogger(__name__)
 
@@ -32,11 +47,51 @@ allowed_origins = list(
     )
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await start_http_client()
+    try:
+        await asyncio.to_thread(scholarship_catalog.load)
+    except Exception as e:
+        logger.exception("Failed to preload scholarship catalog: %s", e)
+    try:
+        await asyncio.to_thread(report_renderer.start)
+    except Exception as e:
+        logger.exception("Failed to start report renderer workers: %s", e)
+    if settings.email_outbox_enabled:
+        await email_outbox.start()
+    archetype_refresher = None
+    if settings.archetype_cache_enabled:
+        archetype_refresher = asyncio.create_task(
+            archetype_cache.run_background_refresh(
+                GeminiService._compute_archetype,
+                top=settings.archetype_cache_top,
+                interval_seconds=settings.archetype_refresh_interval_seconds,
+            )
+        )
+    try:
+        yield
+    finally:
+        if archetype_refresher is not None:
+            archetype_refresher.cancel()
+        await email_outbox.stop()
+        await sheets_lead_writer.close()
+        await asyncio.to_thread(lead_journal.close)
+        await asyncio.to_thread(smtp_pool.close)
+        await asyncio.to_thread(report_renderer.close)
+        await asyncio.to_thread(rate_limiter.close)
+        await close_http_client()
+
+
 app = FastAPI(
     title="Scholarship Finder API",
     description="AI-powered scholarship calculator for Indian students",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
+# Added before the other middleware so it sits innermost, in the task that runs the route.
+app.add_middleware(RequestProfilerMiddleware)
 
 
 def _get_client_ip(request: Request) -> str:
@@ -46,17 +101,70 @@ def _get_client_ip(request: Request) -> str:
     return request.client.host if request.client else "unknown"
 
 
-def _enforce_rate_limit(request: Request, scope: str, limit: int, window_seconds: int, key_suffix: str = "") -> None:
+def _enforce_rate_limit(request: Request, policy: str, key_suffix: str = "") -> None:
+    limit, window_seconds = rate_limit_policies[policy]
     client_ip = _get_client_ip(request)
-    composed_key = f"{scope}:{client_ip}:{key_suffix}".rstrip(":")
-    retry_after = rate_limiter.check(composed_key, limit, window_seconds)
-    if retry_after:
+    composed_key = f"{policy}:{client_ip}:{key_suffix}".rstrip(":")
+    result = rate_limiter.hit(composed_key, limit, window_seconds)
+    RATE_LIMIT_DECISIONS.inc(policy=policy, decision="allowed" if result.allowed else "limited")
+
+    # Report the tightest policy applied to this request in the response headers.
+    current = getattr(request.state, "rate_limit", None)
+    if current is None or result.remaining < current.remaining:
+        request.state.rate_limit = result
+
+    if not result.allowed:
+        retry_after = max(1, math.ceil(result.retry_after))
         raise HTTPException(
             status_code=429,
             detail=f"Too many requests. Please try again in {retry_after} seconds.",
-            headers={"Retry-After": str(retry_after)},
+            headers={"Retry-After": str(retry_after), **_rate_limit_headers(result)},
         )
 
+
+def _rate_limit_headers(result: RateLimitResult) -> dict[str, str]:
+    return {
+        "X-RateLimit-Limit": str(result.limit),
+        "X-RateLimit-Remaining": str(result.remaining),
+        "X-RateLimit-Reset": str(math.ceil(result.reset_after)),
+    }
+
+
+def rate_limit(policy: str):
+    """
+    Route dependency enforcing a per-client-IP policy from settings.rate_limit_policies.
+
+    Dependencies run before the request body is validated, so routes with a body call
+    check_rate_limit() from the handler instead; malformed (422) requests then cost no quota.
+    """
+    if policy not in rate_limit_policies:
+        raise ValueError(f"Unknown rate limit policy: {policy}")
+
+    def enforce(request: Request) -> None:
+        _enforce_rate_limit(request, policy)
+
+    return Depends(enforce)
+
+
+async def check_rate_limit(request: Request, policy: str, key_suffix: str = "") -> None:
+    # Limiter backends may block on SQLite or Redis; keep them off the event loop.
+    await asyncio.to_thread(_enforce_rate_limit, request, policy, key_suffix)
+
+
+@app.middleware("http")
+async def add_rate_limit_headers(request: Request, call_next):
+    response = await call_next(request)
+    result = getattr(request.state, "rate_limit", None)
+    if result is not None:
+        for header, value in _rate_limit_headers(result).items():
+            response.headers.setdefault(header, value)
+    return response
+
+app.add_middleware(RequestMetricsMiddleware)
+
+# Added after the other app middleware, so it wraps them and their logs carry the request ID.
+app.add_middleware(TracingMiddleware)
+
 # -------------------- CORS --------------------
 app.add_middleware(
     CORSMiddleware,
@@ -64,6 +172,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After", "X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset", "X-Request-ID"],
 )
 
 # -------------------- HEALTH --------------------
@@ -71,20 +180,51 @@ app.add_middleware(
 def health_check():
     return {
         "status": "healthy",
-        "service": "Scholarship Finder API"
+        "service": "Scholarship Finder API",
+        "result_cache": result_cache.stats(),
+        "report_cache": report_cache.stats(),
+        "single_flight": scholarship_flights.stats(),
+        "archetype_cache": archetype_cache.stats(),
     }
 
+# -------------------- METRICS --------------------
+metrics.register_stats("result_cache", result_cache.stats, counters=("hits", "misses", "evictions"), gauges=("entries",))
+metrics.register_stats(
+    "report_cache",
+    report_cache.stats,
+    counters=("hits", "misses", "evictions"),
+    gauges=("entries", "size_bytes"),
+)
+metrics.register_stats("single_flight", scholarship_flights.stats, counters=("leaders", "followers"), gauges=("in_flight",))
+metrics.register_stats(
+    "archetype_cache",
+    archetype_cache.stats,
+    counters=("exact_hits", "nearest_hits", "misses", "refreshes"),
+    gauges=("entries",),
+)
+
+
+@app.get("/metrics")
+def metrics_endpoint():
+    """
+    Prometheus text exposition of this worker's metrics
+    """
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 # -------------------- CALCULATE --------------------
 @app.post("/api/calculate-scholarships")
-def calculate_scholarships(profile: UserProfile, request: Request):
+async def calculate_scholarships(profile: UserProfile, request: Request):
     """
     Calculate scholarships using Gemini + Google Search grounding
     """
+    await check_rate_limit(request, "calculate")
+
     try:
-        _enforce_rate_limit(request, "calculate", limit=20, window_seconds=60)
         profile_dict = profile.model_dump()
 
-        result = GeminiService.get_scholarships(profile_dict)
+        result = await GeminiService.get_scholarships(profile_dict)
 
         # Defensive fallback (never break frontend)
         if not result or not result.scholarships:
@@ -107,6 +247,48 @@ def calculate_scholarships(profile: UserProfile, request: Request):
             detail="Unable to calculate scholarships at this time."
         )
 
+@app.post("/api/calculate-scholarships/stream")
+async def calculate_scholarships_stream(profile: UserProfile, request: Request):
+    """
+    Stream scholarships as Server-Sent Events: a "scholarship" event per match as soon
+    as it is ready, then "summary" with the final ranked result and "done".
+    """
+    await check_rate_limit(request, "calculate")
+    profile_dict = profile.model_dump()
+
+    async def events():
+        try:
+            async for event, value in GeminiService.stream_scholarships(profile_dict):
+                if event == "scholarship":
+                    yield _sse_event("scholarship", value.model_dump())
+                    continue
+
+                if not value.scholarships:
+                    yield _sse_event(
+                        "summary",
+                        {
+                            "success": True,
+                            "data": GeminiService._get_fallback_result().model_dump(),
+                            "note": "No direct matches found. Consultation recommended.",
+                        },
+                    )
+                else:
+                    yield _sse_event("summary", {"success": True, "data": value.model_dump()})
+            yield _sse_event("done", {})
+        except Exception as e:
+            logger.exception("Streaming scholarship calculation failed: %s", e)
+            yield _sse_event("error", {"detail": "Unable to calculate scholarships at this time."})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
 # -------------------- LEAD SUBMIT --------------------
 @app.post("/api/submit-lead")
 async def submit_lead(lead: LeadCapture, request: Request):
@@ -114,8 +296,8 @@ async def submit_lead(lead: LeadCapture, request: Request):
     Save lead → Google Sheets → Send email
     """
     try:
-        _enforce_rate_limit(request, "submit-lead-ip", limit=5, window_seconds=900)
-        _enforce_rate_limit(request, "submit-lead-email", limit=3, window_seconds=1800, key_suffix=lead.email.lower())
+        await check_rate_limit(request, "submit-lead-ip")
+        await check_rate_limit(request, "submit-lead-email", key_suffix=lead.email.lower())
 
         if lead.website.strip():
             raise HTTPException(status_code=400, detail="Unable to process submission.")
@@ -132,6 +314,24 @@ async def submit_lead(lead: LeadCapture, request: Request):
                 detail="We could not save your details securely right now. Please try again in a few minutes.",
             )
 
+        if settings.email_outbox_enabled:
+            email_job_id = await email_outbox.enqueue_report(
+                lead.email,
+                lead.name,
+                lead.scholarship_results,
+            )
+            logger.info("Queued report email %s for %s", email_job_id, lead.email)
+            return {
+                "success": True,
+                "message": "Lead submitted successfully. Your full report is on its way to your inbox!",
+                "email": lead.email,
+                "sheets_saved": sheets_result,
+                "email_sent": False,
+                "email_queued": True,
+                "email_job_id": email_job_id,
+                "lead_saved": True,
+            }
+
         logger.info("Sending report email to %s", lead.email)
         email_sent = await asyncio.to_thread(
             EmailService.send_scholarship_report,
@@ -173,6 +373,24 @@ async def submit_lead(lead: LeadCapture, request: Request):
             detail=f"Unable to submit lead: {str(e)}"
         )
 
+# -------------------- EMAIL STATUS --------------------
+@app.get("/api/email-status/{job_id}", dependencies=[rate_limit("email-status-ip")])
+async def email_status(job_id: str):
+    """
+    Look up a queued report email
+    """
+    if not settings.email_outbox_enabled:
+        raise HTTPException(status_code=404, detail="Email job not found.")
+
+    job_status = await email_outbox.get_status(job_id)
+    if job_status is None:
+        raise HTTPException(status_code=404, detail="Email job not found.")
+
+    return {
+        "success": True,
+        "data": job_status,
+    }
+
 # -------------------- SEND EMAIL (OPTIONAL) --------------------
 @app.post("/api/send-email")
 async def send_email(email_data: EmailRequest, request: Request):
@@ -180,14 +398,8 @@ async def send_email(email_data: EmailRequest, request: Request):
     Manually trigger email sending
     """
     try:
-        _enforce_rate_limit(request, "send-email-ip", limit=3, window_seconds=900)
-        _enforce_rate_limit(
-            request,
-            "send-email-recipient",
-            limit=2,
-            window_seconds=1800,
-            key_suffix=email_data.recipient_email.lower(),
-        )
+        await check_rate_limit(request, "send-email-ip")
+        await check_rate_limit(request, "send-email-recipient", key_suffix=email_data.recipient_email.lower())
 
         email_sent = await asyncio.to_thread(
             EmailService.send_scholarship_report,
@@ -0,0 +1,356 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable
+
+from app.config import settings
+from app.models import ScholarshipResult
+from app.services.lead_journal import JOURNAL_PATH, iter_records
+from app.services.normalized_profile import NormalizedProfile
+
+logger = logging.getLogger(__name__)
+
+ARCHETYPE_PATH = Path(__file__).parent.parent / "data" / "archetype_cache.json"
+
+# Served in place of the reason and tip written for the archetype's sample profile.
+ARCHETYPE_REASON = "Matches students with a similar degree level, field of study, destinations and academic record."
+ARCHETYPE_STRATEGY_TIP = "Tailor your application to this scholarship's stated priorities and apply well before the deadline."
+
+# Ordered: the first family with a matching keyword wins.
+MAJOR_FAMILIES = (
+    ("computing", ("computer", "software", "data", "information tech", "artificial intelligence", "machine learning", "cyber")),
+    ("engineering", ("engineering", "mechanical", "electrical", "electronics", "civil", "chemical", "aerospace", "robotics")),
+    ("business", ("business", "mba", "management", "finance", "accounting", "economics", "marketing")),
+    ("health", ("medicine", "medical", "health", "nursing", "pharmacy", "dentistry", "biotech")),
+    ("sciences", ("physics", "chemistry", "biology", "mathematics", "statistics", "science")),
+    ("law", ("law", "legal")),
+    ("arts", ("art", "design", "humanities", "history", "literature", "psychology", "sociology", "media", "architecture")),
+)
+
+ArchetypeKey = tuple[str, str, tuple[str, ...], int]
+Compute = Callable[[Dict[str, Any]], Awaitable[ScholarshipResult | None]]
+
+
+class ArchetypeCache:
+    """
+    Precomputed results for popular profile archetypes: degree level, major family,
+    target-country set and GPA band.
+
+    lookup() serves the stored result for the request's archetype, or for the nearest
+    one with the same degree level and major family, an overlapping country set and the
+    same or the next lower GPA band, never a higher one. The per-match reason and
+    strategy tip were written for another student, so they are replaced with generic
+    text before serving. Stale entries are still served while a background refresh
+    recomputes them. record() counts archetype popularity and keeps a sample profile
+    per archetype, which refresh_popular() and the offline precompute command use to
+    decide what to compute. Entries persist in a JSON file.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        gpa_band: float,
+        refresh_after_seconds: float,
+        min_country_overlap: float,
+        max_tracked: int = 5000,
+    ) -> None:
+        self.path = path
+        self.gpa_band = max(1.0, gpa_band)
+        self.refresh_after_seconds = refresh_after_seconds
+        self.min_country_overlap = min_country_overlap
+        self.max_tracked = max_tracked
+        self._entries: Dict[ArchetypeKey, Dict[str, Any]] = {}
+        self._popularity: Dict[ArchetypeKey, list] = {}
+        self._lock = threading.Lock()
+        self._loaded_mtime: float | None = None
+        self._refreshing: Dict[ArchetypeKey, asyncio.Task] = {}
+        self.exact_hits = 0
+        self.nearest_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    def key_for(self, profile: NormalizedProfile) -> ArchetypeKey:
+        countries = tuple(sorted({_canonical(country) for country in profile.target_countries if country}))
+        band = int(float(profile.gpa_percentage or 0) // self.gpa_band * self.gpa_band)
+        return _canonical(profile.degree_level), major_family(profile.major), countries, band
+
+    def record(self, profile: NormalizedProfile) -> None:
+        key = self.key_for(profile)
+        with self._lock:
+            tracked = self._popularity.get(key)
+            if tracked is None:
+                if len(self._popularity) >= self.max_tracked:
+                    self._trim_popularity_locked()
+                # The free-text highlight is personal and does not affect the archetype.
+                self._popularity[key] = [1, {**profile.source, "profile_highlight": ""}]
+            else:
+                tracked[0] += 1
+
+    def lookup(self, profile: NormalizedProfile) -> tuple[ArchetypeKey, ScholarshipResult, bool] | None:
+        """Return (archetype, result, stale) for the nearest stored archetype, if any."""
+        self._reload_if_changed()
+        key = self.key_for(profile)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.exact_hits += 1
+            else:
+                key, entry = self._nearest_locked(key)
+                if entry is None:
+                    self.misses += 1
+                    return None
+                self.nearest_hits += 1
+
+            stale = time.time() - entry["computed_at"] >= self.refresh_after_seconds
+            return key, _depersonalize(ScholarshipResult(**entry["result"])), stale
+
+    def store(self, key: ArchetypeKey, profile: Dict[str, Any], result: ScholarshipResult) -> None:
+        with self._lock:
+            self._entries[key] = {
+                "profile": profile,
+                "result": result.model_dump(),
+                "computed_at": time.time(),
+            }
+
+    def schedule_refresh(self, key: ArchetypeKey, compute: Compute) -> None:
+        """Recompute one archetype in the background unless it is already being refreshed."""
+        if key in self._refreshing:
+            return
+        with self._lock:
+            entry = self._entries.get(key)
+            profile = entry["profile"] if entry else None
+        if profile is None:
+            return
+
+        task = asyncio.get_running_loop().create_task(self._refresh(key, profile, compute))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    async def refresh_popular(self, compute: Compute, top: int) -> int:
+        """Compute the most requested archetypes that are missing or stale."""
+        now = time.time()
+        with self._lock:
+            popular = sorted(self._popularity.items(), key=lambda item: item[1][0], reverse=True)[:top]
+            due = [
+                (key, sample)
+                for key, (_, sample) in popular
+                if key not in self._entries
+                or now - self._entries[key]["computed_at"] >= self.refresh_after_seconds
+            ]
+
+        refreshed = 0
+        for key, sample in due:
+            refreshed += await self._refresh(key, sample, compute)
+        return refreshed
+
+    async def run_background_refresh(self, compute: Compute, top: int, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                refreshed = await self.refresh_popular(compute, top)
+                if refreshed:
+                    logger.info("Precomputed %s popular scholarship archetypes", refreshed)
+            except Exception as e:
+                logger.exception("Archetype background refresh failed: %s", e)
+
+    async def _refresh(self, key: ArchetypeKey, profile: Dict[str, Any], compute: Compute) -> bool:
+        try:
+            result = await compute(profile)
+        except Exception as e:
+            logger.warning("Archetype refresh for %s failed: %s", _encode_key(key), e)
+            return False
+        if result is None:
+            return False
+
+        self.store(key, profile, result)
+        self.refreshes += 1
+        await asyncio.to_thread(self.save)
+        return True
+
+    def _nearest_locked(self, key: ArchetypeKey) -> tuple[ArchetypeKey, Dict[str, Any] | None]:
+        degree, family, countries, band = key
+        best_key, best_entry, best_rank = key, None, None
+        for candidate, entry in self._entries.items():
+            candidate_degree, candidate_family, candidate_countries, candidate_band = candidate
+            if candidate_degree != degree or candidate_family != family:
+                continue
+            # Only the same or the next lower band: a stronger profile's matches must not
+            # be promised to a weaker one.
+            band_distance = (band - candidate_band) / self.gpa_band
+            if not 0 <= band_distance <= 1:
+                continue
+            overlap = _jaccard(countries, candidate_countries)
+            if overlap < self.min_country_overlap:
+                continue
+            rank = (overlap, -band_distance)
+            if best_rank is None or rank > best_rank:
+                best_key, best_entry, best_rank = candidate, entry, rank
+        return best_key, best_entry
+
+    def _trim_popularity_locked(self) -> None:
+        ranked = sorted(self._popularity.items(), key=lambda item: item[1][0], reverse=True)
+        self._popularity = dict(ranked[: self.max_tracked // 2])
+
+    def load(self) -> None:
+        try:
+            mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            return
+        with open(self.path, "r", encoding="utf-8") as file:
+            stored = json.load(file)
+        with self._lock:
+            for encoded_key, entry in stored.get("entries", {}).items():
+                key = _decode_key(encoded_key)
+                current = self._entries.get(key)
+                if current is None or current["computed_at"] < entry["computed_at"]:
+                    self._entries[key] = entry
+            self._loaded_mtime = mtime
+
+    def save(self) -> None:
+        with self._lock:
+            stored = {"entries": {_encode_key(key): entry for key, entry in self._entries.items()}}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(stored, file, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+        self._loaded_mtime = self.path.stat().st_mtime
+
+    def _reload_if_changed(self) -> None:
+        try:
+            mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            return
+        if mtime != self._loaded_mtime:
+            try:
+                self.load()
+            except Exception as e:
+                logger.exception("Failed to load archetype cache: %s", e)
+                self._loaded_mtime = mtime
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.exact_hits + self.nearest_hits
+            lookups = hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "tracked_archetypes": len(self._popularity),
+                "exact_hits": self.exact_hits,
+                "nearest_hits": self.nearest_hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+def _depersonalize(result: ScholarshipResult) -> ScholarshipResult:
+    for scholarship in result.scholarships:
+        scholarship.one_liner_reason = ARCHETYPE_REASON
+        scholarship.strategy_tip = ARCHETYPE_STRATEGY_TIP
+    return result
+
+
+def major_family(major: Any) -> str:
+    text = f" {_canonical(major)} "
+    for family, keywords in MAJOR_FAMILIES:
+        if any(keyword in text for keyword in keywords):
+            return family
+    return "other"
+
+
+def _canonical(value: Any) -> str:
+    return " ".join(str(value or "").strip().lower().split())
+
+
+def _jaccard(left: Iterable[str], right: Iterable[str]) -> float:
+    left, right = set(left), set(right)
+    if not left and not right:
+        return 1.0
+    return len(left & right) / len(left | right)
+
+
+def _encode_key(key: ArchetypeKey) -> str:
+    degree, family, countries, band = key
+    return "|".join([degree, family, ",".join(countries), str(band)])
+
+
+def _decode_key(encoded: str) -> ArchetypeKey:
+    degree, family, countries, band = encoded.split("|")
+    return degree, family, tuple(country for country in countries.split(",") if country), int(band)
+
+
+def profiles_from_journal(path: Path) -> Iterable[Dict[str, Any]]:
+    """Rebuild calculate-scholarships profiles from the lead journal."""
+    for record in iter_records(path):
+        try:
+            gpa = float(record.get("gpa") or 0)
+        except (TypeError, ValueError):
+            continue
+        countries = record.get("countries") or []
+        yield {
+            "degree_level": record.get("target_degree", ""),
+            "current_degree": record.get("current_degree") or None,
+            "gpa": gpa,
+            # The journal does not keep the scale; the form offers 10 and 100.
+            "gpa_scale": "10" if gpa <= 10 else "100",
+            "nationality": record.get("nationality") or None,
+            "target_countries": countries if isinstance(countries, list) else [str(countries)],
+            "intended_intake": record.get("intended_intake") or None,
+            "major": record.get("major", ""),
+            "work_experience_years": int(record.get("work_experience") or 0),
+            "profile_highlight": "",
+        }
+
+
+async def precompute(journal_path: Path, top: int, local_only: bool) -> int:
+    # gemini_service imports this module, so import it lazily.
+    from app.services.gemini_service import GeminiService
+
+    for profile in profiles_from_journal(journal_path):
+        archetype_cache.record(GeminiService._normalize_user_profile(profile))
+
+    compute = GeminiService._compute_local_archetype if local_only else GeminiService._compute_archetype
+    archetype_cache.load()
+    return await archetype_cache.refresh_popular(compute, top)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Maintain the scholarship archetype warm cache")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    precompute_parser = subparsers.add_parser(
+        "precompute",
+        help="compute results for the most common archetypes in the lead journal",
+    )
+    precompute_parser.add_argument("--journal", type=Path, default=JOURNAL_PATH)
+    precompute_parser.add_argument("--top", type=int, default=settings.archetype_cache_top)
+    precompute_parser.add_argument("--local", action="store_true", help="use the local matcher, not the AI providers")
+
+    subparsers.add_parser("list", help="list stored archetypes")
+
+    args = parser.parse_args()
+    if args.command == "precompute":
+        refreshed = asyncio.run(precompute(args.journal, args.top, args.local))
+        print(f"Precomputed {refreshed} archetypes into {archetype_cache.path}")
+    else:
+        archetype_cache.load()
+        for key, entry in sorted(archetype_cache._entries.items()):
+            age_hours = (time.time() - entry["computed_at"]) / 3600
+            print(f"{_encode_key(key)}\t{len(entry['result']['scholarships'])} matches\t{age_hours:.1f}h old")
+
+
+archetype_cache = ArchetypeCache(
+    ARCHETYPE_PATH,
+    gpa_band=settings.archetype_gpa_band,
+    refresh_after_seconds=settings.archetype_refresh_after_seconds,
+    min_country_overlap=settings.archetype_min_country_overlap,
+)
+
+
+if __name__ == "__main__":
+    main()
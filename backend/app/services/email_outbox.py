@@ -0,0 +1,262 @@
+import asyncio
+import json
+import logging
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict
+
+from app.config import settings
+from app.models import ScholarshipResult
+from app.services.email_service import EmailService
+from app.services.tracing import current_request_id, current_traceparent, request_context, tracer
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_PATH = Path(__file__).parent.parent / "data" / "email_outbox.sqlite3"
+MAX_BACKOFF_SECONDS = 3600.0
+
+
+class EmailOutbox:
+    """
+    Durable SQLite-backed queue for report emails.
+
+    submit_lead enqueues a job and returns straight away; worker tasks claim due jobs,
+    send them via EmailService in a thread and retry failures with exponential backoff
+    until max_attempts is reached. A claimed job carries a lease (owner and expiry);
+    jobs whose lease expired because their worker died mid-send are claimed again, while
+    jobs another live process is still sending are left alone.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        workers: int,
+        max_attempts: int,
+        base_backoff_seconds: float,
+        poll_interval_seconds: float,
+        lease_seconds: float,
+    ) -> None:
+        self.path = path
+        self.workers = max(1, workers)
+        self.max_attempts = max(1, max_attempts)
+        self.base_backoff_seconds = base_backoff_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self.lease_seconds = lease_seconds
+        self.owner = uuid.uuid4().hex
+        self._db_lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._tasks and not all(task.done() for task in self._tasks):
+            return
+
+        requeued = await asyncio.to_thread(self._requeue_interrupted)
+        if requeued:
+            logger.warning("Requeued %s report emails whose sending lease expired", requeued)
+
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._tasks = [loop.create_task(self._work(index)) for index in range(self.workers)]
+
+    async def stop(self) -> None:
+        if self._loop is not asyncio.get_running_loop():
+            return
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._loop = None
+
+    async def enqueue_report(self, recipient_email: str, recipient_name: str, scholarships: ScholarshipResult) -> str:
+        await self.start()
+        payload = {
+            "recipient_email": recipient_email,
+            "recipient_name": recipient_name,
+            "scholarship_results": scholarships.model_dump(),
+            # Lets the delivery's logs and spans join the submitting request's.
+            "request_id": current_request_id(),
+            "traceparent": current_traceparent(),
+        }
+        job_id = await asyncio.to_thread(self._insert, "scholarship_report", payload)
+        self._wakeup.set()
+        return job_id
+
+    async def get_status(self, job_id: str) -> Dict[str, Any] | None:
+        # A status lookup must not create the database (the filesystem may be read-only).
+        if self._connection is None and not self.path.exists():
+            return None
+        return await asyncio.to_thread(self._fetch_status, job_id)
+
+    async def _work(self, worker_index: int) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                job = await asyncio.to_thread(self._claim_due_job)
+            except Exception as e:
+                logger.exception("Email outbox worker %s failed to claim a job: %s", worker_index, e)
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            job_id, payload, attempts = job
+            with request_context(payload.get("request_id")), tracer.span(
+                "email_outbox.deliver",
+                traceparent=payload.get("traceparent"),
+                **{"email_outbox.job_id": job_id, "email_outbox.attempt": attempts + 1},
+            ):
+                try:
+                    sent = await asyncio.to_thread(
+                        EmailService.send_scholarship_report,
+                        payload["recipient_email"],
+                        payload["recipient_name"],
+                        ScholarshipResult(**payload["scholarship_results"]),
+                    )
+                    error = None if sent else "Email service could not send the report"
+                except Exception as e:
+                    sent = False
+                    error = f"{type(e).__name__}: {e}"
+
+                await asyncio.to_thread(self._record_attempt, job_id, attempts + 1, sent, error)
+
+    def _db(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS email_jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL,
+                    last_error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    claimed_by TEXT,
+                    lease_expires_at REAL
+                )
+                """
+            )
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(email_jobs)")}
+            for column, column_type in (("claimed_by", "TEXT"), ("lease_expires_at", "REAL")):
+                if column not in columns:
+                    connection.execute(f"ALTER TABLE email_jobs ADD COLUMN {column} {column_type}")
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS email_jobs_due ON email_jobs (status, next_attempt_at)"
+            )
+            self._connection = connection
+        return self._connection
+
+    def _insert(self, kind: str, payload: Dict[str, Any]) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._db_lock:
+            self._db().execute(
+                "INSERT INTO email_jobs (id, kind, payload, status, attempts, next_attempt_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, 'queued', 0, ?, ?, ?)",
+                (job_id, kind, json.dumps(payload, ensure_ascii=False), now, now, now),
+            )
+        return job_id
+
+    def _claim_due_job(self) -> tuple[str, Dict[str, Any], int] | None:
+        now = time.time()
+        with self._db_lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                row = db.execute(
+                    "SELECT id, payload, attempts FROM email_jobs "
+                    "WHERE (status = 'queued' AND next_attempt_at <= ?) "
+                    "OR (status = 'sending' AND COALESCE(lease_expires_at, 0) <= ?) "
+                    "ORDER BY next_attempt_at LIMIT 1",
+                    (now, now),
+                ).fetchone()
+                if row is not None:
+                    db.execute(
+                        "UPDATE email_jobs SET status = 'sending', claimed_by = ?, lease_expires_at = ?, updated_at = ? "
+                        "WHERE id = ?",
+                        (self.owner, now + self.lease_seconds, now, row[0]),
+                    )
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+
+        if row is None:
+            return None
+        return row[0], json.loads(row[1]), row[2]
+
+    def _record_attempt(self, job_id: str, attempts: int, sent: bool, error: str | None) -> None:
+        now = time.time()
+        if sent:
+            status, next_attempt_at = "sent", now
+        elif attempts >= self.max_attempts:
+            status, next_attempt_at = "failed", now
+            logger.error("Report email job %s failed permanently after %s attempts: %s", job_id, attempts, error)
+        else:
+            backoff = min(MAX_BACKOFF_SECONDS, self.base_backoff_seconds * (2 ** (attempts - 1)))
+            status, next_attempt_at = "queued", now + backoff * random.uniform(0.8, 1.2)
+            logger.warning("Report email job %s failed (attempt %s), retrying in %.0fs", job_id, attempts, backoff)
+
+        with self._db_lock:
+            cursor = self._db().execute(
+                "UPDATE email_jobs SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ?, updated_at = ?, "
+                "claimed_by = NULL, lease_expires_at = NULL WHERE id = ? AND claimed_by = ?",
+                (status, attempts, next_attempt_at, error, now, job_id, self.owner),
+            )
+        if cursor.rowcount == 0:
+            logger.warning("Report email job %s was reclaimed after its lease expired", job_id)
+
+    def _requeue_interrupted(self) -> int:
+        """Requeue jobs left in 'sending' by a worker whose lease has since expired."""
+        now = time.time()
+        with self._db_lock:
+            cursor = self._db().execute(
+                "UPDATE email_jobs SET status = 'queued', claimed_by = NULL, lease_expires_at = NULL, updated_at = ? "
+                "WHERE status = 'sending' AND COALESCE(lease_expires_at, 0) <= ?",
+                (now, now),
+            )
+            return cursor.rowcount
+
+    def _fetch_status(self, job_id: str) -> Dict[str, Any] | None:
+        with self._db_lock:
+            row = self._db().execute(
+                "SELECT id, status, attempts, created_at, updated_at FROM email_jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "job_id": row[0],
+            "status": row[1],
+            "attempts": row[2],
+            "created_at": row[3],
+            "updated_at": row[4],
+        }
+
+
+email_outbox = EmailOutbox(
+    OUTBOX_PATH,
+    workers=settings.email_outbox_workers,
+    max_attempts=settings.email_outbox_max_attempts,
+    base_backoff_seconds=settings.email_outbox_backoff_seconds,
+    poll_interval_seconds=settings.email_outbox_poll_interval_seconds,
+    lease_seconds=settings.email_outbox_lease_seconds,
+)
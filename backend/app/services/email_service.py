@@ -1,19 +1,28 @@
 import io
 import logging
-import smtplib
 from email.mime.application import MIMEApplication
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 
 from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
 from reportlab.lib.units import inch
-from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table
 
 from app.config import settings
 from app.models import ScholarshipResult
+from app.services.pdf_template import (
+    CARD_WIDTH,
+    DETAILS_COL_WIDTHS,
+    NEXT_STEPS_TEXT,
+    OVERVIEW_TEXT,
+    PAGE_MARGIN,
+    SUMMARY_COL_WIDTHS,
+    pdf_template,
+)
+from app.services.report_renderer import report_renderer
+from app.services.smtp_pool import smtp_pool
+from app.services.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
@@ -28,29 +37,28 @@ class EmailService:
         """
         Send scholarship report to user via email with a polished PDF attachment.
         """
-        try:
-            msg = MIMEMultipart("alternative")
-            msg["Subject"] = "Your Personalized Scholarship Report - Scholarship Finder"
-            msg["From"] = settings.smtp_user
-            msg["To"] = recipient_email
+        with tracer.span("email.send_report") as span:
+            try:
+                msg = MIMEMultipart("alternative")
+                msg["Subject"] = "Your Personalized Scholarship Report - Scholarship Finder"
+                msg["From"] = settings.smtp_user
+                msg["To"] = recipient_email
 
-            html_content = EmailService._generate_html_report(recipient_name, scholarships)
-            msg.attach(MIMEText(html_content, "html"))
+                html_content, pdf_bytes = report_renderer.render(recipient_name, scholarships)
+                msg.attach(MIMEText(html_content, "html"))
 
-            pdf_bytes = EmailService._generate_pdf_report(recipient_name, scholarships)
-            pdf_part = MIMEApplication(pdf_bytes, Name="scholarship_report.pdf")
-            pdf_part["Content-Disposition"] = 'attachment; filename="scholarship_report.pdf"'
-            msg.attach(pdf_part)
+                pdf_part = MIMEApplication(pdf_bytes, Name="scholarship_report.pdf")
+                pdf_part["Content-Disposition"] = 'attachment; filename="scholarship_report.pdf"'
+                msg.attach(pdf_part)
+                span.set_attribute("email.pdf_bytes", len(pdf_bytes))
 
-            with smtplib.SMTP(settings.smtp_host, settings.smtp_port) as server:
-                server.starttls()
-                server.login(settings.smtp_user, settings.smtp_password)
-                server.send_message(msg)
+                smtp_pool.send_message(msg)
 
-            return True
-        except Exception as e:
-            logger.exception("Email service error: %s", e)
-            return False
+                return True
+            except Exception as e:
+                logger.exception("Email service error: %s", e)
+                span.set_attribute("outcome", "error")
+                return False
 
     @staticmethod
     def _generate_html_report(name: str, scholarships: ScholarshipResult) -> str:
@@ -106,165 +114,55 @@ class EmailService:
         doc = SimpleDocTemplate(
             buffer,
             pagesize=A4,
-            rightMargin=40,
-            leftMargin=40,
-            topMargin=40,
-            bottomMargin=40,
+            rightMargin=PAGE_MARGIN,
+            leftMargin=PAGE_MARGIN,
+            topMargin=PAGE_MARGIN,
+            bottomMargin=PAGE_MARGIN,
         )
         ranked_scholarships = sorted(
             scholarships.scholarships,
             key=lambda scholarship: scholarship.match_score,
             reverse=True,
         )
-
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            "TitleStyle",
-            parent=styles["Title"],
-            fontName="Helvetica-Bold",
-            fontSize=22,
-            leading=28,
-            textColor=colors.HexColor("#1d4ed8"),
-            alignment=TA_CENTER,
-            spaceAfter=14,
-        )
-        subtitle_style = ParagraphStyle(
-            "SubtitleStyle",
-            parent=styles["BodyText"],
-            fontName="Helvetica",
-            fontSize=11,
-            leading=16,
-            textColor=colors.HexColor("#334155"),
-            spaceAfter=10,
-            alignment=TA_CENTER,
-        )
-        section_style = ParagraphStyle(
-            "SectionStyle",
-            parent=styles["Heading2"],
-            fontName="Helvetica-Bold",
-            fontSize=14,
-            leading=18,
-            textColor=colors.HexColor("#0f172a"),
-            spaceAfter=10,
-        )
-        body_style = ParagraphStyle(
-            "BodyStyle",
-            parent=styles["BodyText"],
-            fontName="Helvetica",
-            fontSize=10,
-            leading=14,
-            textColor=colors.HexColor("#334155"),
-            wordWrap="CJK",
-        )
-        small_style = ParagraphStyle(
-            "SmallStyle",
-            parent=styles["BodyText"],
-            fontName="Helvetica",
-            fontSize=9,
-            leading=13,
-            textColor=colors.HexColor("#475569"),
-            wordWrap="CJK",
-        )
-        card_title_style = ParagraphStyle(
-            "CardTitleStyle",
-            parent=styles["Heading3"],
-            fontName="Helvetica-Bold",
-            fontSize=11,
-            leading=15,
-            textColor=colors.HexColor("#1e3a8a"),
-            wordWrap="CJK",
-        )
-        meta_style = ParagraphStyle(
-            "MetaStyle",
-            parent=styles["BodyText"],
-            fontName="Helvetica",
-            fontSize=9,
-            leading=12,
-            textColor=colors.HexColor("#1f2937"),
-            wordWrap="CJK",
-        )
-        label_style = ParagraphStyle(
-            "LabelStyle",
-            parent=styles["BodyText"],
-            fontName="Helvetica-Bold",
-            fontSize=9,
-            leading=12,
-            textColor=colors.HexColor("#0f172a"),
-            wordWrap="CJK",
-        )
+        template = pdf_template
+        safe_text = EmailService._safe_pdf_text
 
         story = [
-            Paragraph("Scholarship Finder Report", title_style),
+            Paragraph("Scholarship Finder Report", template.title),
             Paragraph(
-                EmailService._safe_pdf_text(
+                safe_text(
                     f"Prepared for {name} | Estimated success probability: {scholarships.summary_probability}%"
                 ),
-                subtitle_style,
+                template.subtitle,
             ),
             Spacer(1, 0.15 * inch),
         ]
 
         summary_table = Table(
             [
-                ["Candidate", EmailService._safe_pdf_text(name)],
+                ["Candidate", safe_text(name)],
                 ["Shortlisted Scholarships", str(len(ranked_scholarships))],
                 ["Success Probability", f"{scholarships.summary_probability}%"],
             ],
-            colWidths=[2.0 * inch, 4.3 * inch],
-        )
-        summary_table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, -1), colors.HexColor("#eff6ff")),
-                    ("TEXTCOLOR", (0, 0), (-1, -1), colors.HexColor("#0f172a")),
-                    ("FONTNAME", (0, 0), (0, -1), "Helvetica-Bold"),
-                    ("FONTNAME", (1, 0), (1, -1), "Helvetica"),
-                    ("BOX", (0, 0), (-1, -1), 0.5, colors.HexColor("#bfdbfe")),
-                    ("INNERGRID", (0, 0), (-1, -1), 0.5, colors.HexColor("#bfdbfe")),
-                    ("PADDING", (0, 0), (-1, -1), 8),
-                ]
-            )
+            colWidths=SUMMARY_COL_WIDTHS,
         )
+        summary_table.setStyle(template.summary_table)
         overview_table = Table(
             [
-                [
-                    Paragraph(
-                        EmailService._safe_pdf_text(
-                            "Scholarship Finder is an AI-assisted scholarship shortlisting platform designed to help students focus on the scholarships they are more likely to win. This report combines your academic fit, intake preference, target country choices, and profile strengths into a practical shortlist."
-                        ),
-                        small_style,
-                    )
-                ],
-                [
-                    Paragraph(
-                        EmailService._safe_pdf_text(
-                            "How to use this PDF: Start with the highest match score, compare deadlines carefully, and use the 'Why it fits' and 'Strategy tip' notes to prioritize the scholarships that deserve your immediate effort."
-                        ),
-                        small_style,
-                    )
-                ],
+                [template.paragraph(safe_text(text), template.small)]
+                for text in OVERVIEW_TEXT
             ],
-            colWidths=[6.3 * inch],
-        )
-        overview_table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, -1), colors.HexColor("#f8fafc")),
-                    ("BOX", (0, 0), (-1, -1), 0.5, colors.HexColor("#cbd5e1")),
-                    ("INNERGRID", (0, 0), (-1, -1), 0.35, colors.HexColor("#e2e8f0")),
-                    ("PADDING", (0, 0), (-1, -1), 9),
-                    ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                ]
-            )
+            colWidths=[CARD_WIDTH],
         )
+        overview_table.setStyle(template.overview_table)
         story.extend(
             [
                 summary_table,
                 Spacer(1, 0.18 * inch),
-                Paragraph("About This Report", section_style),
+                Paragraph("About This Report", template.section),
                 overview_table,
                 Spacer(1, 0.25 * inch),
-                Paragraph("Top Scholarship Matches", section_style),
+                Paragraph("Top Scholarship Matches", template.section),
             ]
         )
 
@@ -272,70 +170,45 @@ class EmailService:
             details_table = Table(
                 [
                     [
-                        Paragraph("Match Score", label_style),
-                        Paragraph(EmailService._safe_pdf_text(f"{scholarship.match_score}%"), meta_style),
-                    ],
-                    [
-                        Paragraph("Amount", label_style),
-                        Paragraph(EmailService._safe_pdf_text(scholarship.amount), meta_style),
-                    ],
-                    [
-                        Paragraph("Deadline", label_style),
-                        Paragraph(EmailService._safe_pdf_text(scholarship.deadline), meta_style),
-                    ],
-                ],
-                colWidths=[1.15 * inch, 5.15 * inch],
-            )
-            details_table.setStyle(
-                TableStyle(
-                    [
-                        ("BACKGROUND", (0, 0), (-1, -1), colors.white),
-                        ("BOX", (0, 0), (-1, -1), 0.35, colors.HexColor("#e2e8f0")),
-                        ("INNERGRID", (0, 0), (-1, -1), 0.3, colors.HexColor("#e2e8f0")),
-                        ("PADDING", (0, 0), (-1, -1), 6),
-                        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+                        template.paragraph(label, template.label),
+                        template.paragraph(safe_text(value), template.meta),
                     ]
-                )
+                    for label, value in (
+                        ("Match Score", f"{scholarship.match_score}%"),
+                        ("Amount", scholarship.amount),
+                        ("Deadline", scholarship.deadline),
+                    )
+                ],
+                colWidths=DETAILS_COL_WIDTHS,
             )
+            details_table.setStyle(template.details_table)
             card_rows = [
+                [template.paragraph(safe_text(f"{index}. {scholarship.name}"), template.card_title)],
+                [details_table],
                 [
-                    Paragraph(
-                        EmailService._safe_pdf_text(f"{index}. {scholarship.name}"),
-                        card_title_style,
+                    template.paragraph(
+                        safe_text(scholarship.one_liner_reason),
+                        template.body,
+                        prefix="Why it fits:",
+                    )
+                ],
+                [
+                    template.paragraph(
+                        safe_text(scholarship.strategy_tip),
+                        template.body,
+                        prefix="Strategy tip:",
                     )
                 ],
-                [details_table],
-                [Paragraph(f"<b>Why it fits:</b> {EmailService._safe_pdf_text(scholarship.one_liner_reason)}", body_style)],
-                [Paragraph(f"<b>Strategy tip:</b> {EmailService._safe_pdf_text(scholarship.strategy_tip)}", body_style)],
             ]
-            card = Table(card_rows, colWidths=[6.3 * inch])
-            card.setStyle(
-                TableStyle(
-                    [
-                        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#dbeafe")),
-                        ("TEXTCOLOR", (0, 0), (-1, 0), colors.HexColor("#1e3a8a")),
-                        ("BOX", (0, 0), (-1, -1), 0.6, colors.HexColor("#cbd5e1")),
-                        ("INNERGRID", (0, 0), (-1, -1), 0.3, colors.HexColor("#e2e8f0")),
-                        ("BACKGROUND", (0, 1), (-1, -1), colors.white),
-                        ("PADDING", (0, 0), (-1, -1), 8),
-                        ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                    ]
-                )
-            )
+            card = Table(card_rows, colWidths=[CARD_WIDTH])
+            card.setStyle(template.card_table)
             story.extend([card, Spacer(1, 0.18 * inch)])
 
         story.extend(
             [
                 Spacer(1, 0.15 * inch),
-                Paragraph("Recommended Next Steps", section_style),
-                Paragraph(
-                    EmailService._safe_pdf_text(
-                        "1. Prioritize the scholarships with the highest match and earliest deadlines. "
-                        "2. Prepare application essays and documents before the next deadline window. "
-                        "3. Tailor each application to the scholarship's academic and leadership expectations."
-                    ),
-                    small_style,
-                ),
+                Paragraph("Recommended Next Steps", template.section),
+                template.paragraph(safe_text(NEXT_STEPS_TEXT), template.small),
             ]
         )
 
@@ -399,10 +272,7 @@ class EmailService:
 
             msg.attach(MIMEText(html, "html"))
 
-            with smtplib.SMTP(settings.smtp_host, settings.smtp_port) as server:
-                server.starttls()
-                server.login(settings.smtp_user, settings.smtp_password)
-                server.send_message(msg)
+            smtp_pool.send_message(msg)
 
             return True
         except Exception as e:
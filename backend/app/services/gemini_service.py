@@ -1,13 +1,21 @@
+import asyncio
 import json
 import logging
+import time
 from datetime import date
 from pathlib import Path
-from typing import Any, Dict
-
-import httpx
+from typing import Any, AsyncIterator, Dict
 
 from app.config import settings
 from app.models import Scholarship, ScholarshipResult
+from app.services.archetype_cache import archetype_cache
+from app.services.http_client import get_http_client
+from app.services.metrics import PROVIDER_SECONDS, STAGE_SECONDS
+from app.services.normalized_profile import NormalizedProfile
+from app.services.result_cache import ResultCache, result_cache
+from app.services.scholarship_catalog import ScholarshipCatalog
+from app.services.single_flight import scholarship_flights
+from app.services.stream_parser import ScholarshipStreamParser
 
 try:
     import google.generativeai as genai
@@ -22,49 +30,245 @@ TODAY = date.today()
 
 class GeminiService:
     @staticmethod
-    def get_scholarships(user_profile: Dict[str, Any]) -> ScholarshipResult:
+    async def get_scholarships(user_profile: Dict[str, Any]) -> ScholarshipResult:
         """
         Generate matching scholarships.
         Preference order:
         1. OpenAI-compatible API via API_KEY
         2. Google Gemini via GOOGLE_API_KEY
+
+        Results are cached per normalized profile, so repeat profiles skip the provider call,
+        and concurrent requests for exactly the same profile share a single provider call
+        (keyed without GPA bucketing, so each caller gets an answer for its own GPA). The
+        local matcher is cheap and runs per caller, outside the shared call. With the archetype
+        cache enabled, a precomputed result for the nearest popular archetype is served
+        instead, and refreshed in the background once it goes stale.
         """
-        if settings.api_key:
-            result = GeminiService._get_scholarships_openrouter(user_profile)
-            if result is not None:
+        profile = GeminiService._normalize_user_profile(user_profile)
+        cache_key = ResultCache.make_key(profile, settings.result_cache_gpa_bucket)
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Serving scholarships from result cache")
+            return cached
+
+        if settings.archetype_cache_enabled:
+            archetype_cache.record(profile)
+            match = archetype_cache.lookup(profile)
+            if match is not None:
+                archetype, result, stale = match
+                if stale:
+                    archetype_cache.schedule_refresh(archetype, GeminiService._compute_archetype)
+                logger.info("Serving scholarships from archetype cache")
+                return result
+
+        result = await scholarship_flights.do(
+            ResultCache.make_key(profile, 0),
+            lambda: GeminiService._calculate_scholarships(profile, cache_key),
+        )
+        if result is None:
+            logger.warning("No working AI provider available, using local scholarship matcher")
+            return GeminiService._get_local_fallback_result(profile)
+        return result.model_copy(deep=True)
+
+    @staticmethod
+    async def _calculate_scholarships(profile: NormalizedProfile, cache_key: str) -> ScholarshipResult | None:
+        result = await GeminiService._get_provider_result(profile)
+        if GeminiService._has_real_matches(result):
+            result_cache.set(cache_key, result)
+        return result
+
+    @staticmethod
+    async def _compute_archetype(user_profile: Dict[str, Any]) -> ScholarshipResult | None:
+        profile = GeminiService._normalize_user_profile(user_profile)
+        result = await GeminiService._get_provider_result(profile)
+        if not GeminiService._has_real_matches(result):
+            result = GeminiService._get_local_fallback_result(profile)
+        return result if GeminiService._has_real_matches(result) else None
+
+    @staticmethod
+    async def _compute_local_archetype(user_profile: Dict[str, Any]) -> ScholarshipResult | None:
+        result = GeminiService._get_local_fallback_result(GeminiService._normalize_user_profile(user_profile))
+        return result if GeminiService._has_real_matches(result) else None
+
+    @staticmethod
+    async def stream_scholarships(user_profile: Dict[str, Any]) -> AsyncIterator[tuple[str, Any]]:
+        """
+        Streaming variant of get_scholarships.
+
+        Yields ("scholarship", Scholarship) as soon as each match is complete in the
+        OpenAI-compatible provider's streamed answer, then ("result", ScholarshipResult)
+        with the final ranked result. Cached results are replayed. A stream cut short
+        still returns the matches it produced but is not cached; if streaming fails
+        before producing a match, Gemini and then the local matcher are used, without
+        calling the OpenAI-compatible provider a second time.
+        """
+        profile = GeminiService._normalize_user_profile(user_profile)
+        cache_key = ResultCache.make_key(profile, settings.result_cache_gpa_bucket)
+        result = result_cache.get(cache_key)
+
+        if result is None and settings.api_key:
+            streamed: list[Scholarship] = []
+            summary_probability = 0
+            complete = False
+            try:
+                async for event, value in GeminiService._stream_scholarships_openrouter(profile):
+                    if event == "summary_probability":
+                        summary_probability = value
+                    elif event == "complete":
+                        complete = True
+                    else:
+                        streamed.append(value)
+                        yield "scholarship", value
+            except Exception as e:
+                logger.exception("Streaming provider error: %s: %s", type(e).__name__, e)
+
+            if streamed:
+                result = GeminiService._build_ranked_result(summary_probability, streamed)
+                if complete and GeminiService._has_real_matches(result):
+                    result_cache.set(cache_key, result)
+                elif not complete:
+                    logger.warning("Streaming provider stopped early, not caching %s partial matches", len(streamed))
+                yield "result", result
+                return
+
+            logger.warning("Streaming provider produced no matches, falling back to Gemini and the local matcher")
+            result = await GeminiService._get_stream_fallback_result(profile, cache_key)
+
+        if result is None:
+            result = await GeminiService.get_scholarships(profile)
+        for scholarship in result.scholarships:
+            yield "scholarship", scholarship
+        yield "result", result
+
+    @staticmethod
+    async def _get_stream_fallback_result(profile: NormalizedProfile, cache_key: str) -> ScholarshipResult:
+        if settings.google_api_key:
+            result = await GeminiService._run_provider(
+                "Gemini", GeminiService._get_scholarships_gemini, settings.gemini_timeout_seconds, profile
+            )
+            if GeminiService._has_real_matches(result):
+                result_cache.set(cache_key, result)
                 return result
-            logger.warning("OpenAI-compatible provider failed, falling back to Gemini")
 
+        return GeminiService._get_local_fallback_result(profile)
+
+    @staticmethod
+    async def _get_provider_result(profile: NormalizedProfile) -> ScholarshipResult | None:
+        providers = []
+        if settings.api_key:
+            providers.append(
+                ("OpenAI-compatible", GeminiService._get_scholarships_openrouter, settings.openrouter_timeout_seconds)
+            )
         if settings.google_api_key:
-            result = GeminiService._get_scholarships_gemini(user_profile)
-            if result is not None:
+            providers.append(("Gemini", GeminiService._get_scholarships_gemini, settings.gemini_timeout_seconds))
+
+        strategy = settings.provider_strategy.strip().lower()
+        if len(providers) > 1 and strategy in {"hedged", "parallel"}:
+            hedge_delay = 0.0 if strategy == "parallel" else max(0.0, settings.provider_hedge_delay_seconds)
+            return await GeminiService._race_providers(profile, providers, hedge_delay)
+
+        fallback = None
+        for index, (name, provider, budget) in enumerate(providers):
+            result = await GeminiService._run_provider(name, provider, budget, profile)
+            if GeminiService._has_real_matches(result):
                 return result
+            fallback = fallback or result
+            if index + 1 < len(providers):
+                logger.warning("%s provider failed, falling back to %s", name, providers[index + 1][0])
+
+        return fallback
+
+    @staticmethod
+    async def _race_providers(
+        profile: NormalizedProfile,
+        providers: list[tuple[str, Any, float]],
+        hedge_delay: float,
+    ) -> ScholarshipResult | None:
+        """
+        Start providers in preference order, launching the next one once the hedge delay
+        elapses or the running ones have all failed. The first result with real matches
+        wins and the remaining calls are cancelled.
+        """
+        pending: set[asyncio.Task] = set()
+        fallback = None
+        next_index = 0
+
+        def launch_next() -> None:
+            nonlocal next_index
+            name, provider, budget = providers[next_index]
+            next_index += 1
+            pending.add(asyncio.create_task(GeminiService._run_provider(name, provider, budget, profile)))
+
+        try:
+            launch_next()
+            while pending or next_index < len(providers):
+                if not pending:
+                    launch_next()
+                    continue
+
+                timeout = hedge_delay if next_index < len(providers) else None
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    logger.info("Hedge delay elapsed, starting %s provider", providers[next_index][0])
+                    launch_next()
+                    continue
+
+                for task in done:
+                    result = task.result()
+                    if GeminiService._has_real_matches(result):
+                        return result
+                    fallback = fallback or result
+            return fallback
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    @staticmethod
+    async def _run_provider(name: str, provider, budget: float, profile: NormalizedProfile) -> ScholarshipResult | None:
+        with PROVIDER_SECONDS.time(provider=name) as timer:
+            try:
+                result = await asyncio.wait_for(provider(profile), timeout=budget)
+            except asyncio.TimeoutError:
+                logger.warning("%s provider exceeded its %.1fs latency budget", name, budget)
+                timer.outcome = "timeout"
+                return None
+
+            if result is None:
+                timer.outcome = "error"
+            elif not GeminiService._has_real_matches(result):
+                timer.outcome = "no_matches"
+            return result
 
-        logger.warning("No working AI provider available, using local scholarship matcher")
-        return GeminiService._get_local_fallback_result(user_profile)
+    @staticmethod
+    def _has_real_matches(result: ScholarshipResult | None) -> bool:
+        # Placeholder results (no matches, no fresh data) all carry a zero match score.
+        return bool(result and result.scholarships) and any(
+            scholarship.match_score > 0 for scholarship in result.scholarships
+        )
 
     @staticmethod
-    def _build_prompt(user_profile: Dict[str, Any]) -> str:
-        normalized_profile = GeminiService._normalize_user_profile(user_profile)
-        user_profile_str = json.dumps(normalized_profile, indent=2)
-        nationality = normalized_profile.get("nationality") or "the student's"
-        target_countries = ", ".join(normalized_profile.get("target_countries", [])) or "the stated target countries"
-        english_test = normalized_profile.get("english_test_summary") or "Not taken yet"
-        intake = normalized_profile.get("intended_intake") or "current / next available intake"
+    def _build_prompt(profile: NormalizedProfile) -> str:
+        user_profile_str = json.dumps(profile.as_dict(), indent=2)
+        nationality = profile.nationality or "the student's"
+        target_countries = ", ".join(profile.target_countries) or "the stated target countries"
+        english_test = profile.english_test_summary or "Not taken yet"
+        intake = profile.intended_intake or "current / next available intake"
 
         return f"""Analyze this student profile and find 5 REAL, ACTIVE scholarships as of {TODAY.isoformat()} for the current or next active admissions cycle.
 
 PROFILE TO MATCH:
 - Nationality / citizenship: {nationality}
 - Target countries: {target_countries}
-- Degree level sought: {normalized_profile.get("degree_level")}
-- Current / last degree: {normalized_profile.get("current_degree") or "Not specified"}
-- Major / field: {normalized_profile.get("major")}
-- GPA: {normalized_profile.get("gpa")} on {normalized_profile.get("gpa_scale")} scale ({normalized_profile.get("gpa_percentage")} percent equivalent)
+- Degree level sought: {profile.degree_level}
+- Current / last degree: {profile.current_degree or "Not specified"}
+- Major / field: {profile.major}
+- GPA: {profile.gpa} on {profile.gpa_scale} scale ({profile.gpa_percentage} percent equivalent)
 - Intended intake: {intake}
 - English test status: {english_test}
-- Work experience: {normalized_profile.get("work_experience_years", 0)} years
-- Extra context: {normalized_profile.get("profile_highlight") or "None provided"}
+- Work experience: {profile.work_experience_years} years
+- Extra context: {profile.profile_highlight or "None provided"}
 
 RAW PROFILE JSON:
 
@@ -99,41 +303,44 @@ Return ONLY this JSON format:
 
     @staticmethod
     def _parse_result(response_text: str) -> ScholarshipResult:
-        if response_text.startswith("```json"):
-            response_text = response_text[7:]
-        if response_text.startswith("```"):
-            response_text = response_text[3:]
-        if response_text.endswith("```"):
-            response_text = response_text[:-3]
-        response_text = response_text.strip()
-
-        data = json.loads(response_text)
-        scholarships_data = data.get("scholarships", [])
-        if not scholarships_data:
-            logger.warning("No scholarships returned from AI provider")
-            return GeminiService._get_fallback_result()
-
-        scholarships = [
-            Scholarship(**scholarship)
-            for scholarship in scholarships_data
-            if GeminiService._is_fresh_deadline(scholarship.get("deadline"))
-        ]
-        if not scholarships:
-            logger.warning("AI provider returned only stale or expired scholarships")
-            return GeminiService._get_no_fresh_data_result()
-
-        scholarships.sort(key=lambda scholarship: (-scholarship.match_score, scholarship.deadline))
-
-        result = ScholarshipResult(
-            summary_probability=data.get("summary_probability", 0),
-            scholarships=scholarships[:5],
-        )
+        with STAGE_SECONDS.time(stage="parse_result") as timer:
+            if response_text.startswith("```json"):
+                response_text = response_text[7:]
+            if response_text.startswith("```"):
+                response_text = response_text[3:]
+            if response_text.endswith("```"):
+                response_text = response_text[:-3]
+            response_text = response_text.strip()
+
+            data = json.loads(response_text)
+            scholarships_data = data.get("scholarships", [])
+            if not scholarships_data:
+                logger.warning("No scholarships returned from AI provider")
+                timer.outcome = "no_matches"
+                return GeminiService._get_fallback_result()
+
+            scholarships = [
+                Scholarship(**scholarship)
+                for scholarship in scholarships_data
+                if GeminiService._is_fresh_deadline(scholarship.get("deadline"))
+            ]
+            if not scholarships:
+                logger.warning("AI provider returned only stale or expired scholarships")
+                timer.outcome = "stale"
+                return GeminiService._get_no_fresh_data_result()
+
+            result = GeminiService._build_ranked_result(data.get("summary_probability", 0), scholarships)
         logger.info("Successfully found %s scholarships", len(result.scholarships))
         return result
 
     @staticmethod
-    def _get_scholarships_openrouter(user_profile: Dict[str, Any]) -> ScholarshipResult | None:
-        prompt = GeminiService._build_prompt(user_profile)
+    def _build_ranked_result(summary_probability: Any, scholarships: list[Scholarship]) -> ScholarshipResult:
+        ranked = sorted(scholarships, key=lambda scholarship: (-scholarship.match_score, scholarship.deadline))
+        return ScholarshipResult(summary_probability=summary_probability, scholarships=ranked[:5])
+
+    @staticmethod
+    def _build_openrouter_request(profile: NormalizedProfile) -> tuple[str, Dict[str, Any], Dict[str, str]]:
+        prompt = GeminiService._build_prompt(profile)
         payload: Dict[str, Any] = {
             "model": settings.openrouter_model or "tencent/hy3:free",
             "messages": [
@@ -158,15 +365,22 @@ Return ONLY this JSON format:
             "HTTP-Referer": settings.frontend_url,
             "X-OpenRouter-Title": "Scholarship Finder",
         }
+        url = f"{settings.openrouter_base_url.rstrip('/')}/chat/completions"
+        return url, payload, headers
+
+    @staticmethod
+    async def _get_scholarships_openrouter(profile: NormalizedProfile) -> ScholarshipResult | None:
+        url, payload, headers = GeminiService._build_openrouter_request(profile)
 
         try:
-            with httpx.Client(timeout=45, follow_redirects=True) as client:
-                response = client.post(
-                    "https://openrouter.ai/api/v1/chat/completions",
-                    headers=headers,
-                    json=payload,
-                )
-                response.raise_for_status()
+            client = get_http_client()
+            response = await client.post(
+                url,
+                headers=headers,
+                json=payload,
+                timeout=settings.openrouter_timeout_seconds,
+            )
+            response.raise_for_status()
 
             data = response.json()
             content = data["choices"][0]["message"]["content"]
@@ -189,12 +403,79 @@ Return ONLY this JSON format:
             return None
 
     @staticmethod
-    def _get_scholarships_gemini(user_profile: Dict[str, Any]) -> ScholarshipResult | None:
+    async def _stream_scholarships_openrouter(profile: NormalizedProfile) -> AsyncIterator[tuple[str, Any]]:
+        """
+        Request a streamed completion and yield ("scholarship", Scholarship) for each valid,
+        fresh match as soon as its JSON object is complete, plus ("summary_probability",
+        value) when that field arrives and ("complete", True) once the provider sent
+        [DONE] or the answer's JSON object closed. Raises on transport errors or when the
+        overall latency budget is exceeded.
+        """
+        url, payload, headers = GeminiService._build_openrouter_request(profile)
+        payload["stream"] = True
+        parser = ScholarshipStreamParser()
+        deadline = time.monotonic() + settings.openrouter_timeout_seconds
+
+        client = get_http_client()
+        async with client.stream(
+            "POST",
+            url,
+            headers=headers,
+            json=payload,
+            timeout=settings.openrouter_timeout_seconds,
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if time.monotonic() > deadline:
+                    raise TimeoutError(
+                        f"Streaming provider exceeded its {settings.openrouter_timeout_seconds:.1f}s latency budget"
+                    )
+                # SSE comments (": OPENROUTER PROCESSING") and blank separators carry no data.
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    yield "complete", True
+                    break
+
+                chunk = json.loads(data)
+                if chunk.get("error"):
+                    raise RuntimeError(f"Streaming provider error: {chunk['error']}")
+                choices = chunk.get("choices") or [{}]
+                content = (choices[0].get("delta") or {}).get("content")
+                if not content:
+                    continue
+
+                for event, value in parser.feed(content):
+                    if event == "field" and value[0] == "summary_probability":
+                        yield "summary_probability", value[1]
+                    elif event == "scholarship":
+                        scholarship = GeminiService._validate_streamed_scholarship(value)
+                        if scholarship is not None:
+                            yield "scholarship", scholarship
+                if parser.finished:
+                    yield "complete", True
+                    break
+
+        logger.info("OpenAI-compatible streamed response received")
+
+    @staticmethod
+    def _validate_streamed_scholarship(data: Dict[str, Any]) -> Scholarship | None:
+        if not GeminiService._is_fresh_deadline(data.get("deadline")):
+            return None
+        try:
+            return Scholarship(**data)
+        except Exception as e:
+            logger.warning("Skipping invalid streamed scholarship: %s", e)
+            return None
+
+    @staticmethod
+    async def _get_scholarships_gemini(profile: NormalizedProfile) -> ScholarshipResult | None:
         if genai is None:
             logger.error("google.generativeai is not available")
             return None
 
-        prompt = GeminiService._build_prompt(user_profile)
+        prompt = GeminiService._build_prompt(profile)
 
         try:
             genai.configure(api_key=settings.google_api_key)
@@ -206,7 +487,7 @@ Return ONLY this JSON format:
                     "scholarships and output strict JSON."
                 ),
             )
-            response = model.generate_content(
+            response = await model.generate_content_async(
                 prompt,
                 generation_config=genai.types.GenerationConfig(
                     temperature=0.2,
@@ -242,59 +523,71 @@ Return ONLY this JSON format:
         )
 
     @staticmethod
-    def _get_local_fallback_result(user_profile: Dict[str, Any]) -> ScholarshipResult:
-        try:
-            with open(SCHOLARSHIP_DATA_PATH, "r", encoding="utf-8") as file:
-                scholarships = json.load(file)
-        except Exception as e:
-            logger.exception("Failed to load local scholarship data: %s", e)
-            return GeminiService._get_fallback_result()
-
-        matches = []
-        for item in scholarships:
-            if not GeminiService._is_fresh_deadline(item.get("deadline")):
-                continue
-
-            score = GeminiService._score_local_match(item, user_profile)
-            if score < 45:
-                continue
+    def _get_local_fallback_result(profile: NormalizedProfile) -> ScholarshipResult:
+        with STAGE_SECONDS.time(stage="local_matcher") as timer:
+            try:
+                catalog = scholarship_catalog.snapshot()
+            except Exception as e:
+                logger.exception("Failed to load local scholarship data: %s", e)
+                timer.outcome = "error"
+                return GeminiService._get_fallback_result()
+
+            candidate_positions = catalog.candidate_positions(profile.degree_level, profile.target_countries)
+
+            if catalog.scorer is not None:
+                scores = catalog.scorer.score(
+                    profile,
+                    candidate_positions,
+                    GeminiService._score_major_match,
+                ).tolist()
+            else:
+                scores = [
+                    GeminiService._score_local_match(catalog.items[position], profile)
+                    for position in candidate_positions
+                ]
+
+            matches = []
+            for position, score in zip(candidate_positions, scores):
+                item = catalog.items[position]
+                if score < 45:
+                    continue
 
-            matches.append(
-                Scholarship(
-                    name=item["name"],
-                    amount=item["amount"],
-                    deadline=item["deadline"],
-                    match_score=score,
-                    one_liner_reason=GeminiService._build_local_reason(item, user_profile, score),
-                    strategy_tip=GeminiService._build_local_strategy(item, user_profile),
+                matches.append(
+                    Scholarship(
+                        name=item["name"],
+                        amount=item["amount"],
+                        deadline=item["deadline"],
+                        match_score=score,
+                        one_liner_reason=GeminiService._build_local_reason(item, profile, score),
+                        strategy_tip=GeminiService._build_local_strategy(item, profile),
+                    )
                 )
-            )
 
-        matches = GeminiService._sort_by_deadline(matches)
-        matches.sort(key=lambda scholarship: (-scholarship.match_score, scholarship.deadline))
+            matches = GeminiService._sort_by_deadline(matches)
+            matches.sort(key=lambda scholarship: (-scholarship.match_score, scholarship.deadline))
 
-        if not matches:
-            logger.warning("Local scholarship matcher found no fresh scholarship data")
-            return GeminiService._get_no_fresh_data_result()
+            if not matches:
+                logger.warning("Local scholarship matcher found no fresh scholarship data")
+                timer.outcome = "no_matches"
+                return GeminiService._get_no_fresh_data_result()
 
-        top_matches = matches[:5]
-        summary_probability = min(92, max(45, int(sum(item.match_score for item in top_matches) / len(top_matches))))
-        logger.info("Local scholarship matcher returned %s scholarships", len(top_matches))
-        return ScholarshipResult(
-            summary_probability=summary_probability,
-            scholarships=top_matches,
-        )
+            top_matches = matches[:5]
+            summary_probability = min(92, max(45, int(sum(item.match_score for item in top_matches) / len(top_matches))))
+            logger.info("Local scholarship matcher returned %s scholarships", len(top_matches))
+            return ScholarshipResult(
+                summary_probability=summary_probability,
+                scholarships=top_matches,
+            )
 
     @staticmethod
-    def _score_local_match(item: Dict[str, Any], user_profile: Dict[str, Any]) -> int:
+    def _score_local_match(item: Dict[str, Any], profile: NormalizedProfile) -> int:
         score = 0
-        normalized_profile = GeminiService._normalize_user_profile(user_profile)
-        degree_level = str(normalized_profile.get("degree_level", "")).strip()
-        target_countries = [str(country).strip() for country in normalized_profile.get("target_countries", [])]
-        major = str(user_profile.get("major", "")).strip().lower()
-        work_experience = int(normalized_profile.get("work_experience_years", 0) or 0)
-        test_scores = normalized_profile.get("test_scores") or {}
-        user_percentage = normalized_profile.get("gpa_percentage", 0)
+        degree_level = str(profile.degree_level).strip()
+        target_countries = [str(country).strip() for country in profile.target_countries]
+        major = str(profile.major).strip().lower()
+        work_experience = int(profile.work_experience_years or 0)
+        test_scores = profile.test_scores
+        user_percentage = profile.gpa_percentage
         scholarship_degree_levels = [
             GeminiService._normalize_degree_level(level)
             for level in item.get("degreeLevels", [])
@@ -343,48 +636,53 @@ Return ONLY this JSON format:
                         test_match_points = max(test_match_points, 5)
                 except (TypeError, ValueError):
                     continue
-            if not test_match_points and normalized_profile.get("english_test_type"):
+            if not test_match_points and profile.english_test_type:
                 test_match_points = 2
             score += test_match_points
 
-        intake_bonus = GeminiService._score_intake_fit(item, normalized_profile.get("intended_intake"))
+        intake_bonus = GeminiService._score_intake_fit(item, profile.intended_intake)
         score += intake_bonus
 
-        if normalized_profile.get("profile_highlight"):
+        if profile.profile_highlight:
             score += 5
 
         return max(0, min(98, score))
 
     @staticmethod
-    def _normalize_user_profile(user_profile: Dict[str, Any]) -> Dict[str, Any]:
-        normalized = dict(user_profile)
-        normalized["degree_level"] = GeminiService._normalize_degree_level(
-            normalized.get("degree_level", "")
-        )
-        normalized["gpa_percentage"] = GeminiService._normalize_to_percentage(
-            normalized.get("gpa"),
-            normalized.get("gpa_scale"),
+    def _normalize_user_profile(user_profile: Dict[str, Any] | NormalizedProfile) -> NormalizedProfile:
+        if isinstance(user_profile, NormalizedProfile):
+            return user_profile
+
+        degree_level = GeminiService._normalize_degree_level(user_profile.get("degree_level", ""))
+        gpa_percentage = GeminiService._normalize_to_percentage(
+            user_profile.get("gpa"),
+            user_profile.get("gpa_scale"),
         )
 
-        test_scores = dict(normalized.get("test_scores") or {})
-        english_test_type = normalized.get("english_test_type")
-        english_test_score = normalized.get("english_test_score")
+        test_scores = dict(user_profile.get("test_scores") or {})
+        english_test_type = user_profile.get("english_test_type")
+        english_test_score = user_profile.get("english_test_score")
         if english_test_type and english_test_score is not None:
             test_scores[str(english_test_type).lower()] = english_test_score
-        normalized["test_scores"] = test_scores
 
         if english_test_type and english_test_score is not None:
-            normalized["english_test_summary"] = f"{english_test_type} {english_test_score}"
+            english_test_summary = f"{english_test_type} {english_test_score}"
         elif english_test_type:
-            normalized["english_test_summary"] = str(english_test_type)
+            english_test_summary = str(english_test_type)
         elif test_scores:
-            normalized["english_test_summary"] = ", ".join(
+            english_test_summary = ", ".join(
                 f"{str(exam).upper()} {score}" for exam, score in test_scores.items()
             )
         else:
-            normalized["english_test_summary"] = None
-
-        return normalized
+            english_test_summary = None
+
+        return NormalizedProfile(
+            user_profile,
+            degree_level=degree_level,
+            gpa_percentage=gpa_percentage,
+            test_scores=test_scores,
+            english_test_summary=english_test_summary,
+        )
 
     @staticmethod
     def _normalize_degree_level(value: Any) -> str:
@@ -502,27 +800,26 @@ Return ONLY this JSON format:
         return sorted(scholarships, key=deadline_key)
 
     @staticmethod
-    def _build_local_reason(item: Dict[str, Any], user_profile: Dict[str, Any], score: int) -> str:
-        normalized_profile = GeminiService._normalize_user_profile(user_profile)
+    def _build_local_reason(item: Dict[str, Any], profile: NormalizedProfile, score: int) -> str:
         reasons = []
-        if item.get("country") in normalized_profile.get("target_countries", []) or item.get("country") == "Anywhere":
+        if item.get("country") in profile.target_countries or item.get("country") == "Anywhere":
             reasons.append("it matches your target destination")
-        if normalized_profile.get("degree_level") in [
+        if profile.degree_level in [
             GeminiService._normalize_degree_level(level)
             for level in item.get("degreeLevels", [])
         ]:
             reasons.append("your degree level is eligible")
 
-        user_percentage = normalized_profile.get("gpa_percentage", 0)
+        user_percentage = profile.gpa_percentage
         if user_percentage >= item.get("minGPAPercentage", 0):
             reasons.append("your academics clear the typical cutoff")
-        if normalized_profile.get("major") and any(
-            str(option).lower() in str(normalized_profile.get("major", "")).lower()
-            or str(normalized_profile.get("major", "")).lower() in str(option).lower()
+        if profile.major and any(
+            str(option).lower() in str(profile.major).lower()
+            or str(profile.major).lower() in str(option).lower()
             for option in item.get("majors", [])
         ):
             reasons.append("your major is closely aligned")
-        if normalized_profile.get("english_test_type") and item.get("testScores"):
+        if profile.english_test_type and item.get("testScores"):
             reasons.append("your English-test profile supports eligibility")
 
         if not reasons:
@@ -531,22 +828,21 @@ Return ONLY this JSON format:
         return f"This is a {score}% match because " + ", ".join(reasons) + "."
 
     @staticmethod
-    def _build_local_strategy(item: Dict[str, Any], user_profile: Dict[str, Any]) -> str:
-        normalized_profile = GeminiService._normalize_user_profile(user_profile)
+    def _build_local_strategy(item: Dict[str, Any], profile: NormalizedProfile) -> str:
         strategies = []
         if item.get("essayRequired"):
             strategies.append("prepare a focused statement of purpose tied to impact and leadership")
-        if normalized_profile.get("profile_highlight"):
+        if profile.profile_highlight:
             strategies.append("highlight your strongest achievement early in the application")
         if item.get("testScores"):
-            if normalized_profile.get("english_test_type"):
+            if profile.english_test_type:
                 strategies.append("submit your English test score prominently anywhere the application allows supporting evidence")
             else:
                 strategies.append("shortlist scholarships where English scores can be submitted later or are waived, then plan the test early")
-        if normalized_profile.get("intended_intake"):
-            strategies.append(f"prioritize applications that fit your {normalized_profile.get('intended_intake')} intake plan")
-        if normalized_profile.get("current_degree"):
-            strategies.append(f"use your {normalized_profile.get('current_degree')} background to explain academic readiness")
+        if profile.intended_intake:
+            strategies.append(f"prioritize applications that fit your {profile.intended_intake} intake plan")
+        if profile.current_degree:
+            strategies.append(f"use your {profile.current_degree} background to explain academic readiness")
         if not strategies:
             strategies.append("apply early and tailor your application to the program's priorities")
 
@@ -571,3 +867,11 @@ Return ONLY this JSON format:
                 )
             ],
         )
+
+
+scholarship_catalog = ScholarshipCatalog(
+    SCHOLARSHIP_DATA_PATH,
+    normalize_degree=GeminiService._normalize_degree_level,
+    is_fresh=GeminiService._is_fresh_deadline,
+    reload_check_seconds=settings.scholarship_catalog_reload_check_seconds,
+)
@@ -0,0 +1,63 @@
+import asyncio
+import logging
+
+import httpx
+
+from app.config import settings
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except Exception:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+_client: httpx.AsyncClient | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the application-scoped AsyncClient, creating it on first use.
+
+    The FastAPI lifespan opens and closes the client, but serverless runtimes and
+    run.py may skip lifespan events, so the client is also created lazily.
+    """
+    global _client, _client_loop
+
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = _build_client()
+        _client_loop = loop
+    return _client
+
+
+async def start_http_client() -> None:
+    get_http_client()
+
+
+async def close_http_client() -> None:
+    global _client, _client_loop
+
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+    _client_loop = None
+
+
+def _build_client() -> httpx.AsyncClient:
+    use_http2 = settings.http2_enabled and HTTP2_AVAILABLE
+    if settings.http2_enabled and not HTTP2_AVAILABLE:
+        logger.warning("HTTP/2 requested but the h2 package is not installed; using HTTP/1.1")
+
+    return httpx.AsyncClient(
+        http2=use_http2,
+        timeout=httpx.Timeout(settings.openrouter_timeout_seconds, connect=10),
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry_seconds,
+        ),
+        follow_redirects=True,
+    )
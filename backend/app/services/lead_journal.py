@@ -0,0 +1,212 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+JOURNAL_PATH = DATA_DIR / "leads.jsonl"
+LEGACY_JSON_PATH = DATA_DIR / "leads.json"
+
+
+class LeadJournal:
+    """
+    Append-only JSONL backup of lead payloads.
+
+    Each append writes a single line under a process lock and an advisory file lock,
+    so concurrent requests and workers cannot interleave records. fsync is batched:
+    the file is synced once fsync_every records are pending, or by a timer
+    fsync_interval_seconds after the first unsynced record, and always on close().
+    """
+
+    def __init__(self, path: Path, fsync_interval_seconds: float = 1.0, fsync_every: int = 20) -> None:
+        self.path = path
+        self.fsync_interval_seconds = fsync_interval_seconds
+        self.fsync_every = max(1, fsync_every)
+        self._lock = threading.Lock()
+        self._file = None
+        self._pending_sync = 0
+        self._last_sync = time.monotonic()
+        self._sync_timer: threading.Timer | None = None
+
+    def append(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            with self._locked_file() as file:
+                file.write(line)
+                file.flush()
+                self._pending_sync += 1
+                if (
+                    self._pending_sync >= self.fsync_every
+                    or time.monotonic() - self._last_sync >= self.fsync_interval_seconds
+                ):
+                    self._sync_locked()
+                elif self._sync_timer is None:
+                    # Sync the tail of a burst even if no further append arrives.
+                    self._sync_timer = threading.Timer(self.fsync_interval_seconds, self._sync_pending)
+                    self._sync_timer.daemon = True
+                    self._sync_timer.start()
+
+    def _sync_pending(self) -> None:
+        with self._lock:
+            self._sync_timer = None
+            if self._file is not None:
+                self._sync_locked()
+
+    @contextmanager
+    def _locked_file(self) -> Iterator[Any]:
+        # compact() swaps in a new file; reopen if our handle points at the replaced one.
+        while True:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+
+            with _file_lock(self._file):
+                if self._is_current_file():
+                    yield self._file
+                    return
+
+            self._sync_locked()
+            self._file.close()
+            self._file = None
+
+    def _is_current_file(self) -> bool:
+        try:
+            return os.stat(self.path).st_ino == os.fstat(self._file.fileno()).st_ino
+        except OSError:
+            return False
+
+    async def append_async(self, record: Dict[str, Any]) -> None:
+        await asyncio.to_thread(self.append, record)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._sync_timer is not None:
+                self._sync_timer.cancel()
+                self._sync_timer = None
+            if self._file is None:
+                return
+            self._sync_locked()
+            self._file.close()
+            self._file = None
+
+    def _sync_locked(self) -> None:
+        if self._sync_timer is not None:
+            self._sync_timer.cancel()
+            self._sync_timer = None
+        if self._pending_sync:
+            os.fsync(self._file.fileno())
+        self._pending_sync = 0
+        self._last_sync = time.monotonic()
+
+
+@contextmanager
+def _file_lock(file) -> Iterator[None]:
+    if fcntl is None:
+        yield
+        return
+
+    fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+    try:
+        yield
+    finally:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+def iter_records(path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield journal records, skipping blank lines and partially written or corrupt ones."""
+    if not path.exists():
+        return
+
+    with open(path, "r", encoding="utf-8") as file:
+        for line_number, line in enumerate(file, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning("Skipping corrupt lead journal line %s", line_number)
+                continue
+            if isinstance(record, dict):
+                yield record
+
+
+def compact(path: Path = JOURNAL_PATH, legacy_path: Path | None = None) -> int:
+    """
+    Rewrite the journal without corrupt lines or exact duplicate records, optionally
+    folding in the legacy leads.json array first. Returns the number of records kept.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(path, "a", encoding="utf-8") as lock_file, _file_lock(lock_file):
+        records = []
+        if legacy_path is not None and legacy_path.exists():
+            with open(legacy_path, "r", encoding="utf-8") as file:
+                records.extend(record for record in json.load(file) if isinstance(record, dict))
+        records.extend(iter_records(path))
+
+        seen = set()
+        unique_records = []
+        for record in records:
+            fingerprint = json.dumps(record, sort_keys=True, ensure_ascii=False)
+            if fingerprint in seen:
+                continue
+            seen.add(fingerprint)
+            unique_records.append(record)
+
+        with open(temp_path, "w", encoding="utf-8") as file:
+            for record in unique_records:
+                file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    return len(unique_records)
+
+
+def export(output: Path, path: Path = JOURNAL_PATH) -> int:
+    """Write the journal as a JSON array in the legacy leads.json format."""
+    records = list(iter_records(path))
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(records, file, indent=2, ensure_ascii=False)
+    return len(records)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Maintain the local lead backup journal")
+    parser.add_argument("--journal", type=Path, default=JOURNAL_PATH)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    compact_parser = subparsers.add_parser("compact", help="drop corrupt and duplicate records")
+    compact_parser.add_argument(
+        "--import-legacy",
+        action="store_true",
+        help=f"merge records from {LEGACY_JSON_PATH.name} into the journal",
+    )
+
+    export_parser = subparsers.add_parser("export", help="export the journal as a JSON array")
+    export_parser.add_argument("output", type=Path)
+
+    args = parser.parse_args()
+    if args.command == "compact":
+        kept = compact(args.journal, LEGACY_JSON_PATH if args.import_legacy else None)
+        print(f"Compacted {args.journal} to {kept} records")
+    else:
+        exported = export(args.output, args.journal)
+        print(f"Exported {exported} records to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
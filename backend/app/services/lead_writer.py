@@ -0,0 +1,121 @@
+import asyncio
+import logging
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class LeadBatchWriter:
+    """
+    Micro-batching writer for Google Sheets rows.
+
+    Concurrent submissions are queued and appended in a single API call once
+    max_rows are waiting or max_wait_seconds have passed since the first queued row.
+    Rows that arrive while a batch is being written are picked up by the next one,
+    so with max_wait_seconds=0 an idle writer flushes immediately and batching only
+    happens under load. Each caller awaits its own future, which resolves to True only
+    after the append containing its row has succeeded. If the worker dies, rows still
+    queued for it are handed to its replacement; rows it had already taken fail.
+    """
+
+    def __init__(
+        self,
+        flush_rows: Callable[[list[list[str]]], None],
+        max_rows: int,
+        max_wait_seconds: float,
+    ) -> None:
+        self.flush_rows = flush_rows
+        self.max_rows = max(1, max_rows)
+        self.max_wait_seconds = max(0.0, max_wait_seconds)
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def submit(self, row: list[str]) -> bool:
+        queue = self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        queue.put_nowait((row, future))
+        return await future
+
+    async def close(self) -> None:
+        if self._worker is None or self._loop is not asyncio.get_running_loop():
+            return
+
+        if self._queue is not None:
+            await self._queue.join()
+        self._worker.cancel()
+        await asyncio.gather(self._worker, return_exceptions=True)
+        self._worker = None
+        self._queue = None
+        self._loop = None
+
+    def _ensure_started(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            old_queue, old_loop = self._queue, self._loop
+            self._queue = asyncio.Queue()
+            if old_queue is not None:
+                if old_loop is loop:
+                    while not old_queue.empty():
+                        self._queue.put_nowait(old_queue.get_nowait())
+                else:
+                    _fail_queued(old_queue, old_loop)
+            self._loop = loop
+            self._worker = loop.create_task(self._run())
+        return self._queue
+
+    async def _run(self) -> None:
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        batch: list = []
+
+        try:
+            while True:
+                batch = [await queue.get()]
+                deadline = loop.time() + self.max_wait_seconds
+                while len(batch) < self.max_rows:
+                    if not queue.empty():
+                        batch.append(queue.get_nowait())
+                        continue
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), timeout=remaining))
+                    except asyncio.TimeoutError:
+                        break
+
+                try:
+                    await asyncio.to_thread(self.flush_rows, [row for row, _ in batch])
+                    logger.info("Appended batch of %s lead rows to Google Sheets", len(batch))
+                    succeeded = True
+                except Exception as e:
+                    logger.exception("Batched Google Sheets append of %s rows failed: %s", len(batch), e)
+                    succeeded = False
+
+                for _, future in batch:
+                    if not future.done():
+                        future.set_result(succeeded)
+                    queue.task_done()
+                batch = []
+        finally:
+            # Rows this worker had taken off the queue fail instead of hanging their callers.
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(RuntimeError("Lead batch writer stopped"))
+                queue.task_done()
+
+
+def _fail_queued(queue: asyncio.Queue, loop: asyncio.AbstractEventLoop | None) -> None:
+    """Fail futures left in a queue whose event loop is gone or no longer ours."""
+    error = RuntimeError("Lead batch writer restarted on another event loop")
+    while not queue.empty():
+        _, future = queue.get_nowait()
+        if future.done() or loop is None or loop.is_closed():
+            continue
+        loop.call_soon_threadsafe(_set_exception, future, error)
+
+
+def _set_exception(future: asyncio.Future, error: Exception) -> None:
+    if not future.done():
+        future.set_exception(error)
@@ -0,0 +1,309 @@
+import asyncio
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable
+
+from app.services.tracing import tracer
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[tuple, Any] = {}
+
+    def _key(self, labels: Dict[str, Any]) -> tuple:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> list[tuple[str, tuple, float]]:
+        with self._lock:
+            return [(self.name, key, value) for key, value in self._values.items()]
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {_escape_help(self.documentation)}", f"# TYPE {self.name} {self.kind}"]
+        for name, key, value in self.samples():
+            lines.append(f"{name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+        span_name: str = "",
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Format string over the labels; when set, time() also records a tracing span.
+        self.span_name = span_name
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket counts (not cumulative), then sum and count.
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][index] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def time(self, **labels: Any) -> "StageTimer":
+        return StageTimer(self, labels)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {_escape_help(self.documentation)}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            snapshot = [(key, list(state[0]), state[1], state[2]) for key, state in self._values.items()]
+        for key, bucket_counts, total, count in snapshot:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames + ("le",), key + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames + ("le",), key + ("+Inf",))
+            lines.append(f"{self.name}_bucket{labels} {count}")
+            plain = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{plain} {_format_value(total)}")
+            lines.append(f"{self.name}_count{plain} {count}")
+        return lines
+
+
+class StageTimer:
+    """
+    Context manager that observes the elapsed time of its block with an outcome label.
+
+    The outcome is "success" unless the block sets timer.outcome, raises ("error") or is
+    cancelled ("cancelled"). If the histogram has a span_name, the block is also traced
+    as a span carrying the outcome.
+    """
+
+    def __init__(self, histogram: Histogram, labels: Dict[str, Any]) -> None:
+        self.histogram = histogram
+        self.labels = labels
+        self.outcome = "success"
+        self._started = 0.0
+        self._span_context = None
+        self._span = None
+
+    def __enter__(self) -> "StageTimer":
+        if self.histogram.span_name and tracer.enabled:
+            self._span_context = tracer.span(self.histogram.span_name.format(**self.labels))
+            self._span = self._span_context.__enter__()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        if exc_type is not None:
+            self.outcome = "cancelled" if issubclass(exc_type, asyncio.CancelledError) else "error"
+        self.histogram.observe(time.perf_counter() - self._started, outcome=self.outcome, **self.labels)
+        if self._span_context is not None:
+            self._span.set_attribute("outcome", self.outcome)
+            self._span_context.__exit__(exc_type, exc, traceback)
+        return False
+
+
+class _StatsCollector:
+    """Counters and gauges read from a component's stats() dict at scrape time."""
+
+    def __init__(self, prefix: str, stats: Callable[[], Dict[str, Any]], counters: Iterable[str], gauges: Iterable[str]) -> None:
+        self.prefix = prefix
+        self.stats = stats
+        self.counters = tuple(counters)
+        self.gauges = tuple(gauges)
+
+    def render(self) -> list[str]:
+        values = self.stats()
+        lines = []
+        for field in self.counters:
+            name = f"{self.prefix}_{field}_total"
+            lines += [f"# TYPE {name} counter", f"{name} {_format_value(values.get(field, 0))}"]
+        for field in self.gauges:
+            name = f"{self.prefix}_{field}"
+            lines += [f"# TYPE {name} gauge", f"{name} {_format_value(values.get(field, 0))}"]
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Process-local metrics rendered in the Prometheus text exposition format.
+
+    Every uvicorn worker keeps its own registry, so each worker is scraped (or its
+    series aggregated) separately.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._collectors: Dict[str, Any] = {}
+
+    def _register(self, name: str, collector):
+        with self._lock:
+            return self._collectors.setdefault(name, collector)
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(name, Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._register(name, Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+        span_name: str = "",
+    ) -> Histogram:
+        return self._register(name, Histogram(name, documentation, labelnames, buckets, span_name))
+
+    def register_stats(
+        self,
+        prefix: str,
+        stats: Callable[[], Dict[str, Any]],
+        counters: Iterable[str] = (),
+        gauges: Iterable[str] = (),
+    ) -> None:
+        self._register(prefix, _StatsCollector(prefix, stats, counters, gauges))
+
+    def render(self) -> str:
+        with self._lock:
+            collectors = list(self._collectors.values())
+        lines: list[str] = []
+        for collector in collectors:
+            lines.extend(collector.render())
+        return "\n".join(lines) + "\n"
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple, values: tuple) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: Any) -> str:
+    value = float(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(int(value)) if value.is_integer() else repr(value)
+
+
+metrics = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = metrics.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template and status code.",
+    ["method", "route", "status"],
+)
+STAGE_SECONDS = metrics.histogram(
+    "scholarship_stage_duration_seconds",
+    "Latency of one pipeline stage (parse_result, local_matcher, sheets_append, apps_script, "
+    "local_backup, report_render, smtp_send) by outcome.",
+    ["stage", "outcome"],
+    span_name="{stage}",
+)
+PROVIDER_SECONDS = metrics.histogram(
+    "scholarship_provider_duration_seconds",
+    "Latency of one AI provider call by provider and outcome.",
+    ["provider", "outcome"],
+    span_name="provider {provider}",
+)
+RATE_LIMIT_DECISIONS = metrics.counter(
+    "rate_limit_decisions_total",
+    "Rate limit checks by policy and decision.",
+    ["policy", "decision"],
+)
+RATE_LIMIT_BACKEND_ERRORS = metrics.counter(
+    "rate_limit_backend_errors_total",
+    "Rate limiter backend failures (the request was allowed).",
+    ["backend"],
+)
+
+
+class RequestMetricsMiddleware:
+    """
+    Pure ASGI middleware recording http_request_duration_seconds. A request is timed
+    until its last body chunk is sent, so streamed (SSE) responses count their full
+    duration rather than the time to their headers.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+        observed = False
+
+        def observe() -> None:
+            nonlocal observed
+            observed = True
+            # Label by route template, not the raw path, to keep the series count bounded.
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=status,
+            )
+
+        async def send_and_observe(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False) and not observed:
+                observe()
+
+        try:
+            await self.app(scope, receive, send_and_observe)
+        finally:
+            # The app failed or the client went away before the body was complete.
+            if not observed:
+                observe()
@@ -0,0 +1,77 @@
+from types import MappingProxyType
+from typing import Any, Dict, Mapping
+
+
+class NormalizedProfile:
+    """
+    Read-only student profile, normalized once per request by
+    GeminiService._normalize_user_profile and shared by the prompt builder,
+    the cache key and the local matcher.
+    """
+
+    __slots__ = (
+        "source",
+        "degree_level",
+        "current_degree",
+        "gpa",
+        "gpa_scale",
+        "gpa_percentage",
+        "nationality",
+        "target_countries",
+        "intended_intake",
+        "major",
+        "test_scores",
+        "english_test_type",
+        "english_test_score",
+        "english_test_summary",
+        "work_experience_years",
+        "profile_highlight",
+    )
+
+    def __init__(
+        self,
+        source: Mapping[str, Any],
+        degree_level: str,
+        gpa_percentage: float,
+        test_scores: Dict[str, Any],
+        english_test_summary: str | None,
+    ) -> None:
+        assign = object.__setattr__
+        assign(self, "source", MappingProxyType(dict(source)))
+        assign(self, "degree_level", degree_level)
+        assign(self, "current_degree", source.get("current_degree"))
+        assign(self, "gpa", source.get("gpa"))
+        assign(self, "gpa_scale", source.get("gpa_scale"))
+        assign(self, "gpa_percentage", gpa_percentage)
+        assign(self, "nationality", source.get("nationality"))
+        assign(self, "target_countries", tuple(source.get("target_countries") or ()))
+        assign(self, "intended_intake", source.get("intended_intake"))
+        assign(self, "major", source.get("major", ""))
+        assign(self, "test_scores", MappingProxyType(dict(test_scores)))
+        assign(self, "english_test_type", source.get("english_test_type"))
+        assign(self, "english_test_score", source.get("english_test_score"))
+        assign(self, "english_test_summary", english_test_summary)
+        assign(self, "work_experience_years", source.get("work_experience_years", 0))
+        assign(self, "profile_highlight", source.get("profile_highlight"))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(degree_level={self.degree_level!r}, major={self.major!r}, "
+            f"gpa_percentage={self.gpa_percentage!r}, target_countries={self.target_countries!r})"
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        """The submitted profile with the normalized fields applied, as sent in the LLM prompt."""
+        return {
+            **self.source,
+            "degree_level": self.degree_level,
+            "gpa_percentage": self.gpa_percentage,
+            "test_scores": dict(self.test_scores),
+            "english_test_summary": self.english_test_summary,
+        }
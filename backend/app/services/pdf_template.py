@@ -0,0 +1,169 @@
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.platypus import Paragraph, TableStyle
+
+PAGE_MARGIN = 40
+CARD_WIDTH = 6.3 * inch
+SUMMARY_COL_WIDTHS = [2.0 * inch, 4.3 * inch]
+DETAILS_COL_WIDTHS = [1.15 * inch, 5.15 * inch]
+
+OVERVIEW_TEXT = (
+    "Scholarship Finder is an AI-assisted scholarship shortlisting platform designed to help students focus on the scholarships they are more likely to win. This report combines your academic fit, intake preference, target country choices, and profile strengths into a practical shortlist.",
+    "How to use this PDF: Start with the highest match score, compare deadlines carefully, and use the 'Why it fits' and 'Strategy tip' notes to prioritize the scholarships that deserve your immediate effort.",
+)
+NEXT_STEPS_TEXT = (
+    "1. Prioritize the scholarships with the highest match and earliest deadlines. "
+    "2. Prepare application essays and documents before the next deadline window. "
+    "3. Tailor each application to the scholarship's academic and leadership expectations."
+)
+
+# Scripts that need per-character line breaking (CJK ideographs, kana, Hangul and
+# full-width forms) all sit at or above the CJK Radicals Supplement block.
+CJK_START = "\u2e80"
+
+
+class PDFReportTemplate:
+    """
+    Styles and static content for the scholarship PDF, compiled once per process.
+
+    Paragraph and table styles are read-only once built, so every report shares them;
+    flowables are still created per report because ReportLab stores layout state on
+    them. Body styles use CJK wrapping so that no script can overflow a cell, but it
+    measures every character and dominated render time. paragraph() takes a fast path
+    for text without CJK characters and lays it out with a word-wrap twin of the style,
+    which still splits over-long words to fit the cell.
+    """
+
+    def __init__(self) -> None:
+        styles = getSampleStyleSheet()
+        self.title = ParagraphStyle(
+            "TitleStyle",
+            parent=styles["Title"],
+            fontName="Helvetica-Bold",
+            fontSize=22,
+            leading=28,
+            textColor=colors.HexColor("#1d4ed8"),
+            alignment=TA_CENTER,
+            spaceAfter=14,
+        )
+        self.subtitle = ParagraphStyle(
+            "SubtitleStyle",
+            parent=styles["BodyText"],
+            fontName="Helvetica",
+            fontSize=11,
+            leading=16,
+            textColor=colors.HexColor("#334155"),
+            spaceAfter=10,
+            alignment=TA_CENTER,
+        )
+        self.section = ParagraphStyle(
+            "SectionStyle",
+            parent=styles["Heading2"],
+            fontName="Helvetica-Bold",
+            fontSize=14,
+            leading=18,
+            textColor=colors.HexColor("#0f172a"),
+            spaceAfter=10,
+        )
+        self.body = ParagraphStyle(
+            "BodyStyle",
+            parent=styles["BodyText"],
+            fontName="Helvetica",
+            fontSize=10,
+            leading=14,
+            textColor=colors.HexColor("#334155"),
+            wordWrap="CJK",
+        )
+        self.small = ParagraphStyle(
+            "SmallStyle",
+            parent=styles["BodyText"],
+            fontName="Helvetica",
+            fontSize=9,
+            leading=13,
+            textColor=colors.HexColor("#475569"),
+            wordWrap="CJK",
+        )
+        self.card_title = ParagraphStyle(
+            "CardTitleStyle",
+            parent=styles["Heading3"],
+            fontName="Helvetica-Bold",
+            fontSize=11,
+            leading=15,
+            textColor=colors.HexColor("#1e3a8a"),
+            wordWrap="CJK",
+        )
+        self.meta = ParagraphStyle(
+            "MetaStyle",
+            parent=styles["BodyText"],
+            fontName="Helvetica",
+            fontSize=9,
+            leading=12,
+            textColor=colors.HexColor("#1f2937"),
+            wordWrap="CJK",
+        )
+        self.label = ParagraphStyle(
+            "LabelStyle",
+            parent=styles["BodyText"],
+            fontName="Helvetica-Bold",
+            fontSize=9,
+            leading=12,
+            textColor=colors.HexColor("#0f172a"),
+            wordWrap="CJK",
+        )
+        self._word_wrap_styles = {
+            style.name: ParagraphStyle(f"{style.name}WordWrap", parent=style, wordWrap=None)
+            for style in (self.body, self.small, self.card_title, self.meta, self.label)
+        }
+
+        self.summary_table = TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, -1), colors.HexColor("#eff6ff")),
+                ("TEXTCOLOR", (0, 0), (-1, -1), colors.HexColor("#0f172a")),
+                ("FONTNAME", (0, 0), (0, -1), "Helvetica-Bold"),
+                ("FONTNAME", (1, 0), (1, -1), "Helvetica"),
+                ("BOX", (0, 0), (-1, -1), 0.5, colors.HexColor("#bfdbfe")),
+                ("INNERGRID", (0, 0), (-1, -1), 0.5, colors.HexColor("#bfdbfe")),
+                ("PADDING", (0, 0), (-1, -1), 8),
+            ]
+        )
+        self.overview_table = TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, -1), colors.HexColor("#f8fafc")),
+                ("BOX", (0, 0), (-1, -1), 0.5, colors.HexColor("#cbd5e1")),
+                ("INNERGRID", (0, 0), (-1, -1), 0.35, colors.HexColor("#e2e8f0")),
+                ("PADDING", (0, 0), (-1, -1), 9),
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+            ]
+        )
+        self.details_table = TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, -1), colors.white),
+                ("BOX", (0, 0), (-1, -1), 0.35, colors.HexColor("#e2e8f0")),
+                ("INNERGRID", (0, 0), (-1, -1), 0.3, colors.HexColor("#e2e8f0")),
+                ("PADDING", (0, 0), (-1, -1), 6),
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+            ]
+        )
+        self.card_table = TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#dbeafe")),
+                ("TEXTCOLOR", (0, 0), (-1, 0), colors.HexColor("#1e3a8a")),
+                ("BOX", (0, 0), (-1, -1), 0.6, colors.HexColor("#cbd5e1")),
+                ("INNERGRID", (0, 0), (-1, -1), 0.3, colors.HexColor("#e2e8f0")),
+                ("BACKGROUND", (0, 1), (-1, -1), colors.white),
+                ("PADDING", (0, 0), (-1, -1), 8),
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+            ]
+        )
+
+    def paragraph(self, text: str, style: ParagraphStyle, prefix: str = "") -> Paragraph:
+        """Build a paragraph of already-safe text with an optional bold prefix."""
+        markup = f"<b>{prefix}</b> {text}" if prefix else text
+        if not any(char >= CJK_START for char in text):
+            style = self._word_wrap_styles.get(style.name, style)
+        return Paragraph(markup, style)
+
+
+pdf_template = PDFReportTemplate()
@@ -1,28 +1,400 @@
+import json
+import logging
+import sqlite3
 import threading
 import time
-from collections import defaultdict, deque
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
 
+from app.config import settings
+from app.services.metrics import RATE_LIMIT_BACKEND_ERRORS
 
-class RateLimiter:
-    def __init__(self) -> None:
-        self._events: dict[str, deque[float]] = defaultdict(deque)
-        self._lock = threading.Lock()
+try:
+    import redis
+except Exception:
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+SQLITE_PATH = Path(__file__).parent.parent / "data" / "rate_limits.sqlite3"
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    limit: int
+    remaining: int
+    # Seconds until the next request would be allowed (0 when allowed).
+    retry_after: float
+    # Seconds until the key is back to its full quota.
+    reset_after: float
+
+
+# An algorithm maps (state, now, limit, window_seconds) to (new_state, result, expires_at).
+# State is JSON-serializable so every backend can store it; expires_at is when the key
+# would be back to a full quota, after which its state can be dropped.
+Algorithm = Callable[[Any, float, int, float], tuple[Any, RateLimitResult, float]]
+
+
+def sliding_log(state: Any, now: float, limit: int, window_seconds: float) -> tuple[Any, RateLimitResult, float]:
+    """Exact limit: keep the timestamps of the requests inside the window (O(limit) per key)."""
+    events = [event for event in (state or []) if event > now - window_seconds]
+    if len(events) >= limit:
+        retry_after = events[-limit] + window_seconds - now
+        reset_after = events[-1] + window_seconds - now
+        return events, RateLimitResult(False, limit, 0, retry_after, reset_after), events[-1] + window_seconds
+
+    events.append(now)
+    reset_after = window_seconds
+    return events, RateLimitResult(True, limit, limit - len(events), 0.0, reset_after), now + window_seconds
+
+
+def sliding_window(state: Any, now: float, limit: int, window_seconds: float) -> tuple[Any, RateLimitResult, float]:
+    """
+    Approximate limit with O(1) memory per key: counts for the current and previous fixed
+    windows, with the previous count weighted by how much of it still overlaps the
+    sliding window.
+    """
+    window_start, previous, current = state or (now - now % window_seconds, 0, 0)
+    elapsed_windows = int((now - window_start) // window_seconds)
+    if elapsed_windows >= 1:
+        previous = current if elapsed_windows == 1 else 0
+        current = 0
+        window_start += elapsed_windows * window_seconds
+
+    elapsed = now - window_start
+    overlap = 1 - elapsed / window_seconds
+    estimate = previous * overlap + current
+
+    if estimate + 1 > limit:
+        retry_after = _sliding_window_retry_after(previous, current, elapsed, limit, window_seconds)
+        new_state = [window_start, previous, current]
+        reset_after = 2 * window_seconds - elapsed
+        return new_state, RateLimitResult(False, limit, 0, retry_after, reset_after), window_start + 2 * window_seconds
+
+    current += 1
+    remaining = max(0, int(limit - (estimate + 1)))
+    reset_after = 2 * window_seconds - elapsed
+    return [window_start, previous, current], RateLimitResult(True, limit, remaining, 0.0, reset_after), window_start + 2 * window_seconds
+
+
+def _sliding_window_retry_after(previous: int, current: int, elapsed: float, limit: int, window_seconds: float) -> float:
+    # Inside this window the estimate only falls as the previous window's weight decays.
+    if current + 1 <= limit and previous:
+        excess = previous * (1 - elapsed / window_seconds) + current + 1 - limit
+        wait = excess * window_seconds / previous
+        if elapsed + wait < window_seconds:
+            return wait
+
+    # Otherwise wait into the next window, where this window's count becomes "previous".
+    until_next = window_seconds - elapsed
+    if current + 1 <= limit or not current:
+        return until_next
+    return until_next + window_seconds * (1 - (limit - 1) / current)
+
+
+def gcra(state: Any, now: float, limit: int, window_seconds: float) -> tuple[Any, RateLimitResult, float]:
+    """
+    Generic cell rate algorithm: the state is a single float, the theoretical arrival
+    time (TAT) of the next request at the steady rate of limit per window. Bursts of up
+    to limit requests are allowed, after which requests are spaced window/limit apart.
+    """
+    interval = window_seconds / limit
+    tat = max(state if state is not None else now, now)
+    allow_at = tat + interval - window_seconds
+    if now < allow_at:
+        return tat, RateLimitResult(False, limit, 0, allow_at - now, tat - now), tat
+
+    tat += interval
+    remaining = int((window_seconds - (tat - now)) / interval + 1e-9)
+    return tat, RateLimitResult(True, limit, remaining, 0.0, tat - now), tat
+
+
+def token_bucket(state: Any, now: float, limit: int, window_seconds: float) -> tuple[Any, RateLimitResult, float]:
+    """
+    Token bucket holding up to limit tokens, refilled at limit per window. The state is a
+    single float, the time at which the bucket would have been empty, from which the
+    current level is derived. Decisions match GCRA.
+    """
+    interval = window_seconds / limit
+    empty_at = max(state if state is not None else now - window_seconds, now - window_seconds)
+    tokens = (now - empty_at) / interval
+    if tokens + 1e-9 < 1:
+        retry_after = interval - (now - empty_at)
+        return empty_at, RateLimitResult(False, limit, 0, retry_after, empty_at + window_seconds - now), empty_at + window_seconds
+
+    empty_at += interval
+    remaining = int(tokens - 1 + 1e-9)
+    return empty_at, RateLimitResult(True, limit, remaining, 0.0, empty_at + window_seconds - now), empty_at + window_seconds
+
+
+ALGORITHMS: dict[str, Algorithm] = {
+    "sliding_log": sliding_log,
+    "sliding_window": sliding_window,
+    "gcra": gcra,
+    "token_bucket": token_bucket,
+}
+
+
+def parse_policy(spec: str) -> tuple[int, float]:
+    """Parse a "limit/window_seconds" policy such as "20/60"."""
+    limit, separator, window_seconds = spec.partition("/")
+    if not separator or int(limit) < 1 or float(window_seconds) <= 0:
+        raise ValueError(f"Invalid rate limit policy: {spec!r}")
+    return int(limit), float(window_seconds)
+
+
+def load_policies() -> dict[str, tuple[int, float]]:
+    # Entries from the environment override the defaults one by one instead of replacing them all.
+    policies = {**type(settings).model_fields["rate_limit_policies"].default, **settings.rate_limit_policies}
+    return {name: parse_policy(spec) for name, spec in policies.items()}
+
+
+class RateLimiterBackend(ABC):
+    """
+    Storage for rate-limit state. Each hit() atomically applies the configured algorithm
+    to the key's state. If the backend itself fails, requests are allowed (fail open) so
+    a limiter outage cannot take the API down with it.
+    """
+
+    def __init__(self, algorithm: str) -> None:
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown rate limit algorithm: {algorithm}")
+        self.algorithm_name = algorithm
+        self.algorithm = ALGORITHMS[algorithm]
+
+    def hit(self, key: str, limit: int, window_seconds: float) -> RateLimitResult:
+        try:
+            return self._hit(key, limit, window_seconds, time.time())
+        except Exception as e:
+            logger.exception("Rate limiter backend error, allowing request: %s", e)
+            RATE_LIMIT_BACKEND_ERRORS.inc(backend=type(self).__name__)
+            return RateLimitResult(True, limit, limit, 0.0, 0.0)
 
     def check(self, key: str, limit: int, window_seconds: int) -> int:
+        """Record a hit and return the whole seconds to wait, or 0 if it is allowed."""
+        result = self.hit(key, limit, window_seconds)
+        if result.allowed:
+            return 0
+        return max(1, int(result.retry_after))
+
+    def close(self) -> None:
+        pass
+
+    @abstractmethod
+    def _hit(self, key: str, limit: int, window_seconds: float, now: float) -> RateLimitResult:
+        """Apply self.algorithm to the key's stored state at time now and persist the new state."""
+
+
+class InMemoryRateLimiter(RateLimiterBackend):
+    """
+    Per-process limiter, lock-striped across shards by key hash so threads hitting
+    different keys rarely contend. A background sweeper drops keys whose quota has
+    fully reset every gc_interval_seconds, one shard at a time, and each shard keeps at
+    most its share of max_keys (least recently used first out), so memory stays bounded
+    however many clients are seen.
+    """
+
+    def __init__(self, algorithm: str, gc_interval_seconds: float, max_keys: int, shards: int = 16) -> None:
+        super().__init__(algorithm)
+        self.gc_interval_seconds = gc_interval_seconds
+        self.shard_count = max(1, shards)
+        self.max_keys_per_shard = max(1, -(-max(1, max_keys) // self.shard_count))
+        self._shards = [_Shard() for _ in range(self.shard_count)]
+        self._sweeper: threading.Thread | None = None
+        self._sweeper_lock = threading.Lock()
+        self._closed = threading.Event()
+
+    def _hit(self, key: str, limit: int, window_seconds: float, now: float) -> RateLimitResult:
+        if self._sweeper is None:
+            self._start_sweeper()
+
+        shard = self._shards[hash(key) % self.shard_count]
+        with shard.lock:
+            entries = shard.entries
+            entry = entries.get(key)
+            state = entry[0] if entry is not None and entry[1] > now else None
+            state, result, expires_at = self.algorithm(state, now, limit, window_seconds)
+            entries[key] = (state, expires_at)
+            entries.move_to_end(key)
+            if len(entries) > self.max_keys_per_shard:
+                entries.popitem(last=False)
+            return result
+
+    def collect_garbage(self) -> int:
         now = time.time()
-        cutoff = now - window_seconds
+        removed = 0
+        for shard in self._shards:
+            with shard.lock:
+                expired = [key for key, (_, expires_at) in shard.entries.items() if expires_at <= now]
+                for key in expired:
+                    del shard.entries[key]
+            removed += len(expired)
+        return removed
 
-        with self._lock:
-            events = self._events[key]
-            while events and events[0] <= cutoff:
-                events.popleft()
+    def close(self) -> None:
+        self._closed.set()
 
-            if len(events) >= limit:
-                retry_after = max(1, int(events[0] + window_seconds - now))
-                return retry_after
+    def _start_sweeper(self) -> None:
+        with self._sweeper_lock:
+            if self._sweeper is not None:
+                return
+            self._closed.clear()
+            self._sweeper = threading.Thread(target=self._sweep, name="rate-limit-sweeper", daemon=True)
+            self._sweeper.start()
 
-            events.append(now)
-            return 0
+    def _sweep(self) -> None:
+        while not self._closed.wait(max(0.1, self.gc_interval_seconds)):
+            try:
+                removed = self.collect_garbage()
+                if removed:
+                    logger.debug("Swept %s idle rate limit keys", removed)
+            except Exception as e:
+                logger.exception("Rate limit sweep failed: %s", e)
+        self._sweeper = None
+
+    def __len__(self) -> int:
+        return sum(len(shard.entries) for shard in self._shards)
+
+
+class _Shard:
+    __slots__ = ("lock", "entries")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.entries: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+
+
+class SQLiteRateLimiter(RateLimiterBackend):
+    """
+    Limiter shared by every worker process on one host through a WAL-mode SQLite file.
+    Each hit is a BEGIN IMMEDIATE read-modify-write, and expired rows are deleted every
+    gc_interval_seconds. Every thread gets its own connection; close() closes them all.
+    """
+
+    def __init__(self, path: Path, algorithm: str, gc_interval_seconds: float) -> None:
+        super().__init__(algorithm)
+        self.path = path
+        self.gc_interval_seconds = gc_interval_seconds
+        self._local = threading.local()
+        self._next_gc = 0.0
+        self._connections_lock = threading.Lock()
+        self._connections: list[sqlite3.Connection] = []
+        # Bumped by close() so threads drop connections it has closed.
+        self._generation = 0
+
+    def _db(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.generation != self._generation:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Only this thread uses the connection, but close() may run on another.
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limits "
+                "(key TEXT PRIMARY KEY, state TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS rate_limits_expiry ON rate_limits (expires_at)")
+            with self._connections_lock:
+                self._connections.append(connection)
+                self._local.generation = self._generation
+            self._local.connection = connection
+        return connection
+
+    def _hit(self, key: str, limit: int, window_seconds: float, now: float) -> RateLimitResult:
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            if time.monotonic() >= self._next_gc:
+                db.execute("DELETE FROM rate_limits WHERE expires_at <= ?", (now,))
+                self._next_gc = time.monotonic() + self.gc_interval_seconds
+
+            row = db.execute(
+                "SELECT state FROM rate_limits WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+            state, result, expires_at = self.algorithm(json.loads(row[0]) if row else None, now, limit, window_seconds)
+            db.execute(
+                "INSERT OR REPLACE INTO rate_limits (key, state, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(state), expires_at),
+            )
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        return result
+
+    def close(self) -> None:
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+            self._generation += 1
+        for connection in connections:
+            try:
+                connection.close()
+            except sqlite3.Error as e:
+                logger.warning("Failed to close rate limiter connection: %s", e)
+        self._local.connection = None
+
+
+class RedisRateLimiter(RateLimiterBackend):
+    """
+    Limiter shared across hosts through any Redis-protocol server. State is updated with
+    an optimistic WATCH/MULTI transaction and stored with a TTL, so idle keys expire on
+    the server. Timestamps come from the app servers, whose clocks should be in sync.
+    """
+
+    def __init__(self, url: str, algorithm: str, prefix: str = "ratelimit:", max_retries: int = 10) -> None:
+        super().__init__(algorithm)
+        if redis is None:
+            raise RuntimeError("redis is not installed")
+        self.client = redis.Redis.from_url(url, socket_timeout=1.0, socket_connect_timeout=1.0)
+        self.prefix = prefix
+        self.max_retries = max_retries
+
+    def _hit(self, key: str, limit: int, window_seconds: float, now: float) -> RateLimitResult:
+        redis_key = self.prefix + key
+        with self.client.pipeline() as pipe:
+            for _ in range(self.max_retries):
+                try:
+                    pipe.watch(redis_key)
+                    raw_state = pipe.get(redis_key)
+                    state, result, expires_at = self.algorithm(
+                        json.loads(raw_state) if raw_state else None,
+                        now,
+                        limit,
+                        window_seconds,
+                    )
+                    pipe.multi()
+                    pipe.set(redis_key, json.dumps(state), px=max(1, int((expires_at - now) * 1000)))
+                    pipe.execute()
+                    return result
+                except redis.WatchError:
+                    now = time.time()
+        raise RuntimeError(f"Rate limit state for {key} is too contended")
+
+    def close(self) -> None:
+        self.client.close()
+
+
+def create_rate_limiter() -> RateLimiterBackend:
+    backend = settings.rate_limit_backend.strip().lower()
+    algorithm = settings.rate_limit_algorithm.strip().lower()
+    if backend == "sqlite":
+        path = Path(settings.rate_limit_sqlite_path) if settings.rate_limit_sqlite_path else SQLITE_PATH
+        return SQLiteRateLimiter(path, algorithm, settings.rate_limit_gc_interval_seconds)
+    if backend == "redis":
+        return RedisRateLimiter(settings.rate_limit_redis_url, algorithm)
+    if backend != "memory":
+        raise ValueError(f"Unknown rate limit backend: {settings.rate_limit_backend}")
+    return InMemoryRateLimiter(
+        algorithm,
+        settings.rate_limit_gc_interval_seconds,
+        settings.rate_limit_max_keys,
+        shards=settings.rate_limit_shards,
+    )
 
 
-rate_limiter = RateLimiter()
+rate_limiter = create_rate_limiter()
+rate_limit_policies = load_policies()
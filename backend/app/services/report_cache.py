@@ -0,0 +1,80 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict
+
+from app.config import settings
+from app.models import ScholarshipResult
+
+
+class ReportCache:
+    """
+    In-process LRU cache of rendered reports (HTML body and PDF bytes), keyed on a hash
+    of the recipient name and the ScholarshipResult content and bounded by total size.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[str, bytes, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(name: str, scholarships: ScholarshipResult) -> str:
+        digest = hashlib.sha256()
+        digest.update(name.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(scholarships.model_dump_json().encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> tuple[str, bytes] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            html, pdf_bytes, _ = entry
+            return html, pdf_bytes
+
+    def set(self, key: str, html: str, pdf_bytes: bytes) -> None:
+        size = len(html.encode("utf-8")) + len(pdf_bytes)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size_bytes -= previous[2]
+            self._entries[key] = (html, pdf_bytes, size)
+            self.size_bytes += size
+            while self.size_bytes > self.max_bytes:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self.size_bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self.size_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+report_cache = ReportCache(max_bytes=settings.report_cache_max_bytes)
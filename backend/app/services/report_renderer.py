@@ -0,0 +1,153 @@
+import logging
+import multiprocessing
+import threading
+from threading import BrokenBarrierError
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict
+
+from app.config import settings
+from app.models import ScholarshipResult
+from app.services.metrics import STAGE_SECONDS
+from app.services.report_cache import report_cache
+
+logger = logging.getLogger(__name__)
+
+STARTUP_TIMEOUT_SECONDS = 60.0
+
+# Set in each worker process by _init_worker.
+_startup_barrier = None
+
+
+def _render_report(name: str, scholarships: Dict[str, Any]) -> tuple[str, bytes]:
+    # email_service imports this module, so import it lazily.
+    from app.services.email_service import EmailService
+
+    result = ScholarshipResult(**scholarships)
+    return EmailService._generate_html_report(name, result), EmailService._generate_pdf_report(name, result)
+
+
+def _warm_up() -> None:
+    from app.services.email_service import EmailService
+
+    EmailService._generate_pdf_report("Warm Up", ScholarshipResult(summary_probability=0, scholarships=[]))
+
+
+def _init_worker(barrier) -> None:
+    global _startup_barrier
+    _startup_barrier = barrier
+    _warm_up()
+
+
+def _check_in(timeout: float) -> int:
+    # Holding every worker until all have checked in forces the pool to spawn a process
+    # per check-in instead of handing several to one idle worker.
+    _startup_barrier.wait(timeout)
+    return multiprocessing.current_process().pid
+
+
+class ReportRenderer:
+    """
+    Renders report HTML and PDF bytes in a pool of worker processes.
+
+    ReportLab layout is CPU-bound and holds the GIL, so rendering in a thread stalls
+    every other request in the worker. With workers > 0 reports are rendered in a
+    spawned ProcessPoolExecutor instead; every worker imports ReportLab and renders a
+    throwaway report as it starts, and start() brings all workers up ahead of traffic.
+    At most max_pending renders are queued at once; once every slot is taken further
+    callers block until one frees up rather than being rejected. A render that takes
+    longer than timeout_seconds raises TimeoutError and the pool, including the hung
+    worker, is replaced. With workers == 0, or if the pool breaks, reports are rendered
+    in the calling thread. Renders are cached in report_cache, so resending the same
+    report skips ReportLab entirely.
+    """
+
+    def __init__(self, workers: int, max_pending: int, timeout_seconds: float) -> None:
+        self.workers = max(0, workers)
+        self.max_pending = max(1, max_pending)
+        self.timeout_seconds = timeout_seconds
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._executor: ProcessPoolExecutor | None = None
+
+    def start(self) -> None:
+        if not self.workers:
+            return
+        executor = self._get_executor()
+        futures = [executor.submit(_check_in, STARTUP_TIMEOUT_SECONDS) for _ in range(self.workers)]
+        try:
+            pids = {future.result() for future in futures}
+        except BrokenBarrierError:
+            logger.warning("Report renderer workers did not all start within %.0fs", STARTUP_TIMEOUT_SECONDS)
+            return
+        logger.info("Report renderer started with %s warm worker processes", len(pids))
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def render(self, name: str, scholarships: ScholarshipResult) -> tuple[str, bytes]:
+        """Return the (html, pdf_bytes) pair for a report, reusing a cached render if any."""
+        cache_key = report_cache.make_key(name, scholarships)
+        cached = report_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        with STAGE_SECONDS.time(stage="report_render"):
+            html, pdf_bytes = self._render_uncached(name, scholarships.model_dump())
+        report_cache.set(cache_key, html, pdf_bytes)
+        return html, pdf_bytes
+
+    def _render_uncached(self, name: str, payload: Dict[str, Any]) -> tuple[str, bytes]:
+        if not self.workers:
+            return _render_report(name, payload)
+
+        with self._slots:
+            executor = self._get_executor()
+            future = executor.submit(_render_report, name, payload)
+            try:
+                return future.result(timeout=self.timeout_seconds)
+            except BrokenProcessPool as e:
+                logger.error("Report render pool broke (%s); rendering in-process", e)
+                self._discard_executor(executor)
+                return _render_report(name, payload)
+            except FutureTimeoutError:
+                # The worker may be stuck for good; replace the pool rather than leave it
+                # holding a process. The caller fails this send and the outbox retries it.
+                logger.error("Report render exceeded %.0fs; restarting the render pool", self.timeout_seconds)
+                future.cancel()
+                self._discard_executor(executor, terminate=True)
+                raise
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                context = multiprocessing.get_context("spawn")
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=context,
+                    initializer=_init_worker,
+                    initargs=(context.Barrier(self.workers),),
+                )
+            return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor, terminate: bool = False) -> None:
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        # shutdown() never stops a running task, so a hung worker has to be terminated.
+        processes = list((getattr(executor, "_processes", None) or {}).values()) if terminate else []
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+
+report_renderer = ReportRenderer(
+    workers=settings.report_render_workers,
+    max_pending=settings.report_render_max_pending,
+    timeout_seconds=settings.report_render_timeout_seconds,
+)
@@ -0,0 +1,304 @@
+import asyncio
+import contextvars
+import functools
+import ipaddress
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+from app.config import settings
+from app.services.tracing import current_request_id
+
+logger = logging.getLogger(__name__)
+
+PROFILES_DIR = Path(__file__).parent.parent / "data" / "profiles"
+PROFILE_HEADER = "x-profile-request"
+PROFILE_HEADER_BYTES = PROFILE_HEADER.encode("latin-1")
+EXECUTOR_RUN_FILE = os.path.join("concurrent", "futures", "thread.py")
+
+_active_profile: contextvars.ContextVar["ProfiledRequest | None"] = contextvars.ContextVar(
+    "active_profile", default=None
+)
+
+
+class ProfiledRequest:
+    __slots__ = ("label", "task", "loop", "loop_thread", "started", "samples")
+
+    def __init__(self, label: str) -> None:
+        self.label = label
+        self.task = asyncio.current_task()
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread = threading.get_ident()
+        self.started = time.perf_counter()
+        self.samples: Counter = Counter()
+
+
+class SamplingProfiler:
+    """
+    Wall-clock sampling profiler for individual requests.
+
+    While at least one profiled request is in flight, a daemon thread reads
+    sys._current_frames() every interval_seconds and attributes each sample to a request:
+
+    - the event loop thread's stack, when the task it is running belongs to the request
+      (profiled requests are marked with a context variable, which asyncio copies into
+      child tasks)
+    - otherwise the request task's await chain, so time spent waiting on providers,
+      Sheets or SMTP shows up under the await that was pending
+    - the stack of any executor thread running asyncio.to_thread work for the request
+
+    Finished profiles are written as collapsed stacks (flamegraph.pl / speedscope input)
+    for the slowest keep_slowest requests in each window_seconds interval; a profile
+    displaced from that set is deleted.
+    """
+
+    def __init__(self, interval_seconds: float, keep_slowest: int, window_seconds: float, output_dir: Path) -> None:
+        self.interval_seconds = max(0.001, interval_seconds)
+        self.keep_slowest = max(1, keep_slowest)
+        self.window_seconds = window_seconds
+        self.output_dir = output_dir
+        self._lock = threading.Lock()
+        self._active: set[ProfiledRequest] = set()
+        self._thread: threading.Thread | None = None
+        self._window_started = time.monotonic()
+        self._kept: list[tuple[float, Path]] = []
+
+    def begin(self, label: str) -> tuple[ProfiledRequest, contextvars.Token]:
+        profiled = ProfiledRequest(label)
+        token = _active_profile.set(profiled)
+        with self._lock:
+            self._active.add(profiled)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._thread.start()
+        return profiled, token
+
+    def end(self, profiled: ProfiledRequest, token: contextvars.Token) -> float:
+        _active_profile.reset(token)
+        with self._lock:
+            self._active.discard(profiled)
+        return time.perf_counter() - profiled.started
+
+    def _run(self) -> None:
+        own_ident = threading.get_ident()
+        while True:
+            with self._lock:
+                active = list(self._active)
+                if not active:
+                    self._thread = None
+                    return
+
+            frames = sys._current_frames()
+            worker_owners = {
+                ident: _executor_owner(frame)
+                for ident, frame in frames.items()
+                if ident != own_ident and all(ident != profiled.loop_thread for profiled in active)
+            }
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+
+            for profiled in active:
+                self._sample(profiled, frames, worker_owners, thread_names)
+            time.sleep(self.interval_seconds)
+
+    def _sample(self, profiled: ProfiledRequest, frames: dict, worker_owners: dict, thread_names: dict) -> None:
+        try:
+            running = asyncio.current_task(profiled.loop)
+            loop_frame = frames.get(profiled.loop_thread)
+            if running is not None and loop_frame is not None and _task_profile(running) is profiled:
+                profiled.samples[(profiled.label, "running") + _stack(loop_frame)] += 1
+            elif profiled.task is not None:
+                profiled.samples[(profiled.label, "awaiting") + _await_chain(profiled.task)] += 1
+
+            for ident, owner in worker_owners.items():
+                if owner is profiled:
+                    thread = thread_names.get(ident, str(ident))
+                    profiled.samples[(profiled.label, f"thread {thread}") + _stack(frames[ident])] += 1
+        except Exception as e:
+            # The sampled threads keep running underneath us; skip a torn sample.
+            logger.debug("Dropped profiler sample: %s", e)
+
+    def should_keep(self, duration: float) -> bool:
+        with self._lock:
+            self._roll_window_locked()
+            return len(self._kept) < self.keep_slowest or duration > min(self._kept)[0]
+
+    def save(self, profiled: ProfiledRequest, duration: float, request_id: str | None) -> Path | None:
+        """Write the profile if it is still among the slowest of its window."""
+        with self._lock:
+            self._roll_window_locked()
+            displaced = None
+            if len(self._kept) >= self.keep_slowest:
+                fastest = min(self._kept)
+                if duration <= fastest[0]:
+                    return None
+                self._kept.remove(fastest)
+                displaced = fastest[1]
+
+            slug = "".join(char if char.isalnum() else "-" for char in profiled.label).strip("-")
+            path = self.output_dir / f"{time.strftime('%Y%m%dT%H%M%S')}-{duration * 1000:.0f}ms-{slug}-{request_id or 'request'}.collapsed"
+            self._kept.append((duration, path))
+
+        if displaced is not None:
+            displaced.unlink(missing_ok=True)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        lines = [f"{';'.join(stack)} {count}" for stack, count in profiled.samples.most_common()]
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return path
+
+    def _roll_window_locked(self) -> None:
+        now = time.monotonic()
+        if now - self._window_started >= self.window_seconds:
+            self._window_started = now
+            self._kept = []
+
+
+class RequestProfilerMiddleware:
+    """
+    Pure ASGI middleware that profiles a request when PROFILING_ENABLED is set, or when it
+    carries an "X-Profile-Request: 1" header from an IP in PROFILING_ALLOWED_IPS. The IP
+    is the connecting peer, or with PROFILING_TRUSTED_PROXIES the right-most
+    X-Forwarded-For hop that is not a trusted proxy; a client-supplied X-Forwarded-For
+    alone cannot claim an allowlisted address. Other requests only pay for a settings
+    check and a header lookup.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not self._wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        label = f"{scope['method']} {scope['path']}"
+        profiled, token = request_profiler.begin(label)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            duration = request_profiler.end(profiled, token)
+            if request_profiler.should_keep(duration):
+                try:
+                    path = await asyncio.to_thread(request_profiler.save, profiled, duration, current_request_id())
+                    if path is not None:
+                        logger.info("Saved %.0f ms profile of %s to %s", duration * 1000, label, path)
+                except Exception as e:
+                    logger.warning("Failed to save request profile: %s", e)
+
+    def _wants_profile(self, scope) -> bool:
+        if settings.profiling_enabled:
+            return True
+        if not settings.profiling_allowed_ips:
+            return False
+        requested = False
+        forwarded_for = []
+        for name, value in scope.get("headers", ()):
+            if name == PROFILE_HEADER_BYTES:
+                requested = value.strip() == b"1"
+            elif name == b"x-forwarded-for":
+                forwarded_for.append(value.decode("latin-1"))
+        return requested and profiling_client_ip(scope, ",".join(forwarded_for)) in settings.profiling_allowed_ips
+
+
+def profiling_client_ip(scope, forwarded_for: str) -> str:
+    """The connecting peer, or the right-most untrusted X-Forwarded-For hop behind trusted proxies."""
+    client = scope.get("client")
+    peer = client[0] if client else ""
+    trusted = _trusted_networks(tuple(settings.profiling_trusted_proxies))
+    if not trusted or not _is_trusted(peer, trusted):
+        return peer
+
+    for hop in reversed([hop.strip() for hop in forwarded_for.split(",") if hop.strip()]):
+        if not _is_trusted(hop, trusted):
+            return hop
+    return peer
+
+
+@functools.lru_cache(maxsize=8)
+def _trusted_networks(proxies: tuple[str, ...]) -> tuple:
+    return tuple(ipaddress.ip_network(proxy, strict=False) for proxy in proxies)
+
+
+def _is_trusted(address: str, networks: tuple) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in networks)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{getattr(code, 'co_qualname', code.co_name)} ({_short_path(code.co_filename)}:{frame.f_lineno})"
+
+
+@functools.lru_cache(maxsize=4096)
+def _short_path(filename: str) -> str:
+    for marker in (f"{os.sep}app{os.sep}", f"{os.sep}site-packages{os.sep}"):
+        position = filename.rfind(marker)
+        if position >= 0:
+            return filename[position + 1:]
+    return os.path.basename(filename)
+
+
+def _stack(frame) -> tuple[str, ...]:
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return tuple(reversed(labels))
+
+
+def _await_chain(task: asyncio.Task) -> tuple[str, ...]:
+    labels = []
+    awaitable: Any = task.get_coro()
+    while awaitable is not None:
+        frame = getattr(awaitable, "cr_frame", None) or getattr(awaitable, "gi_frame", None) or getattr(awaitable, "ag_frame", None)
+        if frame is None:
+            if isinstance(awaitable, asyncio.Task):
+                awaitable = awaitable.get_coro()
+                continue
+            if isinstance(awaitable, asyncio.Future):
+                labels.append(f"<{type(awaitable).__name__}>")
+            break
+        labels.append(_frame_label(frame))
+        awaitable = (
+            getattr(awaitable, "cr_await", None)
+            or getattr(awaitable, "gi_yieldfrom", None)
+            or getattr(awaitable, "ag_await", None)
+        )
+    return tuple(labels)
+
+
+def _task_profile(task: asyncio.Task) -> ProfiledRequest | None:
+    get_context = getattr(task, "get_context", None)
+    return get_context().get(_active_profile) if get_context else None
+
+
+def _executor_owner(frame) -> ProfiledRequest | None:
+    """The profiled request whose asyncio.to_thread work this executor thread is running."""
+    while frame is not None:
+        code = frame.f_code
+        if code.co_name == "run" and code.co_filename.endswith(EXECUTOR_RUN_FILE):
+            work_item = frame.f_locals.get("self")
+            function = getattr(work_item, "fn", None)
+            # asyncio.to_thread submits functools.partial(context.run, func, ...).
+            if isinstance(function, functools.partial):
+                context = getattr(function.func, "__self__", None)
+                if isinstance(context, contextvars.Context):
+                    return context.get(_active_profile)
+            return None
+        frame = frame.f_back
+    return None
+
+
+request_profiler = SamplingProfiler(
+    interval_seconds=settings.profiling_sample_interval_seconds,
+    keep_slowest=settings.profiling_keep_slowest,
+    window_seconds=settings.profiling_window_seconds,
+    output_dir=Path(settings.profiling_output_dir) if settings.profiling_output_dir else PROFILES_DIR,
+)
@@ -0,0 +1,109 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict
+
+from app.config import settings
+from app.models import ScholarshipResult
+from app.services.normalized_profile import NormalizedProfile
+
+
+class ResultCache:
+    """
+    In-process TTL + LRU cache for scholarship results, keyed on a hash of the
+    normalized user profile.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, ScholarshipResult]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(profile: NormalizedProfile, gpa_bucket: float) -> str:
+        gpa_percentage = float(profile.gpa_percentage or 0)
+        if gpa_bucket > 0:
+            gpa_percentage = int(gpa_percentage // gpa_bucket) * gpa_bucket
+
+        test_scores = {
+            str(exam).strip().lower(): score
+            for exam, score in profile.test_scores.items()
+        }
+        canonical = {
+            "degree_level": _canonical_text(profile.degree_level),
+            "current_degree": _canonical_text(profile.current_degree),
+            "gpa_bucket": gpa_percentage,
+            "nationality": _canonical_text(profile.nationality),
+            "target_countries": sorted(_canonical_text(country) for country in profile.target_countries),
+            "intended_intake": _canonical_text(profile.intended_intake),
+            "major": _canonical_text(profile.major),
+            "test_scores": test_scores,
+            "english_test_type": _canonical_text(profile.english_test_type),
+            "work_experience_years": int(profile.work_experience_years or 0),
+            "profile_highlight": _canonical_text(profile.profile_highlight),
+        }
+        encoded = json.dumps(canonical, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> ScholarshipResult | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, result = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result.model_copy(deep=True)
+
+    def set(self, key: str, result: ScholarshipResult) -> None:
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return
+
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[key] = (expires_at, result.model_copy(deep=True))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+def _canonical_text(value: Any) -> str:
+    return " ".join(str(value or "").strip().lower().split())
+
+
+result_cache = ResultCache(
+    max_entries=settings.result_cache_max_entries,
+    ttl_seconds=settings.result_cache_ttl_seconds,
+)
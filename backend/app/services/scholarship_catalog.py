@@ -0,0 +1,123 @@
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable
+
+from app.services.scoring_engine import ScoringEngine, np
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogSnapshot:
+    """Immutable view of one load of the scholarship file plus its lookup indexes."""
+
+    def __init__(self, items: list[Dict[str, Any]], normalize_degree: Callable[[Any], str], mtime: float) -> None:
+        self.items = items
+        self.mtime = mtime
+        self.by_degree: dict[str, list[int]] = {}
+        self.by_country: dict[str, list[int]] = {}
+
+        for position, item in enumerate(items):
+            levels = frozenset(normalize_degree(level) for level in item.get("degreeLevels", []))
+            for level in levels:
+                self.by_degree.setdefault(level, []).append(position)
+            self.by_country.setdefault(item.get("country", ""), []).append(position)
+
+        self.scorer: ScoringEngine | None = None
+        if np is not None:
+            try:
+                self.scorer = ScoringEngine(items, normalize_degree)
+            except Exception as e:
+                logger.warning("Vectorized scoring unavailable, using per-item scoring: %s", e)
+
+    def candidate_positions(self, degree_level: str, target_countries: Iterable[str]) -> list[int]:
+        """
+        Positions of items that can still clear the local matcher's score cutoff.
+
+        When the student named target countries, an item that misses both the degree
+        level and the country takes -20 and -15 and cannot reach the cutoff, so only
+        items matching one of them are returned. Without target countries every item
+        stays a candidate.
+        """
+        countries = [str(country).strip() for country in target_countries]
+        if not countries:
+            return list(range(len(self.items)))
+
+        positions = set(self.by_degree.get(degree_level, []))
+        positions.update(self.by_country.get("Anywhere", []))
+        for country in countries:
+            positions.update(self.by_country.get(country, []))
+        return sorted(positions)
+
+
+class ScholarshipCatalog:
+    """
+    Scholarship data loaded once and kept in memory for the local matcher.
+
+    Expired scholarships are dropped at load time. The file's mtime is re-checked at most
+    every reload_check_seconds and the catalog reloads in place when it changes.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        normalize_degree: Callable[[Any], str],
+        is_fresh: Callable[[Any], bool],
+        reload_check_seconds: float,
+    ) -> None:
+        self.path = path
+        self.normalize_degree = normalize_degree
+        self.is_fresh = is_fresh
+        self.reload_check_seconds = reload_check_seconds
+        self._snapshot: CatalogSnapshot | None = None
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> CatalogSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None or time.monotonic() - self._last_check >= self.reload_check_seconds:
+            snapshot = self._refresh()
+        return snapshot
+
+    def load(self) -> CatalogSnapshot:
+        with self._lock:
+            return self._load_locked()
+
+    def _refresh(self) -> CatalogSnapshot:
+        with self._lock:
+            self._last_check = time.monotonic()
+            if self._snapshot is None:
+                return self._load_locked()
+
+            try:
+                mtime = os.stat(self.path).st_mtime
+            except OSError as e:
+                logger.warning("Could not stat scholarship data, keeping loaded catalog: %s", e)
+                return self._snapshot
+
+            if mtime != self._snapshot.mtime:
+                logger.info("Scholarship data changed on disk, reloading catalog")
+                try:
+                    return self._load_locked()
+                except Exception as e:
+                    logger.exception("Failed to reload scholarship data, keeping previous catalog: %s", e)
+            return self._snapshot
+
+    def _load_locked(self) -> CatalogSnapshot:
+        mtime = os.stat(self.path).st_mtime
+        with open(self.path, "r", encoding="utf-8") as file:
+            scholarships = json.load(file)
+
+        fresh_items = [item for item in scholarships if self.is_fresh(item.get("deadline"))]
+        self._snapshot = CatalogSnapshot(fresh_items, self.normalize_degree, mtime)
+        self._last_check = time.monotonic()
+        logger.info(
+            "Loaded %s fresh scholarships (%s total) from %s",
+            len(fresh_items),
+            len(scholarships),
+            self.path.name,
+        )
+        return self._snapshot
@@ -0,0 +1,188 @@
+from datetime import date
+from typing import Any, Callable, Dict, Sequence
+
+from app.services.normalized_profile import NormalizedProfile
+
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+
+ROLLING_DEADLINES = {"rolling", "rolling deadlines", "tba", "open soon"}
+
+
+class ScoringEngine:
+    """
+    Columnar, NumPy-backed version of GeminiService._score_local_match.
+
+    The catalog is compiled once into arrays (degree bitmasks, country codes, GPA and
+    work-experience thresholds, per-exam test minimums, deadline fields) so a profile
+    can be scored against every entry in one vectorized pass. Scores are identical to
+    the per-item function.
+    """
+
+    def __init__(self, items: Sequence[Dict[str, Any]], normalize_degree: Callable[[Any], str]) -> None:
+        if np is None:
+            raise RuntimeError("numpy is not installed")
+
+        size = len(items)
+        self.size = size
+        self.degree_bits: dict[str, int] = {}
+        self.country_codes: dict[str, int] = {}
+        self.exam_columns: dict[str, int] = {}
+        self.major_groups: dict[tuple[str, ...], int] = {}
+
+        degree_mask = np.zeros(size, dtype=np.uint64)
+        country_code = np.zeros(size, dtype=np.int32)
+        major_group = np.zeros(size, dtype=np.int32)
+        min_gpa = np.zeros(size, dtype=np.float64)
+        work_required = np.zeros(size, dtype=np.int64)
+        has_tests = np.zeros(size, dtype=bool)
+        is_rolling = np.zeros(size, dtype=bool)
+        deadline_month = np.zeros(size, dtype=np.int8)
+        test_minimums: list[dict[int, float]] = []
+
+        for position, item in enumerate(items):
+            for level in {normalize_degree(level) for level in item.get("degreeLevels", [])}:
+                bit = self.degree_bits.setdefault(level, len(self.degree_bits))
+                if bit >= 64:
+                    raise ValueError("Too many distinct degree levels for a 64-bit mask")
+                degree_mask[position] |= np.uint64(1 << bit)
+
+            country = item.get("country", "")
+            country_code[position] = self.country_codes.setdefault(country, len(self.country_codes))
+
+            majors = tuple(str(entry).lower() for entry in item.get("majors", []))
+            major_group[position] = self.major_groups.setdefault(majors, len(self.major_groups))
+
+            min_gpa[position] = float(item.get("minGPAPercentage", 0))
+            work_required[position] = int(item.get("workExperienceRequired", 0) or 0)
+
+            requirements = item.get("testScores", {})
+            has_tests[position] = bool(requirements)
+            minimums = {}
+            for exam, minimum in (requirements or {}).items():
+                try:
+                    minimums[self.exam_columns.setdefault(exam, len(self.exam_columns))] = float(minimum)
+                except (TypeError, ValueError):
+                    continue
+            test_minimums.append(minimums)
+
+            deadline = item.get("deadline")
+            if deadline:
+                if str(deadline).strip().lower() in ROLLING_DEADLINES:
+                    is_rolling[position] = True
+                else:
+                    try:
+                        deadline_month[position] = date.fromisoformat(str(deadline)).month
+                    except ValueError:
+                        pass
+
+        # A minimum can itself be NaN (never met), so requirement is tracked separately.
+        test_min = np.zeros((size, len(self.exam_columns)), dtype=np.float64)
+        test_required = np.zeros((size, len(self.exam_columns)), dtype=bool)
+        for position, minimums in enumerate(test_minimums):
+            for column, minimum in minimums.items():
+                test_min[position, column] = minimum
+                test_required[position, column] = True
+
+        self.degree_mask = degree_mask
+        self.country_code = country_code
+        self.major_group = major_group
+        self.major_group_values = list(self.major_groups)
+        self.min_gpa = min_gpa
+        self.work_required = work_required
+        self.has_tests = has_tests
+        self.test_min = test_min
+        self.test_required = test_required
+        self.is_rolling = is_rolling
+        self.deadline_month = deadline_month
+
+    def score(
+        self,
+        profile: NormalizedProfile,
+        positions: Sequence[int],
+        score_major_match: Callable[[str, list[str]], int],
+    ):
+        """Score the profile against the given catalog positions and return an int array."""
+        index = np.asarray(positions, dtype=np.intp)
+        scores = np.zeros(len(index), dtype=np.int64)
+        if not len(index):
+            return scores
+
+        degree_level = str(profile.degree_level).strip()
+        bit = self.degree_bits.get(degree_level)
+        if bit is None:
+            scores -= 20
+        else:
+            degree_match = (self.degree_mask[index] & np.uint64(1 << bit)) != 0
+            scores += np.where(degree_match, 25, -20)
+
+        target_countries = [str(country).strip() for country in profile.target_countries]
+        accepted_codes = [
+            self.country_codes[country]
+            for country in {"Anywhere", *target_countries}
+            if country in self.country_codes
+        ]
+        country_match = np.isin(self.country_code[index], accepted_codes)
+        scores += np.where(country_match, 20, -15 if target_countries else 0)
+
+        major = str(profile.major).strip().lower()
+        groups = self.major_group[index]
+        unique_groups = np.unique(groups)
+        group_points = np.zeros(len(self.major_group_values), dtype=np.int64)
+        for group in unique_groups:
+            majors = self.major_group_values[group]
+            group_points[group] = 15 if "any" in majors else score_major_match(major, list(majors))
+        scores += group_points[groups]
+
+        user_percentage = profile.gpa_percentage
+        min_gpa = self.min_gpa[index]
+        shortfall_points = np.maximum(-20, 10 - np.trunc(min_gpa - user_percentage)).astype(np.int64)
+        scores += np.where(user_percentage >= min_gpa, 20, shortfall_points)
+
+        work_experience = int(profile.work_experience_years or 0)
+        scores += np.where(work_experience >= self.work_required[index], 5, 0)
+
+        scores += self._score_tests(profile, index)
+        scores += self._score_intake(profile.intended_intake, index)
+
+        if profile.profile_highlight:
+            scores += 5
+
+        return np.clip(scores, 0, 98)
+
+    def _score_tests(self, profile: NormalizedProfile, index):
+        test_scores = profile.test_scores
+        test_points = np.zeros(len(index), dtype=np.int64)
+        for exam, column in self.exam_columns.items():
+            provided = test_scores.get(exam) or test_scores.get(exam.upper()) or test_scores.get(exam.lower())
+            if provided is None:
+                continue
+            try:
+                provided_value = float(provided)
+            except (TypeError, ValueError):
+                continue
+
+            exam_points = np.where(provided_value >= self.test_min[index, column], 15, 5)
+            test_points = np.maximum(test_points, np.where(self.test_required[index, column], exam_points, 0))
+
+        if profile.english_test_type:
+            test_points = np.where(test_points == 0, 2, test_points)
+        return np.where(self.has_tests[index], test_points, 5)
+
+    def _score_intake(self, intended_intake: Any, index):
+        if not intended_intake:
+            return 0
+
+        intake_text = str(intended_intake).strip().lower()
+        months = self.deadline_month[index]
+        if "fall" in intake_text:
+            dated_points = np.full(len(index), 6, dtype=np.int64)
+        else:
+            fallback_points = 3 if "any" in intake_text else 0
+            spring_points = 4 if "spring" in intake_text else fallback_points
+            dated_points = np.where(months <= 10, spring_points, fallback_points)
+
+        return np.where(self.is_rolling[index], 6, np.where(months > 0, dated_points, 0))
@@ -1,32 +1,112 @@
 import asyncio
+import hashlib
 import json
 import logging
+import threading
 from datetime import datetime
-from pathlib import Path
 from typing import Any, Dict
 
+import google_auth_httplib2
+import httplib2
 import httpx
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
 
 from app.config import settings
+from app.services.lead_journal import JOURNAL_PATH, LeadJournal
+from app.services.lead_writer import LeadBatchWriter
+from app.services.metrics import STAGE_SECONDS
+from app.services.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
 
+class SheetsClientCache:
+    """
+    Process-wide Sheets API client.
+
+    Service-account credentials are parsed once and their access token is reused until
+    it expires. The discovery-built service wraps a non-thread-safe httplib2 connection,
+    so one service object is kept per worker thread, all sharing the same credentials.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._credentials: Credentials | None = None
+        self._fingerprint: str | None = None
+        self._local = threading.local()
+
+    def get_service(self, service_account_email: str, private_key: str, scopes: list[str]):
+        credentials, fingerprint = self._get_credentials(service_account_email, private_key, scopes)
+        self._ensure_token(credentials)
+
+        if getattr(self._local, "fingerprint", None) != fingerprint:
+            client_options = (
+                {"api_endpoint": settings.google_sheets_api_endpoint}
+                if settings.google_sheets_api_endpoint
+                else None
+            )
+            self._local.service = build(
+                "sheets",
+                "v4",
+                credentials=credentials,
+                cache_discovery=False,
+                static_discovery=True,
+                client_options=client_options,
+            )
+            self._local.fingerprint = fingerprint
+        return self._local.service
+
+    def _get_credentials(self, service_account_email: str, private_key: str, scopes: list[str]):
+        fingerprint = hashlib.sha256(
+            "\0".join(
+                [service_account_email, private_key, settings.google_oauth_token_uri, settings.google_sheets_api_endpoint]
+            ).encode("utf-8")
+        ).hexdigest()
+
+        with self._lock:
+            if self._credentials is None or self._fingerprint != fingerprint:
+                credentials_info = {
+                    "type": "service_account",
+                    "client_email": service_account_email,
+                    "private_key": private_key.replace("\\n", "\n"),
+                    "token_uri": settings.google_oauth_token_uri,
+                }
+                self._credentials = Credentials.from_service_account_info(credentials_info, scopes=scopes)
+                self._fingerprint = fingerprint
+            return self._credentials, self._fingerprint
+
+    def _ensure_token(self, credentials: Credentials) -> None:
+        # Refresh under the lock so concurrent submissions do not all fetch a new token at once.
+        if credentials.valid:
+            return
+        with self._lock:
+            if not credentials.valid:
+                credentials.refresh(google_auth_httplib2.Request(httplib2.Http()))
+                logger.info("Fetched new Google Sheets access token")
+
+    def reset(self) -> None:
+        with self._lock:
+            self._credentials = None
+            self._fingerprint = None
+        self._local = threading.local()
+
+
+sheets_client_cache = SheetsClientCache()
+
+
 class SheetsService:
     """
     Production-oriented lead persistence with three layers:
     1. Direct Google Sheets API append via service account
     2. Existing Apps Script webhook fallback
-    3. Local JSON backup fallback
+    3. Local append-only JSONL backup fallback
     """
 
     SHEET_RANGE = "Sheet1!A:AC"
     SHEETS_SCOPE = ["https://www.googleapis.com/auth/spreadsheets"]
 
     def __init__(self):
-        self.storage_file = Path(__file__).parent.parent / "data" / "leads.json"
         self.web_app_url = settings.google_apps_script_url
         self.sheet_id = settings.google_sheets_id
         self.service_account_email = settings.google_service_account_email
@@ -37,33 +117,37 @@ class SheetsService:
         service = SheetsService()
         payload = service._build_payload(lead)
 
-        try:
-            logger.info("Processing lead for %s", lead.email)
+        with tracer.span("sheets.save_lead") as span:
+            try:
+                logger.info("Processing lead for %s", lead.email)
 
-            saved_to_sheets = await service._append_to_google_sheets(payload)
-            if saved_to_sheets:
-                if settings.allow_local_backup:
-                    await service._save_locally(payload)
-                return True
+                saved_to_sheets = await service._append_to_google_sheets(payload)
+                if saved_to_sheets:
+                    span.set_attribute("lead.stored_via", "sheets_api")
+                    if settings.allow_local_backup:
+                        await service._save_locally(payload)
+                    return True
 
-            saved_via_apps_script = await service._append_via_apps_script(payload)
-            if saved_via_apps_script:
-                if settings.allow_local_backup:
-                    await service._save_locally(payload)
-                return True
+                saved_via_apps_script = await service._append_via_apps_script(payload)
+                if saved_via_apps_script:
+                    span.set_attribute("lead.stored_via", "apps_script")
+                    if settings.allow_local_backup:
+                        await service._save_locally(payload)
+                    return True
 
-            logger.error("Lead persistence failed: no durable storage provider succeeded")
-            if settings.allow_local_backup:
-                await service._save_locally(payload)
-            return False
-        except Exception as e:
-            logger.exception("Sheets service error: %s", e)
-            if settings.allow_local_backup:
-                try:
+                logger.error("Lead persistence failed: no durable storage provider succeeded")
+                span.set_attribute("lead.stored_via", "none")
+                if settings.allow_local_backup:
                     await service._save_locally(payload)
-                except Exception:
-                    logger.exception("Failed to save local backup after Sheets error")
-            return False
+                return False
+            except Exception as e:
+                logger.exception("Sheets service error: %s", e)
+                if settings.allow_local_backup:
+                    try:
+                        await service._save_locally(payload)
+                    except Exception:
+                        logger.exception("Failed to save local backup after Sheets error")
+                return False
 
     def _build_payload(self, lead) -> Dict[str, Any]:
         test_scores = lead.user_profile.test_scores or {}
@@ -166,27 +250,34 @@ class SheetsService:
 
         row = self._build_sheet_row(payload)
 
-        try:
-            await asyncio.to_thread(self._append_row_sync, row)
-            logger.info("Lead successfully appended to Google Sheets via service account")
-            return True
-        except Exception as e:
-            logger.exception("Direct Google Sheets API append failed: %s", e)
-            return False
+        with STAGE_SECONDS.time(stage="sheets_append") as timer:
+            try:
+                if settings.sheets_batch_enabled:
+                    appended = await sheets_lead_writer.submit(row)
+                    if appended:
+                        logger.info("Lead successfully appended to Google Sheets via service account")
+                    else:
+                        timer.outcome = "failure"
+                    return appended
+
+                await asyncio.to_thread(self._append_row_sync, row)
+                logger.info("Lead successfully appended to Google Sheets via service account")
+                return True
+            except Exception as e:
+                logger.exception("Direct Google Sheets API append failed: %s", e)
+                timer.outcome = "error"
+                return False
 
     def _append_row_sync(self, row: list[str]) -> None:
-        credentials_info = {
-            "type": "service_account",
-            "client_email": self.service_account_email,
-            "private_key": self.private_key.replace("\\n", "\n"),
-            "token_uri": "https://oauth2.googleapis.com/token",
-        }
-        credentials = Credentials.from_service_account_info(
-            credentials_info,
-            scopes=self.SHEETS_SCOPE,
+        self._append_rows_sync([row])
+
+    def _append_rows_sync(self, rows: list[list[str]]) -> None:
+        sheets_service = sheets_client_cache.get_service(
+            self.service_account_email,
+            self.private_key,
+            self.SHEETS_SCOPE,
         )
-        sheets_service = build("sheets", "v4", credentials=credentials, cache_discovery=False)
-        request_body = {"values": [row]}
+        request_body = {"values": rows}
 
         sheets_service.spreadsheets().values().append(
             spreadsheetId=self.sheet_id,
@@ -235,52 +326,62 @@ class SheetsService:
             return False
 
         logger.info("Falling back to Apps Script for Google Sheets write")
-        async with httpx.AsyncClient(timeout=30, follow_redirects=True) as client:
-            try:
-                response = await client.post(
-                    self.web_app_url,
-                    json=payload,
-                    headers={"Content-Type": "application/json"},
-                )
-                logger.info("Apps Script response status: %s", response.status_code)
-
-                if response.status_code != 200:
-                    logger.error("Apps Script HTTP error %s: %s", response.status_code, response.text)
-                    return False
-
+        with STAGE_SECONDS.time(stage="apps_script") as timer:
+            async with httpx.AsyncClient(timeout=30, follow_redirects=True) as client:
                 try:
-                    result = response.json()
-                    success = bool(result.get("success"))
-                    if not success:
-                        logger.error("Apps Script reported failure: %s", result)
-                    return success
-                except json.JSONDecodeError:
-                    logger.warning("Apps Script returned non-JSON response; treating as success")
-                    return True
-            except httpx.TimeoutException:
-                logger.error("Apps Script request timed out")
-                return False
-            except httpx.RequestError as e:
-                logger.exception("Apps Script request error: %s", e)
-                return False
+                    response = await client.post(
+                        self.web_app_url,
+                        json=payload,
+                        headers={"Content-Type": "application/json"},
+                    )
+                    logger.info("Apps Script response status: %s", response.status_code)
+
+                    if response.status_code != 200:
+                        logger.error("Apps Script HTTP error %s: %s", response.status_code, response.text)
+                        timer.outcome = "failure"
+                        return False
+
+                    try:
+                        result = response.json()
+                        success = bool(result.get("success"))
+                        if not success:
+                            logger.error("Apps Script reported failure: %s", result)
+                            timer.outcome = "failure"
+                        return success
+                    except json.JSONDecodeError:
+                        logger.warning("Apps Script returned non-JSON response; treating as success")
+                        return True
+                except httpx.TimeoutException:
+                    logger.error("Apps Script request timed out")
+                    timer.outcome = "timeout"
+                    return False
+                except httpx.RequestError as e:
+                    logger.exception("Apps Script request error: %s", e)
+                    timer.outcome = "error"
+                    return False
 
     async def _save_locally(self, lead_data: Dict[str, Any]) -> bool:
-        try:
-            self.storage_file.parent.mkdir(parents=True, exist_ok=True)
+        with STAGE_SECONDS.time(stage="local_backup") as timer:
+            try:
+                lead_data["local_backup_time"] = datetime.now().isoformat()
+                await lead_journal.append_async(lead_data)
 
-            leads = []
-            if self.storage_file.exists():
-                with open(self.storage_file, "r", encoding="utf-8") as file:
-                    leads = json.load(file)
+                logger.info("Lead backed up locally: %s", lead_data.get("email"))
+                return True
+            except Exception as e:
+                logger.exception("Local backup error: %s", e)
+                timer.outcome = "error"
+                return False
 
-            lead_data["local_backup_time"] = datetime.now().isoformat()
-            leads.append(lead_data)
 
-            with open(self.storage_file, "w", encoding="utf-8") as file:
-                json.dump(leads, file, indent=2, ensure_ascii=False)
+sheets_lead_writer = LeadBatchWriter(
+    flush_rows=lambda rows: SheetsService()._append_rows_sync(rows),
+    max_rows=settings.sheets_batch_max_rows,
+    max_wait_seconds=settings.sheets_batch_max_wait_seconds,
+)
 
-            logger.info("Lead backed up locally: %s", lead_data.get("email"))
-            return True
-        except Exception as e:
-            logger.exception("Local backup error: %s", e)
-            return False
+lead_journal = LeadJournal(
+    JOURNAL_PATH,
+    fsync_interval_seconds=settings.lead_journal_fsync_interval_seconds,
+    fsync_every=settings.lead_journal_fsync_every,
+)
@@ -0,0 +1,196 @@
+import logging
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from email.message import Message
+from typing import Iterator
+
+from app.config import settings
+from app.services.metrics import STAGE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class SMTPConnectionPool:
+    """
+    Bounded pool of authenticated SMTP sessions.
+
+    At most max_size sessions exist at once; callers beyond that wait for a free one.
+    A session idle for longer than health_check_seconds is probed with NOOP before
+    reuse, and one idle for longer than idle_timeout_seconds is closed, either on the
+    next checkout or by a background reaper thread. A send that fails on a reused
+    session because the server dropped it is retried once on a fresh connection, but
+    only if the session died before DATA started, so a message is never sent twice.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        user: str,
+        password: str,
+        starttls: bool,
+        max_size: int,
+        idle_timeout_seconds: float,
+        health_check_seconds: float,
+        timeout_seconds: float,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.starttls = starttls
+        self.max_size = max(1, max_size)
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.health_check_seconds = health_check_seconds
+        self.timeout_seconds = timeout_seconds
+        self._slots = threading.BoundedSemaphore(self.max_size)
+        self._lock = threading.Lock()
+        self._idle: list[tuple[smtplib.SMTP, float]] = []
+        self._reaper: threading.Thread | None = None
+        self._closed = threading.Event()
+
+    def send_message(self, msg: Message) -> None:
+        with STAGE_SECONDS.time(stage="smtp_send") as timer:
+            reused = False
+            server = None
+            try:
+                with self.connection() as (server, reused):
+                    server.data_started = False
+                    server.send_message(msg)
+                return
+            except (smtplib.SMTPServerDisconnected, ConnectionError) as e:
+                # Once DATA has started the server may already have accepted the message.
+                if not reused or server.data_started:
+                    raise
+                logger.warning("Pooled SMTP session dropped (%s), retrying on a new connection", e)
+
+            timer.outcome = "retried"
+            with self.connection(fresh=True) as (server, _):
+                server.send_message(msg)
+
+    @contextmanager
+    def connection(self, fresh: bool = False) -> Iterator[tuple[smtplib.SMTP, bool]]:
+        self._slots.acquire()
+        try:
+            server = None if fresh else self._checkout_idle()
+            reused = server is not None
+            if server is None:
+                server = self._connect()
+
+            try:
+                yield server, reused
+            except Exception:
+                self._close_quietly(server)
+                raise
+
+            with self._lock:
+                self._idle.append((server, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    def close_idle(self, older_than: float = 0.0) -> int:
+        now = time.monotonic()
+        with self._lock:
+            expired = [server for server, last_used in self._idle if now - last_used >= older_than]
+            self._idle = [(server, last_used) for server, last_used in self._idle if now - last_used < older_than]
+
+        for server in expired:
+            self._close_quietly(server)
+        return len(expired)
+
+    def close(self) -> None:
+        self._closed.set()
+        self.close_idle()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"idle": len(self._idle), "max_size": self.max_size}
+
+    def _checkout_idle(self) -> smtplib.SMTP | None:
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return None
+                server, last_used = self._idle.pop()
+
+            idle_for = time.monotonic() - last_used
+            if idle_for >= self.idle_timeout_seconds:
+                self._close_quietly(server)
+                continue
+
+            if idle_for >= self.health_check_seconds:
+                try:
+                    code, _ = server.noop()
+                    if code != 250:
+                        raise smtplib.SMTPServerDisconnected(f"NOOP returned {code}")
+                except Exception as e:
+                    logger.info("Discarding stale SMTP session: %s", e)
+                    self._close_quietly(server)
+                    continue
+
+            return server
+
+    def _connect(self) -> smtplib.SMTP:
+        server = _PooledSMTP(self.host, self.port, timeout=self.timeout_seconds)
+        try:
+            if self.starttls:
+                server.starttls()
+            if self.user and self.password:
+                server.login(self.user, self.password)
+        except Exception:
+            self._close_quietly(server)
+            raise
+
+        self._start_reaper()
+        logger.info("Opened new SMTP session to %s:%s", self.host, self.port)
+        return server
+
+    def _start_reaper(self) -> None:
+        with self._lock:
+            if self._reaper is not None and self._reaper.is_alive():
+                return
+            self._closed.clear()
+            self._reaper = threading.Thread(target=self._reap_idle, name="smtp-pool-reaper", daemon=True)
+            self._reaper.start()
+
+    def _reap_idle(self) -> None:
+        interval = max(1.0, self.idle_timeout_seconds / 2)
+        while not self._closed.wait(interval):
+            closed = self.close_idle(older_than=self.idle_timeout_seconds)
+            if closed:
+                logger.info("Closed %s idle SMTP sessions", closed)
+
+    @staticmethod
+    def _close_quietly(server: smtplib.SMTP) -> None:
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+
+class _PooledSMTP(smtplib.SMTP):
+    """SMTP session that records whether the current send reached DATA."""
+
+    data_started = False
+
+    def data(self, msg):
+        self.data_started = True
+        return super().data(msg)
+
+
+smtp_pool = SMTPConnectionPool(
+    host=settings.smtp_host,
+    port=settings.smtp_port,
+    user=settings.smtp_user,
+    password=settings.smtp_password,
+    starttls=settings.smtp_starttls,
+    max_size=settings.smtp_pool_size,
+    idle_timeout_seconds=settings.smtp_pool_idle_timeout_seconds,
+    health_check_seconds=settings.smtp_pool_health_check_seconds,
+    timeout_seconds=settings.smtp_timeout_seconds,
+)
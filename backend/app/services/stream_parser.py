@@ -0,0 +1,149 @@
+import json
+import logging
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class ScholarshipStreamParser:
+    """
+    Incremental parser for the provider's JSON answer as it streams in.
+
+    feed() accepts arbitrary text chunks and returns the events that became complete:
+    ("scholarship", dict) for each object in the top-level "scholarships" array, and
+    ("field", (key, value)) for every other top-level member such as
+    summary_probability. Leading text (a ```json fence or a sentence of prose) is skipped
+    up to the first "{" followed by a key or "}", so braces inside the prose are ignored.
+    Only brackets and string state are tracked, so each chunk is scanned once and
+    complete values are decoded with json.loads.
+    """
+
+    def __init__(self, array_key: str = "scholarships") -> None:
+        self.array_key = array_key
+        self._buffer = ""
+        self._position = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._started = False
+        self._finished = False
+        # Root-level parsing state: the last key read and where its value began.
+        self._string_start = -1
+        self._last_string = None
+        self._key = None
+        self._value_start = -1
+        self._item_start = -1
+
+    @property
+    def finished(self) -> bool:
+        return self._finished
+
+    def feed(self, text: str) -> list[tuple[str, Any]]:
+        events: list[tuple[str, Any]] = []
+        if self._finished:
+            return events
+
+        self._buffer += text
+        buffer = self._buffer
+        position = self._position
+        length = len(buffer)
+
+        if not self._started:
+            position = self._find_start(buffer, position)
+            if not self._started:
+                self._shift(position)
+                self._position = 0
+                return events
+
+        while position < length:
+            char = buffer[position]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._string_start >= 0:
+                        self._last_string = buffer[self._string_start:position + 1]
+                        self._string_start = -1
+                position += 1
+                continue
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._value_start < 0:
+                    self._string_start = position
+            elif char == ":" and self._depth == 1 and self._value_start < 0:
+                self._key = self._decode(self._last_string)
+                self._value_start = position + 1
+            elif char in "{[":
+                self._depth += 1
+                if char == "{" and self._depth == 3 and self._key == self.array_key:
+                    self._item_start = position
+            elif char in "}]":
+                if char == "}" and self._depth == 3 and self._item_start >= 0:
+                    item = self._decode(buffer[self._item_start:position + 1])
+                    if isinstance(item, dict):
+                        events.append(("scholarship", item))
+                    self._item_start = -1
+                self._depth -= 1
+                if self._depth == 0:
+                    self._end_member(buffer, position, events)
+                    self._finished = True
+                    position += 1
+                    break
+            elif char == "," and self._depth == 1:
+                self._end_member(buffer, position, events)
+            position += 1
+
+        # Drop text that no pending value can refer to any more.
+        keep_from = min(
+            start for start in (self._value_start, self._item_start, self._string_start, position) if start >= 0
+        )
+        self._shift(keep_from)
+        self._position = position - keep_from
+        return events
+
+    def _find_start(self, buffer: str, position: int) -> int:
+        """Return where the JSON object starts, or where to resume scanning once more text arrives."""
+        while True:
+            start = buffer.find("{", position)
+            if start < 0:
+                return len(buffer)
+            following = start + 1
+            while following < len(buffer) and buffer[following].isspace():
+                following += 1
+            if following == len(buffer):
+                return start
+            if buffer[following] in '"}':
+                self._started = True
+                return start
+            position = start + 1
+
+    def _end_member(self, buffer: str, position: int, events: list[tuple[str, Any]]) -> None:
+        if self._value_start >= 0 and self._key is not None and self._key != self.array_key:
+            value = self._decode(buffer[self._value_start:position])
+            events.append(("field", (self._key, value)))
+        self._key = None
+        self._value_start = -1
+        self._last_string = None
+
+    def _shift(self, offset: int) -> None:
+        if offset <= 0:
+            return
+        self._buffer = self._buffer[offset:]
+        for name in ("_value_start", "_item_start", "_string_start"):
+            start = getattr(self, name)
+            if start >= 0:
+                setattr(self, name, start - offset)
+
+    @staticmethod
+    def _decode(text: str | None) -> Any:
+        if text is None:
+            return None
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            logger.warning("Skipping malformed value in streamed provider response")
+            return None
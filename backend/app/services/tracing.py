@@ -0,0 +1,390 @@
+import argparse
+import contextvars
+import json
+import logging
+import queue
+import re
+import secrets
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, TextIO
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+TRACES_PATH = Path(__file__).parent.parent / "data" / "traces.jsonl"
+SERVICE_NAME = "scholarship-finder-api"
+REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._:-]{1,64}$")
+TRACEPARENT_PATTERN = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+# OTLP status codes and span kinds.
+STATUS_UNSET, STATUS_OK, STATUS_ERROR = 0, 1, 2
+KIND_INTERNAL, KIND_SERVER = 1, 2
+
+_request_id: contextvars.ContextVar[str | None] = contextvars.ContextVar("request_id", default=None)
+_current_span: contextvars.ContextVar["Span | None"] = contextvars.ContextVar("current_span", default=None)
+
+
+def current_request_id() -> str | None:
+    return _request_id.get()
+
+
+@contextmanager
+def request_context(request_id: str | None = None) -> Iterator[str]:
+    """Bind a request ID (a valid incoming one, or a new one) for logs and spans in this context."""
+    if not request_id or not REQUEST_ID_PATTERN.match(request_id):
+        request_id = uuid.uuid4().hex
+    token = _request_id.set(request_id)
+    try:
+        yield request_id
+    finally:
+        _request_id.reset(token)
+
+
+def install_log_record_factory() -> None:
+    """Give every log record a request_id attribute ("-" outside a request)."""
+    previous = logging.getLogRecordFactory()
+    if getattr(previous, "adds_request_id", False):
+        return
+
+    def factory(*args, **kwargs) -> logging.LogRecord:
+        record = previous(*args, **kwargs)
+        record.request_id = _request_id.get() or "-"
+        return record
+
+    factory.adds_request_id = True
+    logging.setLogRecordFactory(factory)
+
+
+class Span:
+    __slots__ = ("name", "kind", "trace_id", "span_id", "parent_span_id", "start_ns", "end_ns", "attributes", "status", "status_message")
+
+    def __init__(self, name: str, kind: int, trace_id: str, parent_span_id: str, attributes: Dict[str, Any]) -> None:
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent_span_id
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes = attributes
+        self.status = STATUS_UNSET
+        self.status_message = ""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def update_name(self, name: str) -> None:
+        self.name = name
+
+    def end(self) -> None:
+        """Record the end time now; later calls (such as leaving span()) keep the first one."""
+        if not self.end_ns:
+            self.end_ns = time.time_ns()
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in self.attributes.items()],
+            "status": {"code": self.status, **({"message": self.status_message} if self.status_message else {})},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        return span
+
+
+class _NoopSpan:
+    traceparent = ""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def update_name(self, name: str) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class SpanExporter:
+    """
+    Writes finished spans as OTLP/JSON lines, one ExportTraceServiceRequest per line,
+    to the console (stderr) or a file. The OpenTelemetry Collector's otlpjsonfile
+    receiver reads the file format directly. Writes happen on a daemon thread so a slow
+    disk never blocks a request.
+    """
+
+    def __init__(self, target: str, path: Path) -> None:
+        self.target = target
+        self.path = path
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        self._ensure_thread()
+        self._queue.put(span)
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        stream = self._open()
+        while True:
+            spans = [self._queue.get()]
+            while len(spans) < 512:
+                try:
+                    spans.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                stream.write("".join(_otlp_line(span) for span in spans))
+                stream.flush()
+            except Exception as e:
+                logger.warning("Failed to export %s spans: %s", len(spans), e)
+
+    def _open(self) -> TextIO:
+        if self.target == "console":
+            return sys.stderr
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        return open(self.path, "a", encoding="utf-8")
+
+
+class Tracer:
+    """
+    Minimal OpenTelemetry-compatible tracer. span() opens a child of the current span in
+    this context (contextvars follow asyncio tasks and asyncio.to_thread), so nesting
+    spans across awaits and thread hops builds one trace per request. With no exporter
+    configured, span() hands out a shared no-op span and costs next to nothing.
+    """
+
+    def __init__(self, exporter: SpanExporter | None) -> None:
+        self.exporter = exporter
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    @contextmanager
+    def span(self, name: str, kind: int = KIND_INTERNAL, traceparent: str | None = None, **attributes: Any):
+        if self.exporter is None:
+            yield _NOOP_SPAN
+            return
+
+        parent = _current_span.get()
+        trace_id, parent_span_id = (parent.trace_id, parent.span_id) if parent else (None, "")
+        match = TRACEPARENT_PATTERN.match(traceparent or "")
+        if match and parent is None:
+            trace_id, parent_span_id = match.group(1), match.group(2)
+
+        request_id = _request_id.get()
+        if request_id:
+            attributes.setdefault("request.id", request_id)
+        span = Span(name, kind, trace_id or secrets.token_hex(16), parent_span_id, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = STATUS_ERROR
+            span.status_message = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+            self.exporter.export(span)
+
+
+class TracingMiddleware:
+    """
+    Pure ASGI middleware that binds a request ID (a valid incoming X-Request-ID, or a new
+    one) for logs, returns it in the X-Request-ID header and traces the request as a
+    server span. The span ends when the last body chunk is sent, so streamed (SSE)
+    responses are traced to their end rather than to their headers.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = {name: value.decode("latin-1") for name, value in scope.get("headers", ())}
+        method = scope["method"]
+        with request_context(headers.get(b"x-request-id")) as request_id:
+            with tracer.span(
+                method,
+                kind=KIND_SERVER,
+                traceparent=headers.get(b"traceparent"),
+                **{"http.request.method": method, "url.path": scope["path"]},
+            ) as span:
+
+                async def send_traced(message) -> None:
+                    if message["type"] == "http.response.start":
+                        route = getattr(scope.get("route"), "path", None)
+                        if route:
+                            span.update_name(f"{method} {route}")
+                            span.set_attribute("http.route", route)
+                        span.set_attribute("http.response.status_code", message["status"])
+                        message = {
+                            **message,
+                            "headers": [*message.get("headers", ()), (b"x-request-id", request_id.encode("latin-1"))],
+                        }
+                    await send(message)
+                    if message["type"] == "http.response.body" and not message.get("more_body", False):
+                        span.end()
+
+                await self.app(scope, receive, send_traced)
+
+
+def current_traceparent() -> str:
+    span = _current_span.get()
+    return span.traceparent if span else ""
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_line(span: Span) -> str:
+    request = {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+                "scopeSpans": [{"scope": {"name": "app.services.tracing"}, "spans": [span.to_otlp()]}],
+            }
+        ]
+    }
+    return json.dumps(request, separators=(",", ":")) + "\n"
+
+
+def _create_tracer() -> Tracer:
+    target = settings.tracing_exporter.strip().lower()
+    if not target:
+        return Tracer(None)
+    if target not in {"console", "file"}:
+        raise ValueError(f"Unknown tracing exporter: {settings.tracing_exporter}")
+    path = Path(settings.tracing_file_path) if settings.tracing_file_path else TRACES_PATH
+    return Tracer(SpanExporter(target, path))
+
+
+def load_traces(path: Path) -> Dict[str, list[Dict[str, Any]]]:
+    traces: Dict[str, list[Dict[str, Any]]] = {}
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            for resource_spans in request.get("resourceSpans", []):
+                for scope_spans in resource_spans.get("scopeSpans", []):
+                    for span in scope_spans.get("spans", []):
+                        span["attributes"] = {
+                            item["key"]: next(iter(item["value"].values())) for item in span.get("attributes", [])
+                        }
+                        traces.setdefault(span["traceId"], []).append(span)
+    return traces
+
+
+def render_waterfall(spans: list[Dict[str, Any]], width: int = 40) -> list[str]:
+    start = min(int(span["startTimeUnixNano"]) for span in spans)
+    end = max(int(span["endTimeUnixNano"]) for span in spans)
+    total = max(end - start, 1)
+    ids = {span["spanId"] for span in spans}
+    children: Dict[str, list[Dict[str, Any]]] = {}
+    for span in sorted(spans, key=lambda item: int(item["startTimeUnixNano"])):
+        parent = span.get("parentSpanId", "")
+        children.setdefault(parent if parent in ids else "", []).append(span)
+
+    lines = []
+
+    def walk(parent: str, depth: int) -> None:
+        for span in children.get(parent, []):
+            offset = int(span["startTimeUnixNano"]) - start
+            duration = int(span["endTimeUnixNano"]) - int(span["startTimeUnixNano"])
+            bar_start = int(offset / total * width)
+            bar_length = max(1, round(duration / total * width))
+            bar = (" " * bar_start + "#" * bar_length).ljust(width)[:width]
+            failed = " !" if span.get("status", {}).get("code") == STATUS_ERROR else ""
+            lines.append(
+                f"{offset / 1e6:9.1f} {duration / 1e6:9.1f} |{bar}| {'  ' * depth}{span['name']}{failed}"
+            )
+            walk(span["spanId"], depth + 1)
+
+    walk("", 0)
+    return lines
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Show exported traces as waterfalls")
+    parser.add_argument("--file", type=Path, default=Path(settings.tracing_file_path or TRACES_PATH))
+    selection = parser.add_mutually_exclusive_group()
+    selection.add_argument("--trace-id")
+    selection.add_argument("--request-id")
+    selection.add_argument("--slowest", type=int, default=5, help="show the N slowest traces (default)")
+    parser.add_argument("--width", type=int, default=40)
+    args = parser.parse_args()
+
+    traces = load_traces(args.file)
+    if args.trace_id:
+        selected = [traces[args.trace_id]] if args.trace_id in traces else []
+    elif args.request_id:
+        selected = [
+            spans for spans in traces.values()
+            if any(span["attributes"].get("request.id") == args.request_id for span in spans)
+        ]
+    else:
+        selected = sorted(traces.values(), key=_trace_duration, reverse=True)[: args.slowest]
+
+    if not selected:
+        print("No matching traces", file=sys.stderr)
+        raise SystemExit(1)
+
+    for spans in selected:
+        roots = [span for span in spans if not span.get("parentSpanId")] or spans
+        request_id = next((span["attributes"]["request.id"] for span in spans if "request.id" in span["attributes"]), "-")
+        print(f"trace {spans[0]['traceId']}  request {request_id}  {roots[0]['name']}  {_trace_duration(spans) / 1e6:.1f} ms")
+        print(f"{'start ms':>9} {'dur ms':>9}")
+        for line in render_waterfall(spans, args.width):
+            print(line)
+        print()
+
+
+def _trace_duration(spans: list[Dict[str, Any]]) -> int:
+    return max(int(span["endTimeUnixNano"]) for span in spans) - min(int(span["startTimeUnixNano"]) for span in spans)
+
+
+tracer = _create_tracer()
+
+
+if __name__ == "__main__":
+    main()
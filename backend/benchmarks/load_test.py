@@ -0,0 +1,495 @@
+"""
+Load-test the API endpoints against local stubs of every external service.
+
+    python benchmarks/load_test.py --requests 500 --concurrency 32
+    python benchmarks/load_test.py --endpoints calculate --provider-latency 1.5
+    python benchmarks/load_test.py --sheets apps-script --smtp-latency 0.2 --json out.json
+
+Stub servers for the OpenRouter chat completions API, the Google OAuth token and
+Sheets append APIs, the Apps Script webhook and an SMTP server run in this process,
+each with a configurable response latency. The app itself runs under uvicorn in a
+child process, configured to talk only to the stubs and with rate limits raised out
+of the way. Each selected endpoint is then driven with --requests requests from
+--concurrency concurrent clients, and p50/p95/p99 latency and throughput are
+reported per endpoint. Profiles and names vary per request (see --profiles) so the
+result and report caches only help as much as they would with real traffic.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+ENDPOINTS = {
+    "calculate": "/api/calculate-scholarships",
+    "submit-lead": "/api/submit-lead",
+    "send-email": "/api/send-email",
+}
+RATE_LIMIT_POLICIES = [
+    "calculate",
+    "submit-lead-ip",
+    "submit-lead-email",
+    "email-status-ip",
+    "send-email-ip",
+    "send-email-recipient",
+]
+COUNTRIES = ["USA", "UK", "Canada", "Germany", "Australia", "Netherlands"]
+MAJORS = ["Computer Science", "Mechanical Engineering", "Business Analytics", "Public Health", "Economics"]
+DEGREES = ["Masters", "PhD", "MBA", "Undergrad"]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _generate_private_key() -> str:
+    try:
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import rsa
+    except ImportError:
+        # google-auth always brings in the pure-Python rsa package.
+        import rsa as pure_rsa
+
+        _, private_key = pure_rsa.newkeys(2048)
+        return private_key.save_pkcs1().decode("ascii")
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode("ascii")
+
+
+def _provider_answer(scholarships: int) -> str:
+    return json.dumps(
+        {
+            "summary_probability": 72,
+            "scholarships": [
+                {
+                    "name": f"Stub Global Excellence Scholarship {index}",
+                    "amount": f"Up to USD {10000 + index * 2500:,} per year",
+                    "deadline": f"2099-{(index % 12) + 1:02d}-15",
+                    "match_score": 92 - index * 3,
+                    "one_liner_reason": "Matches your degree level, destination and academic profile.",
+                    "strategy_tip": "Lead with measurable impact and tie your goals to the programme.",
+                }
+                for index in range(scholarships)
+            ],
+        }
+    )
+
+
+class StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, handler, latency: float, jitter: float, **state) -> None:
+        super().__init__(("127.0.0.1", 0), handler)
+        self.latency = latency
+        self.jitter = jitter
+        self.state = state
+        self.counts: dict[str, int] = {}
+        self.counts_lock = threading.Lock()
+
+    def delay(self) -> None:
+        if self.latency > 0:
+            time.sleep(self.latency * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+    def count(self, name: str, amount: int = 1) -> None:
+        with self.counts_lock:
+            self.counts[name] = self.counts.get(name, 0) + amount
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def read_json(self):
+        length = int(self.headers.get("content-length") or 0)
+        body = self.rfile.read(length) if length else b""
+        try:
+            return json.loads(body or b"{}")
+        except json.JSONDecodeError:
+            return {}
+
+    def send_json(self, payload, status: int = 200) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class OpenRouterStub(StubHandler):
+    def do_POST(self) -> None:
+        request = self.read_json()
+        self.server.count("completions")
+        self.server.delay()
+        answer = self.server.state["answer"]
+        if not request.get("stream"):
+            self.send_json({"choices": [{"message": {"content": answer}}]})
+            return
+
+        self.send_response(200)
+        self.send_header("content-type", "text/event-stream")
+        self.send_header("transfer-encoding", "chunked")
+        self.end_headers()
+        for start in range(0, len(answer), 64):
+            event = "data: " + json.dumps({"choices": [{"delta": {"content": answer[start:start + 64]}}]}) + "\n\n"
+            self.write_chunk(event.encode("utf-8"))
+        self.write_chunk(b"data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def write_chunk(self, data: bytes) -> None:
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+
+class GoogleStub(StubHandler):
+    """OAuth token endpoint, Sheets values.append and the Apps Script webhook."""
+
+    def do_POST(self) -> None:
+        payload = self.read_json()
+        if self.path.startswith("/token"):
+            self.server.count("token")
+            self.send_json({"access_token": "stub-token", "expires_in": 3600, "token_type": "Bearer"})
+            return
+
+        self.server.delay()
+        if self.path.startswith("/apps-script"):
+            self.server.count("apps_script")
+            self.send_json({"success": True})
+            return
+
+        rows = len(payload.get("values") or [])
+        self.server.count("append")
+        self.server.count("rows", rows)
+        self.send_json({"updates": {"updatedRows": rows}})
+
+
+class SMTPStub:
+    """Accepts any login and message; replies to DATA after the configured latency."""
+
+    def __init__(self, latency: float, jitter: float) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.messages = 0
+        self.sessions = 0
+        self.port = _free_port()
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+
+    def start(self) -> None:
+        threading.Thread(target=self._run, name="smtp-stub", daemon=True).start()
+        self._ready.wait()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(asyncio.start_server(self._session, "127.0.0.1", self.port))
+        self._ready.set()
+        self._loop.run_forever()
+
+    async def _session(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.sessions += 1
+        writer.write(b"220 stub ESMTP\r\n")
+        try:
+            while line := await reader.readline():
+                command = line[:4].upper()
+                if command == b"EHLO":
+                    writer.write(b"250-stub\r\n250-8BITMIME\r\n250 AUTH PLAIN LOGIN\r\n")
+                elif command == b"AUTH":
+                    writer.write(b"235 2.7.0 Authentication successful\r\n")
+                elif command == b"DATA":
+                    writer.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                    await writer.drain()
+                    while (await reader.readline()) not in (b".\r\n", b""):
+                        pass
+                    if self.latency > 0:
+                        await asyncio.sleep(self.latency * random.uniform(1 - self.jitter, 1 + self.jitter))
+                    self.messages += 1
+                    writer.write(b"250 2.0.0 Queued\r\n")
+                elif command == b"QUIT":
+                    writer.write(b"221 Bye\r\n")
+                    break
+                else:
+                    writer.write(b"250 OK\r\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+def start_stubs(args) -> tuple[StubHTTPServer, StubHTTPServer, SMTPStub]:
+    openrouter = StubHTTPServer(
+        OpenRouterStub,
+        args.provider_latency,
+        args.jitter,
+        answer=_provider_answer(args.scholarships),
+    )
+    google = StubHTTPServer(GoogleStub, args.sheets_latency, args.jitter)
+    for server in (openrouter, google):
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    smtp = SMTPStub(args.smtp_latency, args.jitter)
+    smtp.start()
+    return openrouter, google, smtp
+
+
+def app_environment(args, openrouter: StubHTTPServer, google: StubHTTPServer, smtp: SMTPStub) -> dict[str, str]:
+    unlimited = {name: "1000000000/60" for name in RATE_LIMIT_POLICIES}
+    env = {
+        **os.environ,
+        "API_KEY": "stub-key",
+        "OPENROUTER_MODEL": "stub/model",
+        "OPENROUTER_BASE_URL": openrouter.url,
+        "GOOGLE_API_KEY": "",
+        "SMTP_USER": "bench@example.com",
+        "SMTP_PASSWORD": "stub-password",
+        "SMTP_HOST": "127.0.0.1",
+        "SMTP_PORT": str(smtp.port),
+        "SMTP_STARTTLS": "false",
+        "RATE_LIMIT_POLICIES": json.dumps(unlimited),
+        "ALLOW_LOCAL_BACKUP": "false",
+        "GOOGLE_SHEETS_ID": "",
+        "GOOGLE_SERVICE_ACCOUNT_EMAIL": "",
+        "GOOGLE_PRIVATE_KEY": "",
+        "GOOGLE_APPS_SCRIPT_URL": "",
+    }
+    if args.sheets == "api":
+        env.update(
+            {
+                "GOOGLE_SHEETS_ID": "stub-sheet",
+                "GOOGLE_SERVICE_ACCOUNT_EMAIL": "bench@stub.iam.gserviceaccount.com",
+                "GOOGLE_PRIVATE_KEY": _generate_private_key(),
+                "GOOGLE_OAUTH_TOKEN_URI": f"{google.url}/token",
+                "GOOGLE_SHEETS_API_ENDPOINT": f"{google.url}/",
+            }
+        )
+    else:
+        env["GOOGLE_APPS_SCRIPT_URL"] = f"{google.url}/apps-script"
+    for assignment in args.env:
+        name, _, value = assignment.partition("=")
+        env[name] = value
+    return env
+
+
+def start_app(args, env: dict[str, str]) -> tuple[subprocess.Popen, str]:
+    port = _free_port()
+    output = open(args.app_log, "ab") if args.app_log else subprocess.DEVNULL
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1",
+            "--port", str(port),
+            "--workers", str(args.workers),
+            "--log-level", "warning",
+        ],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=output,
+        stderr=output,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"App exited with status {process.returncode} before becoming ready")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return process, base_url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise SystemExit("App did not become ready within 60s")
+
+
+def build_profile(index: int, distinct: int) -> dict:
+    seed = index % distinct if distinct else index
+    return {
+        "degree_level": DEGREES[seed % len(DEGREES)],
+        "current_degree": "Bachelors",
+        "gpa": round(6 + (seed % 40) / 10, 1),
+        "gpa_scale": "10",
+        "nationality": "India",
+        "target_countries": [COUNTRIES[seed % len(COUNTRIES)], COUNTRIES[(seed // 7) % len(COUNTRIES)]],
+        "intended_intake": "Fall 2027",
+        "major": f"{MAJORS[seed % len(MAJORS)]} {seed}",
+        "work_experience_years": seed % 5,
+        "profile_highlight": "Led a campus robotics team to a national final",
+    }
+
+
+def build_request(endpoint: str, index: int, args) -> dict:
+    profile = build_profile(index, args.profiles)
+    if endpoint == "calculate":
+        return profile
+
+    results = json.loads(_provider_answer(args.scholarships))
+    name = f"Load Test Student {index}"
+    email = f"student{index}@example.com"
+    if endpoint == "submit-lead":
+        return {
+            "name": name,
+            "email": email,
+            "phone": "+91 98765 43210",
+            "user_profile": profile,
+            "scholarship_results": results,
+        }
+    return {
+        "recipient_email": email,
+        "recipient_name": name,
+        "scholarship_results": results,
+        "profile_highlight": profile["profile_highlight"],
+    }
+
+
+async def drive(client: httpx.AsyncClient, endpoint: str, args) -> dict:
+    path = ENDPOINTS[endpoint]
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+    failures = 0
+    counter = iter(range(args.requests))
+
+    async def worker() -> None:
+        nonlocal failures
+        for index in counter:
+            payload = build_request(endpoint, index, args)
+            started = time.perf_counter()
+            try:
+                response = await client.post(path, json=payload)
+            except httpx.HTTPError:
+                failures += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    for index in range(min(args.warmup, args.requests)):
+        await client.post(path, json=build_request(endpoint, args.requests + index, args))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    return summarize(endpoint, latencies, statuses, failures, elapsed)
+
+
+def summarize(endpoint: str, latencies: list[float], statuses: dict[int, int], failures: int, elapsed: float) -> dict:
+    summary = {
+        "endpoint": endpoint,
+        "requests": len(latencies) + failures,
+        "errors": failures + sum(count for status, count in statuses.items() if status >= 400),
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+    }
+    if len(latencies) >= 2:
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+        summary.update(
+            {
+                "p50_ms": round(cuts[49] * 1000, 2),
+                "p95_ms": round(cuts[94] * 1000, 2),
+                "p99_ms": round(cuts[98] * 1000, 2),
+                "max_ms": round(max(latencies) * 1000, 2),
+            }
+        )
+    return summary
+
+
+def print_report(results: list[dict]) -> None:
+    print(f"{'endpoint':<12} {'requests':>8} {'errors':>6} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for result in results:
+        print(
+            f"{result['endpoint']:<12} {result['requests']:>8} {result['errors']:>6} {result['throughput_rps']:>9.1f} "
+            f"{result.get('p50_ms', 0):>9.1f} {result.get('p95_ms', 0):>9.1f} "
+            f"{result.get('p99_ms', 0):>9.1f} {result.get('max_ms', 0):>9.1f}"
+        )
+        unexpected = {status: count for status, count in result["statuses"].items() if status[0] != "2"}
+        if unexpected:
+            print(f"{'':<12} non-2xx responses: {unexpected}")
+
+
+async def run(args, base_url: str) -> list[dict]:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        return [await drive(client, endpoint, args) for endpoint in args.endpoints]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoints", nargs="+", choices=list(ENDPOINTS), default=list(ENDPOINTS))
+    parser.add_argument("--requests", type=int, default=200, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=5, help="untimed requests per endpoint")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument(
+        "--profiles",
+        type=int,
+        default=0,
+        help="cycle through this many distinct profiles (0: every request is distinct)",
+    )
+    parser.add_argument("--scholarships", type=int, default=6, help="scholarships per provider answer")
+    parser.add_argument("--provider-latency", type=float, default=0.5, help="OpenRouter stub latency (s)")
+    parser.add_argument("--sheets-latency", type=float, default=0.15, help="Sheets/Apps Script stub latency (s)")
+    parser.add_argument("--smtp-latency", type=float, default=0.1, help="SMTP stub DATA latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.2, help="latency jitter as a fraction (+/-)")
+    parser.add_argument("--sheets", choices=["api", "apps-script"], default="api", help="lead storage path to stub")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--base-url", help="load-test an already running app instead of starting one")
+    parser.add_argument("--app-log", type=Path, help="append the app's log output to this file")
+    parser.add_argument("--env", action="append", default=[], metavar="NAME=VALUE", help="extra app setting")
+    parser.add_argument("--json", type=Path, help="also write the results to this file")
+    args = parser.parse_args()
+
+    process = None
+    if args.base_url:
+        base_url = args.base_url.rstrip("/")
+        stubs = None
+    else:
+        stubs = start_stubs(args)
+        process, base_url = start_app(args, app_environment(args, *stubs))
+
+    try:
+        print(
+            f"{args.requests} requests/endpoint at concurrency {args.concurrency}; stub latency "
+            f"provider={args.provider_latency}s sheets={args.sheets_latency}s smtp={args.smtp_latency}s"
+        )
+        results = asyncio.run(run(args, base_url))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+
+    print_report(results)
+    if stubs is not None:
+        openrouter, google, smtp = stubs
+        print(
+            f"stub calls: completions={openrouter.counts.get('completions', 0)} "
+            f"sheets_appends={google.counts.get('append', 0)} sheets_rows={google.counts.get('rows', 0)} "
+            f"apps_script={google.counts.get('apps_script', 0)} smtp_messages={smtp.messages} "
+            f"smtp_sessions={smtp.sessions}"
+        )
+    if args.json:
+        args.json.write_text(json.dumps({"arguments": {name: str(value) if isinstance(value, Path) else value for name, value in vars(args).items()}, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
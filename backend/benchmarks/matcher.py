@@ -0,0 +1,265 @@
+"""
+Microbenchmarks for the per-request GeminiService helpers and the local matcher.
+
+    python benchmarks/matcher.py
+    python benchmarks/matcher.py --sizes 15 1000 --save baseline.json
+    python benchmarks/matcher.py --compare baseline.json
+
+Covers _normalize_user_profile, _build_prompt and _score_major_match for a range of
+profile shapes, _parse_result for provider answers of several sizes, and
+_score_local_match, catalog indexing and the full local matcher over synthetic
+catalogs. Catalogs are built from the shipped scholarships.json: size 15 is that file
+with its deadlines moved into the future, larger sizes vary its entries' country,
+majors, GPA cutoff, tests and deadline. Every benchmark reports the best mean time per
+call over --repeat runs. --save writes the timings to a JSON baseline and --compare
+prints each timing against one.
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import timeit
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+for name, value in {
+    "SMTP_USER": "bench@example.com",
+    "SMTP_PASSWORD": "",
+    "SMTP_HOST": "localhost",
+    "SMTP_PORT": "25",
+}.items():
+    os.environ.setdefault(name, value)
+
+from app.services.gemini_service import (  # noqa: E402
+    SCHOLARSHIP_DATA_PATH,
+    GeminiService,
+    scholarship_catalog,
+)
+from app.services.scholarship_catalog import CatalogSnapshot  # noqa: E402
+
+COUNTRIES = ["USA", "UK", "Canada", "Germany", "Australia", "Japan", "Singapore", "India", "Anywhere"]
+MAJORS = [
+    "Computer Science", "Engineering", "Mechanical Engineering", "Business", "Economics",
+    "Law", "Public Health", "Data Science", "Physics", "Architecture", "Any",
+]
+TESTS = [{}, {"ielts": 6.5}, {"toefl": 100}, {"gre": 310}, {"gmat": 600, "ielts": 7.0}]
+
+PROFILE_SHAPES = {
+    "minimal": {
+        "degree_level": "Masters",
+        "gpa": 8.1,
+        "gpa_scale": "10",
+        "target_countries": ["UK"],
+        "major": "Computer Science",
+        "profile_highlight": "",
+    },
+    "typical": {
+        "degree_level": "Masters",
+        "current_degree": "B.Tech",
+        "gpa": 8.4,
+        "gpa_scale": "10",
+        "nationality": "India",
+        "target_countries": ["USA", "UK", "Germany"],
+        "intended_intake": "Fall 2027",
+        "major": "Mechanical Engineering",
+        "english_test_type": "IELTS",
+        "english_test_score": 7.5,
+        "work_experience_years": 2,
+        "profile_highlight": "Published a paper on battery thermal management",
+    },
+    "heavy": {
+        "degree_level": "PhD",
+        "current_degree": "M.Sc Physics",
+        "gpa": 91,
+        "gpa_scale": "100",
+        "nationality": "India",
+        "target_countries": ["USA", "UK", "Canada", "Germany", "Australia", "Japan", "Singapore"],
+        "intended_intake": "Spring 2028",
+        "major": "Computational Physics and Machine Learning",
+        "test_scores": {"gre": 328, "toefl": 112, "gmat": 700},
+        "english_test_type": "TOEFL",
+        "english_test_score": 112,
+        "work_experience_years": 4,
+        "profile_highlight": "Three first-author papers, national olympiad medallist, led a 12-person lab team " * 4,
+    },
+    "no-countries": {
+        "degree_level": "MBA",
+        "gpa": 3.4,
+        "gpa_scale": "4",
+        "target_countries": [],
+        "major": "Business",
+        "work_experience_years": 5,
+        "profile_highlight": "Founded a logistics startup",
+    },
+}
+
+
+def build_catalog(size: int, seed: int = 7) -> list[dict]:
+    with open(SCHOLARSHIP_DATA_PATH, "r", encoding="utf-8") as file:
+        shipped = json.load(file)
+    items = []
+    for position, item in enumerate(shipped[:size]):
+        items.append({**item, "deadline": f"2099-{position % 12 + 1:02d}-15"})
+
+    rng = random.Random(seed)
+    while len(items) < size:
+        base = shipped[len(items) % len(shipped)]
+        index = len(items)
+        items.append(
+            {
+                **base,
+                "id": index + 1,
+                "name": f"{base['name']} #{index}",
+                "country": rng.choice(COUNTRIES),
+                "majors": rng.sample(MAJORS, rng.randint(1, 4)),
+                "minGPAPercentage": rng.randrange(50, 90),
+                "testScores": rng.choice(TESTS),
+                "workExperienceRequired": rng.choice([0, 0, 0, 1, 2]),
+                "deadline": rng.choice(
+                    [f"2099-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}", "Rolling", "TBA"]
+                ),
+            }
+        )
+    return items
+
+
+def provider_answer(scholarships: int, fenced: bool) -> str:
+    answer = json.dumps(
+        {
+            "summary_probability": 68,
+            "scholarships": [
+                {
+                    "name": f"Global Excellence Scholarship {index}",
+                    "amount": f"Up to USD {10000 + index * 1500:,} per year",
+                    "deadline": f"2099-{index % 12 + 1:02d}-15",
+                    "match_score": 95 - index,
+                    "one_liner_reason": "Matches your degree level, destination and academic profile.",
+                    "strategy_tip": "Lead with measurable research impact and name two target supervisors.",
+                }
+                for index in range(scholarships)
+            ],
+        },
+        indent=2,
+    )
+    return f"```json\n{answer}\n```" if fenced else answer
+
+
+class Runner:
+    def __init__(self, repeat: int, min_time: float, only: str | None) -> None:
+        self.repeat = repeat
+        self.min_time = min_time
+        self.only = only
+        self.results: dict[str, float] = {}
+
+    def bench(self, name: str, function) -> None:
+        if self.only and self.only not in name:
+            return
+        timer = timeit.Timer(function)
+        number = 1
+        while True:
+            elapsed = timer.timeit(number)
+            if elapsed >= self.min_time or number >= 1_000_000:
+                break
+            number *= 10 if elapsed < self.min_time / 10 else 2
+        best = min([elapsed] + timer.repeat(self.repeat - 1, number)) / number
+        self.results[name] = best
+        print(f"{name:<48} {_format_time(best):>12}", flush=True)
+
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def run(runner: Runner, sizes: list[int]) -> None:
+    normalize = GeminiService._normalize_user_profile
+    profiles = {shape: normalize(raw) for shape, raw in PROFILE_SHAPES.items()}
+
+    for shape, raw in PROFILE_SHAPES.items():
+        runner.bench(f"normalize_user_profile[{shape}]", lambda raw=raw: normalize(raw))
+    for shape, profile in profiles.items():
+        runner.bench(f"build_prompt[{shape}]", lambda profile=profile: GeminiService._build_prompt(profile))
+
+    scholarship_majors = [major.lower() for major in MAJORS if major != "Any"]
+    for shape, profile in profiles.items():
+        major = str(profile.major).strip().lower()
+        runner.bench(
+            f"score_major_match[{shape}]",
+            lambda major=major: GeminiService._score_major_match(major, scholarship_majors),
+        )
+
+    for count in (5, 10, 25):
+        for fenced in (False, True):
+            text = provider_answer(count, fenced)
+            label = f"{count}{',fenced' if fenced else ''}"
+            runner.bench(f"parse_result[{label}]", lambda text=text: GeminiService._parse_result(text))
+
+    normalize_degree = GeminiService._normalize_degree_level
+    original_snapshot = scholarship_catalog.snapshot
+    try:
+        for size in sizes:
+            items = build_catalog(size)
+            runner.bench(f"catalog_snapshot[{size}]", lambda items=items: CatalogSnapshot(items, normalize_degree, 0.0))
+
+            snapshot = CatalogSnapshot(items, normalize_degree, 0.0)
+            typical = profiles["typical"]
+            runner.bench(
+                f"score_local_match[{size}]",
+                lambda: [GeminiService._score_local_match(item, typical) for item in items],
+            )
+
+            scholarship_catalog.snapshot = lambda snapshot=snapshot: snapshot
+            for shape in ("typical", "no-countries"):
+                profile = profiles[shape]
+                runner.bench(
+                    f"local_matcher[{size},{shape}]",
+                    lambda profile=profile: GeminiService._get_local_fallback_result(profile),
+                )
+    finally:
+        scholarship_catalog.snapshot = original_snapshot
+
+
+def compare(results: dict[str, float], baseline_path: Path) -> None:
+    baseline = json.loads(baseline_path.read_text())["results"]
+    print(f"\n{'benchmark':<48} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        print(
+            f"{name:<48} {_format_time(previous):>12} {_format_time(current):>12} "
+            f"{(current / previous - 1) * 100:>+7.1f}%"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[15, 1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5, help="report the best of this many runs")
+    parser.add_argument("--min-time", type=float, default=0.2, help="minimum seconds per timed run")
+    parser.add_argument("--only", help="run only benchmarks whose name contains this text")
+    parser.add_argument("--save", type=Path, help="write the timings to this baseline file")
+    parser.add_argument("--compare", type=Path, help="compare the timings against this baseline file")
+    args = parser.parse_args()
+
+    # The matcher logs every call; keep the output to the timings.
+    logging.disable(logging.WARNING)
+
+    runner = Runner(max(1, args.repeat), args.min_time, args.only)
+    run(runner, args.sizes)
+
+    if args.save:
+        args.save.write_text(json.dumps({"sizes": args.sizes, "results": runner.results}, indent=2))
+        print(f"\nSaved {len(runner.results)} timings to {args.save}")
+    if args.compare:
+        compare(runner.results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Measure scholarship PDF rendering throughput.
+
+    python benchmarks/pdf_render.py --reports 200 --scholarships 8
+    python benchmarks/pdf_render.py --baseline-rev <git-rev>
+
+With --baseline-rev, the EmailService from that revision is loaded alongside the
+current one and both are timed on the same reports.
+"""
+import argparse
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+for name, value in {
+    "SMTP_USER": "bench@example.com",
+    "SMTP_PASSWORD": "",
+    "SMTP_HOST": "localhost",
+    "SMTP_PORT": "25",
+}.items():
+    os.environ.setdefault(name, value)
+
+from app.models import ScholarshipResult  # noqa: E402
+from app.services.email_service import EmailService  # noqa: E402
+
+COUNTRIES = ["USA", "UK", "Canada", "Germany", "Australia", "Netherlands"]
+
+
+def build_report(seed: int, scholarships: int) -> ScholarshipResult:
+    entries = []
+    for index in range(scholarships):
+        country = COUNTRIES[(seed + index) % len(COUNTRIES)]
+        score = 95 - (seed + index * 7) % 45
+        entries.append(
+            {
+                "name": f"{country} Graduate Excellence Scholarship {seed}-{index}",
+                "amount": f"Up to GBP {10000 + index * 2500:,} per year plus tuition",
+                "deadline": f"2030-{(index % 12) + 1:02d}-15",
+                "match_score": score,
+                "one_liner_reason": (
+                    f"This is a {score}% match because it matches your target destination, your degree "
+                    "level is eligible, your academics clear the typical cutoff, your major is closely aligned."
+                ),
+                "strategy_tip": (
+                    "Prepare a focused statement of purpose tied to impact and leadership, highlight your "
+                    "strongest achievement early in the application, and prioritize applications that fit "
+                    "your Fall 2027 intake plan."
+                ),
+            }
+        )
+    return ScholarshipResult(summary_probability=40 + seed % 50, scholarships=entries)
+
+
+def load_baseline(revision: str):
+    source = subprocess.run(
+        ["git", "show", f"{revision}:backend/app/services/email_service.py"],
+        cwd=BACKEND_DIR,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False) as file:
+        file.write(source)
+    spec = importlib.util.spec_from_file_location("baseline_email_service", file.name)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    os.unlink(file.name)
+    return module.EmailService
+
+
+def measure(label: str, service, reports: list[ScholarshipResult], repeat: int) -> float:
+    service._generate_pdf_report("Warm Up", reports[0])
+    best = 0.0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for report in reports:
+            service._generate_pdf_report("Benchmark Student", report)
+        best = max(best, len(reports) / (time.perf_counter() - started))
+    print(f"{label:<10} {best:8.1f} reports/s  ({1000 / best:.1f} ms/report)")
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reports", type=int, default=100)
+    parser.add_argument("--scholarships", type=int, default=8, help="scholarships per report")
+    parser.add_argument("--repeat", type=int, default=3, help="report the best of this many runs")
+    parser.add_argument("--baseline-rev", help="git revision whose EmailService to compare against")
+    args = parser.parse_args()
+
+    reports = [build_report(seed, args.scholarships) for seed in range(args.reports)]
+    print(f"{args.reports} reports x {args.scholarships} scholarships, best of {args.repeat}")
+
+    current = measure("current", EmailService, reports, args.repeat)
+    if args.baseline_rev:
+        baseline = measure("baseline", load_baseline(args.baseline_rev), reports, args.repeat)
+        print(f"speedup    {current / baseline:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
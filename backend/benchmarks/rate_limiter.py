@@ -0,0 +1,72 @@
+"""
+Measure in-memory rate limiter check() throughput under thread concurrency.
+
+    python benchmarks/rate_limiter.py --checks 200000 --shards 1 16
+
+Each thread calls check() on keys drawn from a pool of client keys, the way the
+threadpool running sync endpoints does. Every shard count is measured at 1 to 64
+threads (or --threads).
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+for name, value in {
+    "SMTP_USER": "bench@example.com",
+    "SMTP_PASSWORD": "",
+    "SMTP_HOST": "localhost",
+    "SMTP_PORT": "25",
+}.items():
+    os.environ.setdefault(name, value)
+
+from app.services.rate_limiter import InMemoryRateLimiter  # noqa: E402
+
+
+def measure(shards: int, threads: int, checks: int, keys: list[str], algorithm: str) -> float:
+    limiter = InMemoryRateLimiter(algorithm, gc_interval_seconds=60.0, max_keys=len(keys) * 2, shards=shards)
+    per_thread = checks // threads
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(offset: int) -> None:
+        check = limiter.check
+        key_count = len(keys)
+        barrier.wait()
+        for index in range(per_thread):
+            check(keys[(offset + index * 7) % key_count], 20, 60)
+
+    workers = [threading.Thread(target=worker, args=(offset * 997,)) for offset in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    limiter.close()
+    return per_thread * threads / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--checks", type=int, default=200_000, help="total check() calls per run")
+    parser.add_argument("--keys", type=int, default=10_000, help="distinct client keys")
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 16])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64])
+    parser.add_argument("--algorithm", default="sliding_log")
+    args = parser.parse_args()
+
+    keys = [f"calculate:10.0.{index // 256}.{index % 256}" for index in range(args.keys)]
+    print(f"{args.checks} checks over {args.keys} keys, algorithm={args.algorithm}")
+    print("threads " + "".join(f"{f'shards={shards}':>16}" for shards in args.shards))
+    for threads in args.threads:
+        rates = [measure(shards, threads, args.checks, keys, args.algorithm) for shards in args.shards]
+        print(f"{threads:>7} " + "".join(f"{rate:>12,.0f} /s " for rate in rates))
+
+
+if __name__ == "__main__":
+    main()
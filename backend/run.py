@@ -26,7 +26,11 @@ def run_server():
         reload=False,
         log_level="info",
         access_log=True,
-        lifespan="off"  # Disable lifespan events
+        # The app lifespan opens the outbound HTTP client, preloads the scholarship
+        # catalog and starts the report render pool, email outbox and archetype
+        # refresher; on shutdown it drains the lead writer and closes the lead
+        # journal, SMTP pool, render pool, rate limiter and HTTP client.
+        lifespan="on"
     )
     server = uvicorn.Server(config)
     asyncio.run(server.serve())
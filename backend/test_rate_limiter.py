@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+"""Test the rate-limit algorithms, route policies and 429 responses"""
+
+import asyncio
+import math
+import os
+import random
+import sys
+
+for name, value in {
+    "SMTP_USER": "test@example.com",
+    "SMTP_PASSWORD": "",
+    "SMTP_HOST": "localhost",
+    "SMTP_PORT": "25",
+}.items():
+    os.environ.setdefault(name, value)
+
+import httpx
+
+from app.config import Settings, settings
+from app.services import rate_limiter as limiter_module
+from app.services.rate_limiter import (
+    ALGORITHMS,
+    InMemoryRateLimiter,
+    gcra,
+    load_policies,
+    parse_policy,
+    sliding_window,
+    token_bucket,
+)
+
+LIMIT = 5
+WINDOW = 10.0
+INTERVAL = WINDOW / LIMIT
+
+
+class Key:
+    """Runs one key's state through an algorithm."""
+
+    def __init__(self, algorithm):
+        self.algorithm = algorithm
+        self.state = None
+
+    def hit(self, now, limit=LIMIT, window=WINDOW):
+        self.state, result, _ = self.algorithm(self.state, now, limit, window)
+        return result
+
+
+def _burst(algorithm, now=0.0):
+    key = Key(algorithm)
+    allowed = 0
+    while key.hit(now).allowed:
+        allowed += 1
+        assert allowed <= LIMIT, f"{algorithm.__name__} allowed more than {LIMIT} at once"
+    return key, allowed
+
+
+def test_burst_size_is_the_limit():
+    for name, algorithm in ALGORITHMS.items():
+        _, allowed = _burst(algorithm)
+        assert allowed == LIMIT, f"{name} allowed a burst of {allowed}"
+
+
+def test_gcra_and_token_bucket_refill_one_request_per_interval():
+    for algorithm in (gcra, token_bucket):
+        key, _ = _burst(algorithm)
+        for step in range(1, 4):
+            now = step * INTERVAL
+            assert not key.hit(now - 0.01).allowed, f"{algorithm.__name__} refilled early at {now - 0.01}"
+            assert key.hit(now).allowed, f"{algorithm.__name__} did not refill at {now}"
+            assert not key.hit(now).allowed, f"{algorithm.__name__} refilled two requests at {now}"
+
+
+def test_retry_after_is_exact():
+    for name, algorithm in ALGORITHMS.items():
+        key, _ = _burst(algorithm, now=1.0)
+        denied = key.hit(1.5)
+        assert not denied.allowed and denied.retry_after > 0
+        retry_at = 1.5 + denied.retry_after
+        assert not key.hit(retry_at - 1e-6).allowed, f"{name}: allowed before retry_after"
+        assert key.hit(retry_at + 1e-9).allowed, f"{name}: still limited at retry_after ({denied.retry_after})"
+
+
+def test_gcra_and_token_bucket_make_identical_decisions():
+    rng = random.Random(3)
+    gcra_key, bucket_key = Key(gcra), Key(token_bucket)
+    now = 0.0
+    for _ in range(2000):
+        # Steps exactly representable as floats, so both clocks stay exact.
+        now += rng.choice([0.0, 0.25, 0.5, INTERVAL, 3 * INTERVAL])
+        left, right = gcra_key.hit(now), bucket_key.hit(now)
+        assert left.allowed == right.allowed and left.remaining == right.remaining, (now, left, right)
+        assert math.isclose(left.retry_after, right.retry_after, abs_tol=1e-9), (now, left, right)
+
+
+def test_sliding_window_weights_the_previous_window():
+    key, _ = _burst(sliding_window)
+    # Halfway through the next window the full previous window still counts for half.
+    now = WINDOW * 1.5
+    allowed = 0
+    while key.hit(now).allowed:
+        allowed += 1
+    assert allowed == LIMIT - LIMIT // 2 - 1, allowed
+
+
+def test_remaining_counts_down():
+    for name, algorithm in ALGORITHMS.items():
+        key = Key(algorithm)
+        remaining = [key.hit(0.0).remaining for _ in range(LIMIT)]
+        assert remaining == list(range(LIMIT - 1, -1, -1)), f"{name}: {remaining}"
+
+
+def test_parse_policy():
+    assert parse_policy("20/60") == (20, 60.0)
+    for spec in ("20", "0/60", "5/0", "x/60"):
+        try:
+            parse_policy(spec)
+        except ValueError:
+            continue
+        raise AssertionError(f"{spec!r} should be rejected")
+
+
+def test_env_override_replaces_only_its_own_policy():
+    defaults = Settings.model_fields["rate_limit_policies"].default
+    os.environ["RATE_LIMIT_POLICIES"] = '{"calculate": "30/120"}'
+    try:
+        overridden = Settings().rate_limit_policies
+    finally:
+        del os.environ["RATE_LIMIT_POLICIES"]
+
+    original = settings.rate_limit_policies
+    settings.rate_limit_policies = overridden
+    try:
+        policies = load_policies()
+    finally:
+        settings.rate_limit_policies = original
+
+    assert policies["calculate"] == (30, 120.0)
+    for name, spec in defaults.items():
+        if name != "calculate":
+            assert policies[name] == parse_policy(spec), name
+
+
+def test_429_carries_retry_after_and_rate_limit_headers():
+    from app.main import app
+
+    limit, _ = limiter_module.rate_limit_policies["email-status-ip"]
+    original = limiter_module.rate_limiter
+    limiter = InMemoryRateLimiter("sliding_log", gc_interval_seconds=60, max_keys=1000)
+
+    async def run():
+        transport = httpx.ASGITransport(app=app, client=("198.51.100.20", 5555))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            responses = [await client.get("/api/email-status/missing") for _ in range(limit + 1)]
+        return responses
+
+    _swap_limiter(limiter)
+    try:
+        responses = asyncio.run(run())
+    finally:
+        _swap_limiter(original)
+
+    assert [response.status_code for response in responses[:limit]] == [404] * limit
+    assert responses[limit - 1].headers["X-RateLimit-Remaining"] == "0"
+    limited = responses[limit]
+    assert limited.status_code == 429
+    assert int(limited.headers["Retry-After"]) >= 1
+    assert limited.headers["X-RateLimit-Limit"] == str(limit)
+    assert limited.headers["X-RateLimit-Remaining"] == "0"
+    assert int(limited.headers["X-RateLimit-Reset"]) >= int(limited.headers["Retry-After"])
+
+
+def test_malformed_requests_cost_no_quota():
+    from app.main import GeminiService, app
+
+    limit, _ = limiter_module.rate_limit_policies["calculate"]
+    original = limiter_module.rate_limiter
+    limiter = InMemoryRateLimiter("sliding_log", gc_interval_seconds=60, max_keys=1000)
+    profile = {
+        "degree_level": "Masters",
+        "gpa": 8.1,
+        "gpa_scale": "10",
+        "target_countries": ["UK"],
+        "major": "Computer Science",
+        "profile_highlight": "",
+    }
+
+    async def run():
+        transport = httpx.ASGITransport(app=app, client=("198.51.100.21", 5555))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            invalid = [await client.post("/api/calculate-scholarships", json={}) for _ in range(limit + 2)]
+            valid = await client.post("/api/calculate-scholarships", json=profile)
+        return invalid, valid
+
+    async def local_only(profile):
+        return GeminiService._get_fallback_result()
+
+    get_scholarships = GeminiService.__dict__["get_scholarships"]
+    _swap_limiter(limiter)
+    # Keep the valid request offline; only its rate-limit headers matter here.
+    GeminiService.get_scholarships = staticmethod(local_only)
+    try:
+        invalid, valid = asyncio.run(run())
+    finally:
+        GeminiService.get_scholarships = get_scholarships
+        _swap_limiter(original)
+
+    assert {response.status_code for response in invalid} == {422}
+    assert valid.status_code == 200
+    assert valid.headers["X-RateLimit-Remaining"] == str(limit - 1)
+
+
+def _swap_limiter(limiter):
+    import app.main as main
+
+    limiter_module.rate_limiter = limiter
+    main.rate_limiter = limiter
+
+
+if __name__ == "__main__":
+    failed = 0
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            try:
+                test()
+                print(f"✅ {name}")
+            except Exception as e:
+                failed += 1
+                print(f"❌ {name}: {e!r}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+"""Test that request metrics time streamed responses until their last byte"""
+
+import asyncio
+import os
+import sys
+
+for name, value in {
+    "SMTP_USER": "test@example.com",
+    "SMTP_PASSWORD": "",
+    "SMTP_HOST": "localhost",
+    "SMTP_PORT": "25",
+}.items():
+    os.environ.setdefault(name, value)
+
+import httpx
+
+from app.config import Settings
+from app.main import GeminiService, app
+from app.models import Scholarship, ScholarshipResult
+from app.services.metrics import HTTP_REQUEST_SECONDS, RequestMetricsMiddleware
+
+STREAM_ROUTE = "/api/calculate-scholarships/stream"
+STEP_SECONDS = 0.1
+PROFILE = {
+    "degree_level": "Masters",
+    "gpa": 8.1,
+    "gpa_scale": "10",
+    "target_countries": ["UK"],
+    "major": "Computer Science",
+    "profile_highlight": "",
+}
+SCHOLARSHIP = Scholarship(
+    name="Streamed Scholarship",
+    amount="Full tuition",
+    deadline="2099-11-05",
+    match_score=82,
+    one_liner_reason="Strong fit",
+    strategy_tip="Apply early",
+)
+
+
+def _observed(method, route, status):
+    """Return (sum, count) recorded for one label set."""
+    state = HTTP_REQUEST_SECONDS._values.get((method, route, str(status)))
+    return (state[1], state[2]) if state else (0.0, 0)
+
+
+def test_streamed_response_is_timed_to_its_last_chunk():
+    async def slow_stream(profile):
+        for _ in range(3):
+            await asyncio.sleep(STEP_SECONDS)
+            yield "scholarship", SCHOLARSHIP
+        yield "result", ScholarshipResult(summary_probability=60, scholarships=[SCHOLARSHIP])
+
+    async def run():
+        transport = httpx.ASGITransport(app=app, client=("198.51.100.30", 5555))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(STREAM_ROUTE, json=PROFILE)
+
+    original = GeminiService.__dict__["stream_scholarships"]
+    before = _observed("POST", STREAM_ROUTE, 200)
+    GeminiService.stream_scholarships = staticmethod(slow_stream)
+    try:
+        response = asyncio.run(run())
+    finally:
+        GeminiService.stream_scholarships = original
+    total, count = _observed("POST", STREAM_ROUTE, 200)
+
+    assert response.status_code == 200 and "event: done" in response.text
+    assert count == before[1] + 1
+    assert total - before[0] >= 3 * STEP_SECONDS, f"timed {total - before[0]:.3f}s of a {3 * STEP_SECONDS}s stream"
+
+
+def test_observed_at_the_final_body_chunk():
+    timeline = []
+
+    async def streaming_app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 201, "headers": []})
+        await send({"type": "http.response.body", "body": b"a", "more_body": True})
+        await asyncio.sleep(STEP_SECONDS)
+        await send({"type": "http.response.body", "body": b"b"})
+        timeline.append(("returned", _observed("GET", "unmatched", 201)[1]))
+
+    async def send(message):
+        timeline.append(("sent", message.get("more_body", False)))
+
+    before = _observed("GET", "unmatched", 201)[1]
+    scope = {"type": "http", "method": "GET", "path": "/stream", "headers": []}
+    asyncio.run(RequestMetricsMiddleware(streaming_app)(scope, None, send))
+
+    assert timeline[-1] == ("returned", before + 1), timeline
+    assert _observed("GET", "unmatched", 201)[1] == before + 1
+
+
+def test_failed_request_is_recorded_as_500():
+    async def failing_app(scope, receive, send):
+        raise RuntimeError("boom")
+
+    async def send(message):
+        pass
+
+    before = _observed("GET", "unmatched", 500)[1]
+    scope = {"type": "http", "method": "GET", "path": "/boom", "headers": []}
+    try:
+        asyncio.run(RequestMetricsMiddleware(failing_app)(scope, None, send))
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("the app's exception should propagate")
+    assert _observed("GET", "unmatched", 500)[1] == before + 1
+
+
+def test_metrics_endpoint_is_off_by_default():
+    assert Settings.model_fields["metrics_enabled"].default is False
+
+
+if __name__ == "__main__":
+    failed = 0
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            try:
+                test()
+                print(f"✅ {name}")
+            except Exception as e:
+                failed += 1
+                print(f"❌ {name}: {e!r}")
+    sys.exit(1 if failed else 0)
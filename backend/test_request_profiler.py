@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+"""Test that only allowlisted clients can switch on the request profiler"""
+
+import asyncio
+import os
+import sys
+
+for name, value in {
+    "SMTP_USER": "test@example.com",
+    "SMTP_PASSWORD": "",
+    "SMTP_HOST": "localhost",
+    "SMTP_PORT": "25",
+}.items():
+    os.environ.setdefault(name, value)
+
+from app.config import settings
+from app.services.request_profiler import RequestProfilerMiddleware, request_profiler
+
+ALLOWED_IP = "10.0.0.7"
+PROXY_IP = "172.16.0.2"
+ATTACKER_IP = "203.0.113.9"
+
+
+def _profiled(client_ip, forwarded_for=None, trusted_proxies=()):
+    """Send one request through the middleware and report whether it was profiled."""
+    profiled = []
+    original_begin = request_profiler.begin
+
+    def recording_begin(label):
+        profiled.append(label)
+        return original_begin(label)
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    headers = [(b"x-profile-request", b"1")]
+    if forwarded_for is not None:
+        headers.append((b"x-forwarded-for", forwarded_for.encode("latin-1")))
+    scope = {"type": "http", "method": "GET", "path": "/health", "headers": headers, "client": (client_ip, 5555)}
+
+    settings_before = (settings.profiling_enabled, settings.profiling_allowed_ips, settings.profiling_trusted_proxies)
+    settings.profiling_enabled = False
+    settings.profiling_allowed_ips = [ALLOWED_IP]
+    settings.profiling_trusted_proxies = list(trusted_proxies)
+    request_profiler.begin = recording_begin
+    # Keep any saved profile out of the repository.
+    request_profiler.should_keep = lambda duration: False
+    try:
+        asyncio.run(RequestProfilerMiddleware(app)(scope, receive, send))
+    finally:
+        del request_profiler.begin
+        del request_profiler.should_keep
+        settings.profiling_enabled, settings.profiling_allowed_ips, settings.profiling_trusted_proxies = settings_before
+    return bool(profiled)
+
+
+def test_allowlisted_peer_is_profiled():
+    assert _profiled(ALLOWED_IP)
+
+
+def test_spoofed_forwarded_for_is_rejected():
+    assert not _profiled(ATTACKER_IP, forwarded_for=ALLOWED_IP)
+
+
+def test_spoofed_hop_behind_trusted_proxy_is_rejected():
+    # The proxy appends the real client, so the attacker's forged hop is not the right-most one.
+    assert not _profiled(PROXY_IP, forwarded_for=f"{ALLOWED_IP}, {ATTACKER_IP}", trusted_proxies=["172.16.0.0/24"])
+
+
+def test_allowlisted_client_behind_trusted_proxy_is_profiled():
+    assert _profiled(PROXY_IP, forwarded_for=f"{ATTACKER_IP}, {ALLOWED_IP}", trusted_proxies=["172.16.0.0/24"])
+
+
+def test_forwarded_for_from_untrusted_peer_is_ignored():
+    assert not _profiled(ATTACKER_IP, forwarded_for=ALLOWED_IP, trusted_proxies=[PROXY_IP])
+
+
+if __name__ == "__main__":
+    failed = 0
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            try:
+                test()
+                print(f"✅ {name}")
+            except Exception as e:
+                failed += 1
+                print(f"❌ {name}: {e!r}")
+    sys.exit(1 if failed else 0)
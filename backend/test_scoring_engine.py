@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+"""Test that the NumPy scoring engine matches GeminiService._score_local_match exactly"""
+
+import json
+import os
+import random
+import sys
+
+for name, value in {
+    "SMTP_USER": "test@example.com",
+    "SMTP_PASSWORD": "",
+    "SMTP_HOST": "localhost",
+    "SMTP_PORT": "25",
+}.items():
+    os.environ.setdefault(name, value)
+
+from app.services.gemini_service import SCHOLARSHIP_DATA_PATH, GeminiService
+from app.services.scoring_engine import ScoringEngine
+
+COUNTRIES = ["USA", "UK", "Canada", "Germany", "Australia", "Anywhere", "Japan"]
+MAJOR_GROUPS = [
+    ["Any"],
+    ["Computer Science", "Data Science"],
+    ["Engineering"],
+    ["Mechanical Engineering", "Electrical Engineering"],
+    ["Business", "Economics", "Finance"],
+    ["Public Health"],
+    ["Law"],
+]
+TEST_REQUIREMENTS = [
+    {},
+    {"ielts": 6.5},
+    {"toefl": 100, "gre": 310},
+    {"IELTS": 7.0},
+    {"gmat": 600},
+    # Malformed and NaN minimums from hand-edited catalog entries.
+    {"ielts": "NaN"},
+    {"toefl": float("nan"), "ielts": 6.0},
+    {"gre": "n/a"},
+]
+DEADLINES = ["2099-01-15", "2099-06-30", "2099-10-31", "2099-11-15", "2099-12-01", "Rolling", "TBA", "Open soon", "soon", ""]
+DEGREES = ["Masters", "Master's", "PhD", "Bachelors", "MBA", "Undergraduate", "Postgraduate"]
+INTAKES = [None, "", "Fall 2027", "Spring 2028", "Any intake", "January 2028", "September 2027"]
+GPA_SCALES = ["10", "4", "100", None, ""]
+PROFILE_MAJORS = ["Computer Science", "Mechanical Engineering", "Business", "Finance", "History", "Public Health", ""]
+
+
+def build_catalog(rng):
+    with open(SCHOLARSHIP_DATA_PATH, "r", encoding="utf-8") as file:
+        shipped = json.load(file)
+
+    items = list(shipped)
+    for index in range(400):
+        base = shipped[index % len(shipped)]
+        item = {
+            **base,
+            "name": f"{base['name']} #{index}",
+            "country": rng.choice(COUNTRIES),
+            "majors": rng.choice(MAJOR_GROUPS),
+            "degreeLevels": rng.sample(DEGREES, rng.randint(1, 3)),
+            "minGPAPercentage": rng.choice([0, 55, 60.5, 70, 82, 95]),
+            "testScores": rng.choice(TEST_REQUIREMENTS),
+            "deadline": rng.choice(DEADLINES),
+        }
+        work = rng.choice([None, 0, 1, 3, "2"])
+        if work is None:
+            item.pop("workExperienceRequired", None)
+        else:
+            item["workExperienceRequired"] = work
+        items.append(item)
+    return items
+
+
+def random_profile(rng):
+    scale = rng.choice(GPA_SCALES)
+    gpa = {"10": rng.uniform(5, 10), "4": rng.uniform(2, 4)}.get(scale, rng.uniform(40, 100))
+    test_scores = rng.choice([{}, {"gre": 315}, {"IELTS": 6.5}, {"toefl": 95, "gmat": 650}, {"ielts": 8}])
+    return {
+        "degree_level": rng.choice(DEGREES + ["Diploma"]),
+        "gpa": round(gpa, 2),
+        "gpa_scale": scale,
+        "target_countries": rng.sample(COUNTRIES[:-1], rng.randint(0, 3)),
+        "major": rng.choice(PROFILE_MAJORS),
+        "test_scores": test_scores,
+        "english_test_type": rng.choice([None, "IELTS", "TOEFL"]),
+        "english_test_score": rng.choice([None, 6.0, 7.5, 100]),
+        "work_experience_years": rng.choice([None, 0, 1, 2, 5]),
+        "intended_intake": rng.choice(INTAKES),
+        "profile_highlight": rng.choice(["", "Published a paper"]),
+    }
+
+
+def test_engine_matches_per_item_scores():
+    rng = random.Random(20240605)
+    items = build_catalog(rng)
+    engine = ScoringEngine(items, GeminiService._normalize_degree_level)
+    positions = list(range(len(items)))
+
+    for _ in range(300):
+        profile = GeminiService._normalize_user_profile(random_profile(rng))
+        vectorized = engine.score(profile, positions, GeminiService._score_major_match).tolist()
+        expected = [GeminiService._score_local_match(item, profile) for item in items]
+        mismatches = [
+            (items[position]["name"], vectorized[position], expected[position])
+            for position in positions
+            if vectorized[position] != expected[position]
+        ]
+        assert not mismatches, f"{len(mismatches)} mismatches for {profile}: {mismatches[:3]}"
+
+
+def test_engine_scores_subsets_of_positions():
+    rng = random.Random(7)
+    items = build_catalog(rng)
+    engine = ScoringEngine(items, GeminiService._normalize_degree_level)
+    profile = GeminiService._normalize_user_profile(random_profile(rng))
+    positions = sorted(rng.sample(range(len(items)), 50))
+
+    vectorized = engine.score(profile, positions, GeminiService._score_major_match).tolist()
+    assert vectorized == [GeminiService._score_local_match(items[position], profile) for position in positions]
+    assert engine.score(profile, [], GeminiService._score_major_match).tolist() == []
+
+
+if __name__ == "__main__":
+    failed = 0
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            try:
+                test()
+                print(f"✅ {name}")
+            except Exception as e:
+                failed += 1
+                print(f"❌ {name}: {e!r}"[:2000])
+    sys.exit(1 if failed else 0)
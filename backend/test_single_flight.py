@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+"""Test that concurrent scholarship requests share provider calls only for identical profiles"""
+
+import asyncio
+import os
+import sys
+
+for name, value in {
+    "SMTP_USER": "test@example.com",
+    "SMTP_PASSWORD": "",
+    "SMTP_HOST": "localhost",
+    "SMTP_PORT": "25",
+}.items():
+    os.environ.setdefault(name, value)
+
+from app.config import settings
+from app.models import Scholarship, ScholarshipResult
+from app.services.gemini_service import GeminiService
+from app.services.result_cache import result_cache
+
+# Both GPAs fall in the same result-cache bucket.
+PROFILE_70 = {
+    "degree_level": "Masters",
+    "gpa": 70,
+    "gpa_scale": "100",
+    "target_countries": ["UK"],
+    "major": "Computer Science",
+    "profile_highlight": "",
+}
+PROFILE_71 = {**PROFILE_70, "gpa": 71}
+
+
+def _gather(profiles, provider):
+    """Run get_scholarships for profiles concurrently with provider standing in for the AI providers."""
+    calls = []
+
+    async def provider_result(profile):
+        calls.append(profile.gpa_percentage)
+        await asyncio.sleep(0.05)
+        return provider(profile)
+
+    async def run():
+        return await asyncio.gather(*(GeminiService.get_scholarships(profile) for profile in profiles))
+
+    original = GeminiService.__dict__["_get_provider_result"]
+    archetypes_before = settings.archetype_cache_enabled
+    settings.archetype_cache_enabled = False
+    GeminiService._get_provider_result = staticmethod(provider_result)
+    result_cache.clear()
+    try:
+        return asyncio.run(run()), calls
+    finally:
+        GeminiService._get_provider_result = original
+        settings.archetype_cache_enabled = archetypes_before
+        result_cache.clear()
+
+
+def _result_for(profile):
+    return ScholarshipResult(
+        summary_probability=int(profile.gpa_percentage),
+        scholarships=[
+            Scholarship(
+                name=f"Scholarship for GPA {profile.gpa_percentage:g}",
+                amount="Full tuition",
+                deadline="2099-11-05",
+                match_score=80,
+                one_liner_reason="Fits",
+                strategy_tip="Apply early",
+            )
+        ],
+    )
+
+
+def test_same_bucket_different_gpa_get_their_own_results():
+    (result_70, result_71), calls = _gather([PROFILE_70, PROFILE_71], _result_for)
+    assert sorted(calls) == [70, 71], calls
+    assert result_70.summary_probability == 70
+    assert result_71.summary_probability == 71
+
+
+def test_identical_profiles_share_one_provider_call():
+    (first, second), calls = _gather([PROFILE_70, dict(PROFILE_70)], _result_for)
+    assert calls == [70]
+    assert first == second
+    assert first is not second
+
+
+def test_local_matcher_runs_per_caller():
+    matched = []
+
+    def local_matcher(profile):
+        matched.append(profile.gpa_percentage)
+        return _result_for(profile)
+
+    original = GeminiService.__dict__["_get_local_fallback_result"]
+    GeminiService._get_local_fallback_result = staticmethod(local_matcher)
+    try:
+        (result_70, result_71), _ = _gather([PROFILE_70, PROFILE_71], lambda profile: None)
+    finally:
+        GeminiService._get_local_fallback_result = original
+    assert sorted(matched) == [70, 71], matched
+    assert (result_70.summary_probability, result_71.summary_probability) == (70, 71)
+
+
+if __name__ == "__main__":
+    failed = 0
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            try:
+                test()
+                print(f"✅ {name}")
+            except Exception as e:
+                failed += 1
+                print(f"❌ {name}: {e!r}"[:2000])
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+"""Test SMTP pool session reuse and reconnects against a local aiosmtpd server"""
+
+import os
+import smtplib
+import socket
+import sys
+from email.message import EmailMessage
+
+for name, value in {
+    "SMTP_USER": "test@example.com",
+    "SMTP_PASSWORD": "",
+    "SMTP_HOST": "localhost",
+    "SMTP_PORT": "25",
+}.items():
+    os.environ.setdefault(name, value)
+
+try:
+    from aiosmtpd.controller import Controller
+except ImportError:
+    import pytest
+
+    pytest.skip("aiosmtpd is not installed; pip install -r requirements-dev.txt", allow_module_level=True)
+
+from app.services.smtp_pool import SMTPConnectionPool
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.messages = []
+        self.drop_after_data = False
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope.content)
+        if self.drop_after_data:
+            # Accept the message, then drop the connection before the 250 reply arrives.
+            self.drop_after_data = False
+            server.transport.close()
+        return "250 Message accepted for delivery"
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _message(subject):
+    msg = EmailMessage()
+    msg["From"] = "test@example.com"
+    msg["To"] = "lead@example.com"
+    msg["Subject"] = subject
+    msg.set_content("Your scholarship report")
+    return msg
+
+
+def _pool(port):
+    pool = SMTPConnectionPool(
+        host="127.0.0.1",
+        port=port,
+        user="",
+        password="",
+        starttls=False,
+        max_size=2,
+        idle_timeout_seconds=60,
+        health_check_seconds=60,
+        timeout_seconds=5,
+    )
+    connects = []
+    original_connect = pool._connect
+
+    def counting_connect():
+        server = original_connect()
+        connects.append(server)
+        return server
+
+    pool._connect = counting_connect
+    return pool, connects
+
+
+def _run(test):
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=_free_port())
+    controller.start()
+    pool, connects = _pool(controller.port)
+    try:
+        test(pool, connects, handler)
+    finally:
+        pool.close()
+        controller.stop()
+
+
+def test_reuses_session():
+    def check(pool, connects, handler):
+        for index in range(3):
+            pool.send_message(_message(f"Report {index}"))
+        assert len(handler.messages) == 3
+        assert len(connects) == 1, f"expected one session, opened {len(connects)}"
+
+    _run(check)
+
+
+def test_reconnects_when_reused_session_dropped_before_data():
+    def check(pool, connects, handler):
+        pool.send_message(_message("First"))
+        # The idle session dies before the next send starts.
+        connects[0].sock.shutdown(socket.SHUT_RDWR)
+        pool.send_message(_message("Second"))
+        assert len(handler.messages) == 2
+        assert len(connects) == 2, f"expected a reconnect, opened {len(connects)}"
+
+    _run(check)
+
+
+def test_does_not_resend_after_data():
+    def check(pool, connects, handler):
+        pool.send_message(_message("First"))
+        handler.drop_after_data = True
+        try:
+            pool.send_message(_message("Second"))
+        except (smtplib.SMTPServerDisconnected, ConnectionError):
+            pass
+        else:
+            raise AssertionError("send should fail when the session drops during DATA")
+        assert len(handler.messages) == 2, f"message delivered {len(handler.messages) - 1} times"
+        assert len(connects) == 1, "a send that reached DATA must not be retried"
+
+    _run(check)
+
+
+if __name__ == "__main__":
+    failed = 0
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            try:
+                test()
+                print(f"✅ {name}")
+            except Exception as e:
+                failed += 1
+                print(f"❌ {name}: {e!r}")
+    sys.exit(1 if failed else 0)
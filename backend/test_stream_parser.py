@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+"""Test the incremental parser for streamed provider answers"""
+
+import json
+import os
+import sys
+
+for name, value in {
+    "SMTP_USER": "test@example.com",
+    "SMTP_PASSWORD": "",
+    "SMTP_HOST": "localhost",
+    "SMTP_PORT": "25",
+}.items():
+    os.environ.setdefault(name, value)
+
+from app.services.stream_parser import ScholarshipStreamParser
+
+SCHOLARSHIPS = [
+    {
+        "name": 'Chevening "Global" Award {UK}',
+        "amount": "Full tuition [plus stipend]",
+        "deadline": "2099-11-05",
+        "match_score": 88,
+        "one_liner_reason": "Back\\slash, comma, colon: and a é accent",
+        "strategy_tip": "Lead with leadership }]",
+    },
+    {
+        "name": "DAAD Study Scholarship",
+        "amount": "€934 per month",
+        "deadline": "2099-10-31",
+        "match_score": 75,
+        "one_liner_reason": "Strong engineering fit",
+        "strategy_tip": "Apply early",
+        "testScores": {"ielts": 6.5, "nested": [1, {"deep": "}"}]},
+    },
+]
+ANSWER = json.dumps({"summary_probability": 72, "scholarships": SCHOLARSHIPS, "note": "done"}, indent=2)
+EXPECTED = [
+    ("field", ("summary_probability", 72)),
+    ("scholarship", SCHOLARSHIPS[0]),
+    ("scholarship", SCHOLARSHIPS[1]),
+    ("field", ("note", "done")),
+]
+
+
+def _parse(chunks):
+    parser = ScholarshipStreamParser()
+    events = []
+    for chunk in chunks:
+        events.extend(parser.feed(chunk))
+    return events, parser.finished
+
+
+def test_whole_answer():
+    assert _parse([ANSWER]) == (EXPECTED, True)
+
+
+def test_every_chunk_boundary():
+    for split in range(len(ANSWER) + 1):
+        events, finished = _parse([ANSWER[:split], ANSWER[split:]])
+        assert finished and events == EXPECTED, f"split at {split}: {events}"
+
+
+def test_one_character_at_a_time():
+    assert _parse(list(ANSWER)) == (EXPECTED, True)
+
+
+def test_escaped_quotes_and_backslashes_in_strings():
+    answer = r'{"scholarships": [{"name": "A \"quoted\" }name\\", "tip": "\\\"{"}]}'
+    events, finished = _parse(list(answer))
+    assert finished
+    assert events == [("scholarship", {"name": 'A "quoted" }name\\', "tip": '\\"{'})]
+
+
+def test_markdown_fence_is_skipped():
+    fenced = f"```json\n{ANSWER}\n```\n"
+    for split in range(0, len(fenced), 7):
+        assert _parse([fenced[:split], fenced[split:]]) == (EXPECTED, True), split
+
+
+def test_fields_after_the_array():
+    answer = '{"scholarships": [{"name": "A"}], "summary_probability": 40, "flags": {"late": true}}'
+    events, _ = _parse([answer])
+    assert events == [
+        ("scholarship", {"name": "A"}),
+        ("field", ("summary_probability", 40)),
+        ("field", ("flags", {"late": True})),
+    ]
+
+
+def test_braces_in_leading_prose_are_ignored():
+    prose = "Sure {as requested}, here are the matches for {your profile}:\n```json\n"
+    answer = prose + ANSWER
+    for split in range(len(answer) + 1):
+        events, finished = _parse([answer[:split], answer[split:]])
+        assert finished and events == EXPECTED, f"split at {split}: {events}"
+
+
+def test_empty_object_after_prose():
+    assert _parse(["Nothing matched {sorry}. ", "{ }"]) == ([], True)
+
+
+def test_text_after_the_answer_is_ignored():
+    parser = ScholarshipStreamParser()
+    assert parser.feed(ANSWER) == EXPECTED
+    assert parser.finished
+    assert parser.feed('\n{"scholarships": [{"name": "late"}]}') == []
+
+
+def test_malformed_item_is_skipped():
+    answer = '{"scholarships": [{"name": "A", "score": 1.2.3}, {"name": "B"}]}'
+    events, finished = _parse([answer])
+    assert finished and events == [("scholarship", {"name": "B"})]
+
+
+if __name__ == "__main__":
+    failed = 0
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            try:
+                test()
+                print(f"✅ {name}")
+            except Exception as e:
+                failed += 1
+                print(f"❌ {name}: {e!r}"[:2000])
+    sys.exit(1 if failed else 0)
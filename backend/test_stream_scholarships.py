@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+"""Test caching and fallbacks of GeminiService.stream_scholarships"""
+
+import asyncio
+import os
+import sys
+
+for name, value in {
+    "SMTP_USER": "test@example.com",
+    "SMTP_PASSWORD": "",
+    "SMTP_HOST": "localhost",
+    "SMTP_PORT": "25",
+}.items():
+    os.environ.setdefault(name, value)
+
+from app.config import settings
+from app.models import Scholarship
+from app.services.gemini_service import GeminiService
+from app.services.result_cache import ResultCache, result_cache
+
+PROFILE = {
+    "degree_level": "Masters",
+    "gpa": 8.4,
+    "gpa_scale": "10",
+    "target_countries": ["UK", "Germany"],
+    "major": "Computer Science",
+    "profile_highlight": "",
+}
+STREAMED = Scholarship(
+    name="Streamed Scholarship",
+    amount="Full tuition",
+    deadline="2099-11-05",
+    match_score=82,
+    one_liner_reason="Strong fit",
+    strategy_tip="Apply early",
+)
+
+
+def _cache_key():
+    profile = GeminiService._normalize_user_profile(PROFILE)
+    return ResultCache.make_key(profile, settings.result_cache_gpa_bucket)
+
+
+def _local_matches():
+    return GeminiService._get_local_fallback_result(GeminiService._normalize_user_profile(PROFILE)).scholarships
+
+
+def _run_stream(provider_stream, forbidden=()):
+    """Collect stream_scholarships events with provider_stream standing in for the streamed provider."""
+    calls = []
+
+    async def stream(profile):
+        calls.append(profile)
+        async for event in provider_stream():
+            yield event
+
+    async def must_not_run(*args, **kwargs):
+        raise AssertionError("the streaming fallback must not call this")
+
+    async def collect():
+        return [event async for event in GeminiService.stream_scholarships(PROFILE)]
+
+    patched = {"_stream_scholarships_openrouter": staticmethod(stream)}
+    patched.update({name: staticmethod(must_not_run) for name in forbidden})
+    originals = {name: GeminiService.__dict__[name] for name in patched}
+    settings_before = (settings.api_key, settings.google_api_key)
+    settings.api_key, settings.google_api_key = "test-key", ""
+    result_cache.clear()
+    for name, value in patched.items():
+        setattr(GeminiService, name, value)
+    try:
+        events = asyncio.run(collect())
+    finally:
+        for name, value in originals.items():
+            setattr(GeminiService, name, value)
+        settings.api_key, settings.google_api_key = settings_before
+    return events, calls
+
+
+def test_complete_stream_is_cached():
+    async def provider_stream():
+        yield "summary_probability", 64
+        yield "scholarship", STREAMED
+        yield "complete", True
+
+    try:
+        events, _ = _run_stream(provider_stream)
+        assert events[0] == ("scholarship", STREAMED)
+        assert events[-1][0] == "result" and events[-1][1].summary_probability == 64
+        assert result_cache.get(_cache_key()) == events[-1][1]
+    finally:
+        result_cache.clear()
+
+
+def test_stream_cut_short_is_not_cached():
+    async def provider_stream():
+        yield "summary_probability", 64
+        yield "scholarship", STREAMED
+        raise ConnectionError("provider dropped the stream")
+
+    try:
+        events, calls = _run_stream(provider_stream)
+        assert [event for event, _ in events] == ["scholarship", "result"]
+        assert events[-1][1].scholarships == [STREAMED]
+        assert len(calls) == 1
+        assert result_cache.get(_cache_key()) is None, "a partial result must not be cached"
+    finally:
+        result_cache.clear()
+
+
+def test_failed_stream_falls_back_without_calling_the_provider_again():
+    async def provider_stream():
+        raise ConnectionError("provider unreachable")
+        yield
+
+    try:
+        events, calls = _run_stream(
+            provider_stream, forbidden=("_get_scholarships_openrouter", "get_scholarships")
+        )
+        assert len(calls) == 1
+        result = events[-1][1]
+        assert events[-1][0] == "result"
+        assert result.scholarships == _local_matches()
+        assert [value for event, value in events[:-1]] == result.scholarships
+    finally:
+        result_cache.clear()
+
+
+if __name__ == "__main__":
+    failed = 0
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            try:
+                test()
+                print(f"✅ {name}")
+            except Exception as e:
+                failed += 1
+                print(f"❌ {name}: {e!r}"[:2000])
+    sys.exit(1 if failed else 0)
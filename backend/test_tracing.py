@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+"""Test that server spans cover streamed responses and carry the request ID"""
+
+import asyncio
+import os
+import sys
+
+for name, value in {
+    "SMTP_USER": "test@example.com",
+    "SMTP_PASSWORD": "",
+    "SMTP_HOST": "localhost",
+    "SMTP_PORT": "25",
+}.items():
+    os.environ.setdefault(name, value)
+
+import httpx
+
+from app.main import GeminiService, app
+from app.models import Scholarship, ScholarshipResult
+from app.services.tracing import KIND_SERVER, TracingMiddleware, current_request_id, tracer
+
+STREAM_ROUTE = "/api/calculate-scholarships/stream"
+STEP_SECONDS = 0.1
+REQUEST_ID = "trace-test-1"
+PROFILE = {
+    "degree_level": "Masters",
+    "gpa": 8.1,
+    "gpa_scale": "10",
+    "target_countries": ["UK"],
+    "major": "Computer Science",
+    "profile_highlight": "",
+}
+SCHOLARSHIP = Scholarship(
+    name="Streamed Scholarship",
+    amount="Full tuition",
+    deadline="2099-11-05",
+    match_score=82,
+    one_liner_reason="Strong fit",
+    strategy_tip="Apply early",
+)
+
+
+class RecordingExporter:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span):
+        self.spans.append(span)
+
+
+def _traced(run):
+    """Run the coroutine function with spans recorded instead of exported."""
+    exporter = RecordingExporter()
+    original = tracer.exporter
+    tracer.exporter = exporter
+    try:
+        result = asyncio.run(run())
+    finally:
+        tracer.exporter = original
+    server_spans = [span for span in exporter.spans if span.kind == KIND_SERVER]
+    assert len(server_spans) == 1, server_spans
+    return result, server_spans[0]
+
+
+def test_server_span_covers_the_whole_stream():
+    async def slow_stream(profile):
+        for _ in range(3):
+            await asyncio.sleep(STEP_SECONDS)
+            yield "scholarship", SCHOLARSHIP
+        yield "result", ScholarshipResult(summary_probability=60, scholarships=[SCHOLARSHIP])
+
+    async def run():
+        transport = httpx.ASGITransport(app=app, client=("198.51.100.40", 5555))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(STREAM_ROUTE, json=PROFILE, headers={"X-Request-ID": REQUEST_ID})
+
+    original = GeminiService.__dict__["stream_scholarships"]
+    GeminiService.stream_scholarships = staticmethod(slow_stream)
+    try:
+        response, span = _traced(run)
+    finally:
+        GeminiService.stream_scholarships = original
+
+    assert response.status_code == 200 and "event: done" in response.text
+    assert response.headers["X-Request-ID"] == REQUEST_ID
+    assert span.name == f"POST {STREAM_ROUTE}"
+    assert span.attributes["http.route"] == STREAM_ROUTE
+    assert span.attributes["http.response.status_code"] == 200
+    assert span.attributes["request.id"] == REQUEST_ID
+    duration = (span.end_ns - span.start_ns) / 1e9
+    assert duration >= 3 * STEP_SECONDS, f"span lasted {duration:.3f}s of a {3 * STEP_SECONDS}s stream"
+
+
+def test_span_ends_at_the_final_body_chunk():
+    seen_request_ids = []
+
+    async def streaming_app(scope, receive, send):
+        seen_request_ids.append(current_request_id())
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+        await send({"type": "http.response.body", "body": b"a", "more_body": True})
+        await send({"type": "http.response.body", "body": b"b"})
+        # Work after the response (background tasks, say) is not part of the request span.
+        await asyncio.sleep(STEP_SECONDS)
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    async def run():
+        scope = {"type": "http", "method": "GET", "path": "/stream", "headers": [(b"x-request-id", b"bad id!")]}
+        await TracingMiddleware(streaming_app)(scope, None, send)
+
+    _, span = _traced(run)
+    duration = (span.end_ns - span.start_ns) / 1e9
+    assert duration < STEP_SECONDS, f"span lasted {duration:.3f}s"
+    assert span.name == "GET"
+
+    # An invalid incoming ID is replaced, and the replacement is what the client sees.
+    headers = dict(sent[0]["headers"])
+    assert headers[b"content-type"] == b"text/plain"
+    assert headers[b"x-request-id"].decode() == seen_request_ids[0] != "bad id!"
+
+
+if __name__ == "__main__":
+    failed = 0
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            try:
+                test()
+                print(f"✅ {name}")
+            except Exception as e:
+                failed += 1
+                print(f"❌ {name}: {e!r}")
+    sys.exit(1 if failed else 0)
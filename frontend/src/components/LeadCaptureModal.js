@@ -65,7 +65,7 @@ function LeadCaptureModal({ scholarships, profile, onClose, onSuccess }) {
       }
 
       const result = await response.json();
-      if (!result.email_sent) {
+      if (!result.email_sent && !result.email_queued) {
         setError(result.message || 'We saved your details, but could not send the email right now.');
         return;
       }